@@ -0,0 +1,87 @@
+# benchmarks/library_insert.py
+#
+# Measures how long it takes to put N entries into the library with
+# one add_file() call per file (the old path) against a single
+# add_files() batch. Insertion (model, database and signals) and the
+# layout and paint pass that follows are timed separately; thumbnail
+# and probe work is stopped before it starts. Everything runs against a
+# temporary profile, never the user's library.
+#
+# Usage: python benchmarks/library_insert.py [--count N]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSettings, QStandardPaths
+from PySide6.QtWidgets import QApplication
+from persistence_manager import PersistenceManager
+from library_widget import LibraryWidget
+
+def make_paths(count):
+    return [f"/nonexistent/benchmark/video_{i:06d}.mkv" for i in range(count)]
+
+def run(widget, paths, bulk):
+    app = QApplication.instance()
+    count_signals = []
+
+    def on_count_changed(count):
+        count_signals.append(count)
+    widget.count_changed.connect(on_count_changed)
+    start = time.perf_counter()
+    if bulk:
+        widget.add_files(paths)
+    else:
+        for filepath in paths:
+            widget.add_file(filepath, display_name=os.path.basename(filepath))
+    inserted = time.perf_counter()
+    widget.thumbnail_delay_timer.stop()
+    widget.probe_timer.stop()
+    app.processEvents()  # Let the view lay out and paint the new rows
+    widget.table_widget.viewport().repaint()
+    laid_out = time.perf_counter()
+    widget.count_changed.disconnect(on_count_changed)
+    widget.clear_all_items()
+    app.processEvents()
+    return inserted - start, laid_out - inserted, len(count_signals)
+
+def main():
+    parser = argparse.ArgumentParser(description="Library insertion: per-file vs bulk")
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+
+    QStandardPaths.setTestModeEnabled(True)  # Qt's own settings (e.g. the file dialog's) too
+    app = QApplication(sys.argv)
+    paths = make_paths(args.count)
+    results = {}
+    # A throwaway profile: the runs clear the library, which must never
+    # touch the user's database, settings or thumbnail cache
+    with tempfile.TemporaryDirectory(prefix="library-insert-") as profile_dir:
+        persistence_manager = PersistenceManager(
+            QSettings(os.path.join(profile_dir, "settings.ini"), QSettings.Format.IniFormat),
+            data_dir=os.path.join(profile_dir, "data"),
+            cache_dir=os.path.join(profile_dir, "cache"),
+        )
+        widget = LibraryWidget(persistence_manager)
+        widget.resize(900, 700)
+        widget.show()
+        app.processEvents()
+        try:
+            for name, bulk in (("per-file", False), ("bulk", True)):
+                insert, layout, signals = results[name] = run(widget, paths, bulk)
+                print(f"{name:>8}: {args.count} entries inserted in {insert * 1000:.1f} ms, "
+                      f"laid out in {layout * 1000:.1f} ms ({signals} count_changed signals)")
+        finally:
+            widget.shutdown()
+            persistence_manager.close()
+    before, after = results["per-file"], results["bulk"]
+    print(f"bulk is {before[0] / after[0]:.1f}x faster to insert, "
+          f"{(before[0] + before[1]) / (after[0] + after[1]):.1f}x faster overall")
+
+if __name__ == "__main__":
+    main()
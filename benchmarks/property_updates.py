@@ -0,0 +1,129 @@
+# benchmarks/property_updates.py
+#
+# Measures GUI-thread CPU spent on mpv property updates during
+# playback. A background thread plays the part of mpv's event thread,
+# reporting time-pos once per video frame (plus, optionally, other
+# properties that change every frame, like avsync or the demuxer cache
+# state). Two setups are compared:
+#
+#   before: one queued signal per change into an overlay that updates
+#           the seek slider and time label on every time-pos change
+#   after:  PropertyBridge snapshots into the current overlay, which
+#           only touches its widgets when the displayed second changes
+#
+# Each is run with the overlay shown and hidden (most of playback; the
+# player then slows the bridge to HIDDEN_INTERVAL_MS).
+#
+# Usage: python benchmarks/property_updates.py [--fps 24,60] [--extra N] [--seconds N]
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+from overlay_widget import OverlayWidget
+from property_bridge import PropertyBridge, FRAME_INTERVAL_MS, HIDDEN_INTERVAL_MS
+from utils import format_time
+
+class LegacyOverlay(OverlayWidget):
+    """The overlay as it was before the bridge: every update touches the widgets."""
+    def update_time(self, current_time):
+        if current_time is None: current_time = 0.0
+        if not self.is_seeking: self.seek_slider.setValue(int(current_time))
+        self.time_label.setText(f"{format_time(current_time)} / {format_time(self.video_duration)}")
+
+class DirectSignals(QObject):
+    """The old path: one cross-thread signal per property change."""
+    time_pos_changed = Signal(float)
+    duration_changed = Signal(float)
+    other_changed = Signal(str, object)
+
+def feed(report, fps, extra, seconds):
+    """Reports properties like mpv does while playing a 'fps' video."""
+    interval = 1.0 / fps
+    start = time.perf_counter()
+    position = 0.0
+    report('duration', 3600.0)
+    while time.perf_counter() - start < seconds:
+        position += interval
+        report('time-pos', position)
+        for i in range(extra):
+            report(f'extra-{i}', position)
+        time.sleep(interval)
+
+def run(app, overlay, fps, extra, seconds, bridged, hidden):
+    deliveries = [0]
+    overlay.setVisible(not hidden)
+    if bridged:
+        bridge = PropertyBridge()
+        bridge.set_interval(HIDDEN_INTERVAL_MS if hidden else FRAME_INTERVAL_MS)
+
+        def apply(snapshot):
+            deliveries[0] += 1
+            if 'duration' in snapshot:
+                overlay.update_duration(snapshot['duration'])
+            if 'time-pos' in snapshot:
+                overlay.update_time(snapshot['time-pos'])
+        bridge.changed.connect(apply)
+        report = bridge.on_property_change
+    else:
+        signals = DirectSignals()
+
+        def on_time(value):
+            deliveries[0] += 1
+            overlay.update_time(value)
+
+        def on_other(name, value):
+            deliveries[0] += 1
+        signals.time_pos_changed.connect(on_time)
+        signals.duration_changed.connect(overlay.update_duration)
+        signals.other_changed.connect(on_other)
+
+        def report(name, value):
+            if name == 'time-pos':
+                signals.time_pos_changed.emit(value)
+            elif name == 'duration':
+                signals.duration_changed.emit(value)
+            else:
+                signals.other_changed.emit(name, value)
+
+    producer = threading.Thread(target=feed, args=(report, fps, extra, seconds))
+    QTimer.singleShot(int(seconds * 1000) + 100, app.quit)
+    cpu_start = time.thread_time()
+    producer.start()
+    app.exec()  # Also runs the repaints the updates cause
+    cpu = time.thread_time() - cpu_start
+    producer.join()
+    return cpu, deliveries[0]
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI-thread cost of mpv property updates")
+    parser.add_argument('--fps', default="24,60", help="Comma-separated video frame rates")
+    parser.add_argument('--extra', type=int, default=0,
+                        help="Other properties changing every frame (e.g. 4 with the stats HUD's)")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    overlays = {False: LegacyOverlay(None, None), True: OverlayWidget(None, None)}
+    print(f"{args.extra} extra properties per frame, {args.seconds:.0f} s per run")
+    for fps in (int(value) for value in args.fps.split(',')):
+        for hidden in (False, True):
+            label = f"{fps:>3} fps, overlay {'hidden' if hidden else 'shown '}"
+            results = {}
+            for name, bridged in (("before", False), ("after", True)):
+                cpu, deliveries = results[name] = run(
+                    app, overlays[bridged], fps, args.extra, args.seconds, bridged, hidden
+                )
+                print(f"{label}: {name:>6}: {cpu * 1000:5.0f} ms GUI-thread CPU, {deliveries:5} GUI updates")
+            before, after = results["before"][0], results["after"][0]
+            print(f"{label}: GUI-thread CPU {(after - before) / before * 100:+.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/thumbnail_latency.py
+#
+# Measures per-thumbnail latency with a fresh mpv instance per file
+# (the old behaviour) against a reused instance from MpvPool.
+#
+# Usage: python benchmarks/thumbnail_latency.py [--repeat N] [--mode fast|accurate]
+#        video [video ...]
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mpv
+from thumbnail_worker import THUMBNAIL_MODES, create_mpv_pool, grab_local_thumbnail
+
+def run_fresh(files, mode):
+    timings = []
+    for filepath in files:
+        start = time.perf_counter()
+        player = mpv.MPV(vo='null', ytdl=False, idle=True, pause=True, aid='no', sid='no')
+        try:
+            grab_local_thumbnail(player, filepath, mode)
+        finally:
+            player.terminate()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def run_pooled(files, mode):
+    pool = create_mpv_pool(max_idle=1)
+    # Warm the pool so start-up cost is paid once, as in the app.
+    pool.release(pool.acquire())
+    timings = []
+    try:
+        for filepath in files:
+            start = time.perf_counter()
+            with pool.checkout() as player:
+                grab_local_thumbnail(player, filepath, mode)
+            timings.append(time.perf_counter() - start)
+    finally:
+        pool.shutdown()
+    return timings
+
+def report(name, timings):
+    print(f"{name:>7}: n={len(timings)} "
+          f"mean={statistics.mean(timings) * 1000:.1f} ms "
+          f"median={statistics.median(timings) * 1000:.1f} ms "
+          f"max={max(timings) * 1000:.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Thumbnail latency: fresh vs pooled mpv")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--mode', choices=THUMBNAIL_MODES, default='fast')
+    args = parser.parse_args()
+
+    files = args.files * args.repeat
+    report("fresh", run_fresh(files, args.mode))
+    report("pooled", run_pooled(files, args.mode))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# cache_profiles.py
+
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# mpv demuxer cache settings per kind of source. Local disks are fast
+# enough that a short readahead suffices; the back buffer keeps
+# recently played content so seeking backwards does not re-read it.
+# The back buffer needs the seekable cache, which 'cache': 'no' would
+# turn off, so local files enable it on its own (without cache pauses).
+# Network shares and streams read far ahead and wait for a few seconds
+# of data after an underrun instead of stuttering in and out of it.
+CACHE_PROFILES = {
+    'local': {
+        'cache': 'no',
+        'demuxer-seekable-cache': 'yes',
+        'demuxer-readahead-secs': 10,
+        'demuxer-max-bytes': '64MiB',
+        'demuxer-max-back-bytes': '32MiB',
+    },
+    'network_share': {
+        'cache': 'yes',
+        'cache-secs': 60,
+        'demuxer-readahead-secs': 60,
+        'demuxer-max-bytes': '256MiB',
+        'demuxer-max-back-bytes': '128MiB',
+        'cache-pause-wait': 2,
+    },
+    'stream': {
+        'cache': 'yes',
+        'cache-secs': 120,
+        'demuxer-readahead-secs': 120,
+        'demuxer-max-bytes': '512MiB',
+        'demuxer-max-back-bytes': '256MiB',
+        'cache-pause-wait': 3,
+    },
+}
+
+# Profiles whose cache may go to disk instead of RAM when enabled
+DISK_CACHE_PROFILES = ('network_share', 'stream')
+
+NETWORK_FILESYSTEMS = {
+    'cifs', 'smb3', 'smbfs', 'nfs', 'nfs4', 'afs', '9p', 'ncpfs',
+    'fuse.sshfs', 'fuse.rclone', 'davfs', 'fuse.davfs2', 'ceph', 'glusterfs',
+}
+
+MOUNT_TABLE_TTL = 60.0  # Seconds before /proc/mounts is read again
+
+_mount_table = None
+_mount_table_time = 0.0
+
+
+def network_mount_points():
+    """Returns the mount points of network filesystems (Linux), longest first."""
+    global _mount_table, _mount_table_time
+    now = time.monotonic()
+    if _mount_table is not None and now - _mount_table_time < MOUNT_TABLE_TTL:
+        return _mount_table
+    mounts = []
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3 and fields[2] in NETWORK_FILESYSTEMS:
+                    # Spaces in mount points are octal-escaped
+                    mounts.append(fields[1].replace('\\040', ' '))
+    except OSError:
+        pass
+    _mount_table = sorted(mounts, key=len, reverse=True)
+    _mount_table_time = now
+    return _mount_table
+
+def is_network_path(filepath):
+    if sys.platform == "win32":
+        if filepath.startswith('\\\\') or filepath.startswith('//'):
+            return True  # UNC path
+        drive = os.path.splitdrive(os.path.abspath(filepath))[0]
+        if drive:
+            try:
+                import ctypes
+                DRIVE_REMOTE = 4
+                return ctypes.windll.kernel32.GetDriveTypeW(drive + '\\') == DRIVE_REMOTE
+            except (AttributeError, OSError):
+                return False
+        return False
+    path = os.path.abspath(filepath)
+    return any(path == mount or path.startswith(mount.rstrip('/') + '/')
+               for mount in network_mount_points())
+
+def classify_source(filepath):
+    """Returns the name of the cache profile for 'filepath' (a path or URL)."""
+    if '://' in filepath and not filepath.startswith('file://'):
+        return 'stream'
+    return 'network_share' if is_network_path(filepath) else 'local'
+
+def cache_options(profile_name, disk_cache=False):
+    """Returns the mpv options of a profile, optionally with the cache on disk."""
+    options = dict(CACHE_PROFILES[profile_name])
+    if profile_name in DISK_CACHE_PROFILES:
+        options['cache-on-disk'] = 'yes' if disk_cache else 'no'
+    return options
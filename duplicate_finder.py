@@ -0,0 +1,172 @@
+# duplicate_finder.py
+
+import hashlib
+import logging
+import mmap
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SIZE = 1024 * 1024  # Bytes hashed at each of the head, middle and tail
+
+
+def sampled_hash(filepath, size):
+    """
+    Hashes the head, middle and tail SAMPLE_SIZE bytes of a file (the
+    whole file if it is smaller than three samples), plus its size.
+    Videos that differ anywhere meaningful differ in these samples
+    (headers, index, payload), and a terabyte costs the same 3 MiB.
+    """
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if size <= 3 * SAMPLE_SIZE:
+            digest.update(data)
+        else:
+            middle = (size - SAMPLE_SIZE) // 2
+            for offset in (0, middle, size - SAMPLE_SIZE):
+                digest.update(data[offset:offset + SAMPLE_SIZE])
+    return digest.hexdigest()
+
+def hash_job(job):
+    """Process pool entry point: (path, size, mtime_ns) -> (path, size, mtime_ns, hash or None)."""
+    filepath, size, mtime_ns = job
+    try:
+        return filepath, size, mtime_ns, sampled_hash(filepath, size)
+    except (OSError, ValueError):
+        return filepath, size, mtime_ns, None
+
+
+class DuplicateFinderSignals(QObject):
+    """Signals for DuplicateFinder (QRunnable is not a QObject)."""
+    progress = Signal(object, int, int)      # worker, files hashed, files to hash
+    finished = Signal(object, list, list)    # worker, [[path, ...], ...] groups, new hashes
+
+
+class DuplicateFinder(QRunnable):
+    """
+    Finds library files with identical content.
+
+    Files are grouped by size first; only sizes shared by two or more
+    files are hashed, with sampled_hash() in a process pool so several
+    disks (and cores) are busy at once. Hashes known from an earlier
+    run are reused while the file's size and mtime are unchanged, and
+    the freshly computed ones are reported back for caching.
+    """
+
+    EMIT_INTERVAL = 0.25  # Seconds between progress signals
+
+    def __init__(self, filepaths, cached_hashes):
+        super().__init__()
+        self.setAutoDelete(False)  # The library keeps the reference
+        self.filepaths = filepaths          # Paths in playlist order
+        self.cached_hashes = cached_hashes  # path -> (size, mtime_ns, hash)
+        self.cancelled = False
+        self.signals = DuplicateFinderSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        groups, new_hashes = [], []
+        try:
+            groups, new_hashes = self.find()
+        except Exception as e:
+            logger.error(f"Duplicate search failed: {e}", exc_info=True)
+        finally:
+            self.signals.finished.emit(self, groups, new_hashes)
+
+    def find(self):
+        start = time.monotonic()
+        by_size = defaultdict(list)
+        for filepath in self.filepaths:
+            if self.cancelled:
+                return [], []
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            if stat.st_size > 0:
+                by_size[stat.st_size].append((filepath, stat.st_size, stat.st_mtime_ns))
+
+        hashes = {}
+        jobs = []
+        for candidates in by_size.values():
+            if len(candidates) < 2:
+                continue
+            for filepath, size, mtime_ns in candidates:
+                cached = self.cached_hashes.get(filepath)
+                if cached and cached[:2] == (size, mtime_ns):
+                    hashes[filepath] = cached[2]
+                else:
+                    jobs.append((filepath, size, mtime_ns))
+
+        new_hashes = self.hash_files(jobs, hashes)
+        if self.cancelled:
+            return [], new_hashes  # Still worth caching
+
+        by_hash = defaultdict(list)
+        for filepath in self.filepaths:
+            content_hash = hashes.get(filepath)
+            if content_hash is not None:
+                by_hash[content_hash].append(filepath)
+        groups = [paths for paths in by_hash.values() if len(paths) > 1]
+        logger.info(f"Duplicate search: {len(groups)} groups among {len(self.filepaths)} files, "
+                    f"{len(jobs)} hashed, {len(hashes) - len(new_hashes)} from cache, "
+                    f"{time.monotonic() - start:.1f} s")
+        return groups, new_hashes
+
+    def hash_files(self, jobs, hashes):
+        """
+        Hashes 'jobs' in worker processes, filling 'hashes'. Returns the
+        new cache rows. If the pool cannot start (or dies), whatever is
+        left is hashed in this thread instead.
+        """
+        new_hashes = []
+        if not jobs or self.cancelled:
+            return new_hashes
+        finished = set()
+        last_emit = time.monotonic()
+
+        def record(result):
+            nonlocal last_emit
+            filepath, size, mtime_ns, content_hash = result
+            finished.add(filepath)
+            if content_hash is not None:
+                hashes[filepath] = content_hash
+                new_hashes.append((filepath, size, mtime_ns, content_hash))
+            now = time.monotonic()
+            if now - last_emit >= self.EMIT_INTERVAL or len(finished) == len(jobs):
+                self.signals.progress.emit(self, len(finished), len(jobs))
+                last_emit = now
+
+        try:
+            for result in self.hash_in_pool(jobs):
+                record(result)
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Hash worker processes failed ({e}); hashing in-process instead")
+            for job in jobs:
+                if self.cancelled:
+                    break
+                if job[0] not in finished:
+                    record(hash_job(job))
+        return new_hashes
+
+    def hash_in_pool(self, jobs):
+        """Yields hash_job() results from a process pool as they complete."""
+        # Spawned rather than forked: forking a process that runs Qt and
+        # other threads can inherit locks held by those threads
+        context = multiprocessing.get_context('spawn')
+        workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(hash_job, job) for job in jobs]
+            for future in as_completed(futures):
+                if self.cancelled:
+                    pool.shutdown(cancel_futures=True)
+                    return
+                yield future.result()
@@ -0,0 +1,166 @@
+# folder_scanner.py
+
+import logging
+import os
+import time
+from PySide6.QtCore import QObject, QRunnable, Signal
+from media_probe import detect_container, SNIFF_BYTES
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {
+    '.mp4', '.m4v', '.mkv', '.webm', '.avi', '.mov', '.wmv', '.flv',
+    '.mpg', '.mpeg', '.m2ts', '.mts', '.3gp', '.ogv', '.vob',
+}
+
+# Common companions of video files that are never worth opening to sniff
+NON_MEDIA_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.txt', '.nfo',
+    '.srt', '.ass', '.ssa', '.sub', '.idx', '.vtt', '.xml', '.json',
+    '.pdf', '.html', '.htm', '.ini', '.db', '.log', '.md', '.zip',
+    '.rar', '.7z', '.exe', '.dll', '.py', '.part', '.torrent',
+    '.mp3', '.flac', '.wav', '.ogg', '.m4a', '.aac', '.opus',
+}
+
+# Shared with TypeScript sources, so only accepted with MPEG-TS packets inside
+MPEG_TS_EXTENSIONS = {'.ts'}
+TS_PACKET_SIZE = 188
+TS_SYNC_BYTE = 0x47
+
+MIN_SNIFF_SIZE = 1024 * 1024  # Smaller files with unknown extensions are not videos worth listing
+
+
+class FolderScanSignals(QObject):
+    """Signals for FolderScanWorker (QRunnable is not a QObject)."""
+    batch_found = Signal(object, list)   # worker, [filepath, ...]
+    progress = Signal(object, int, int)  # worker, directories scanned, files found
+    finished = Signal(object, int)       # worker, total files found
+
+
+class FolderScanWorker(QRunnable):
+    """
+    Walks a directory tree with os.scandir and streams the video files
+    it finds back in batches, so huge media shares fill the library
+    progressively without blocking the GUI thread.
+
+    Files are accepted by extension; '.ts' files must also start with
+    MPEG-TS packets, and files with an unknown extension are sniffed
+    (a few header bytes) with media_probe.
+    """
+
+    BATCH_SIZE = 250
+    EMIT_INTERVAL = 0.25  # Seconds; flush partial batches on slow shares
+
+    def __init__(self, root):
+        super().__init__()
+        self.setAutoDelete(False)  # The library keeps the reference
+        self.root = root
+        self.cancelled = False
+        self.signals = FolderScanSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        found = 0
+        try:
+            found = self.scan()
+        except Exception as e:
+            logger.error(f"Folder scan of {self.root} failed: {e}", exc_info=True)
+        finally:
+            self.signals.finished.emit(self, found)
+
+    def scan(self):
+        start = time.monotonic()
+        last_emit = start
+        batch = []
+        found = 0
+        dirs_scanned = 0
+
+        for _, _, videos in walk_tree(self.root, lambda: self.cancelled):
+            batch.extend(entry.path for entry in videos)
+            dirs_scanned += 1
+
+            now = time.monotonic()
+            if len(batch) >= self.BATCH_SIZE or (batch and now - last_emit >= self.EMIT_INTERVAL):
+                found += len(batch)
+                self.signals.batch_found.emit(self, batch)
+                self.signals.progress.emit(self, dirs_scanned, found)
+                batch = []
+                last_emit = now
+
+        if batch and not self.cancelled:
+            found += len(batch)
+            self.signals.batch_found.emit(self, batch)
+        self.signals.progress.emit(self, dirs_scanned, found)
+        state = "cancelled" if self.cancelled else "done"
+        logger.info(f"Folder scan of {self.root} {state}: {found} files in "
+                    f"{dirs_scanned} directories, {time.monotonic() - start:.1f} s")
+        return found
+
+
+def scan_directory(directory):
+    """
+    Lists one directory (not recursive). Returns (subdirectory paths,
+    video DirEntries), both in name order; hidden entries are skipped.
+    Raises OSError if the directory cannot be read.
+    """
+    subdirs = []
+    videos = []
+    with os.scandir(directory) as it:
+        for entry in sorted(it, key=lambda e: e.name.lower()):
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file() and is_video_file(entry):
+                    videos.append(entry)
+            except OSError as e:
+                logger.debug(f"Skipping {entry.path}: {e}")
+    return subdirs, videos
+
+def walk_tree(root, is_cancelled=lambda: False):
+    """
+    Yields (directory, subdirectory paths, video DirEntries) for every
+    directory under 'root', depth first in name order. Symlinked
+    directories are not followed, so link loops cannot trap the walk.
+    """
+    pending_dirs = [root]
+    while pending_dirs and not is_cancelled():
+        directory = pending_dirs.pop()
+        try:
+            subdirs, videos = scan_directory(directory)
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+            continue
+        yield directory, subdirs, videos
+        # Reversed so directories are visited in name order
+        pending_dirs.extend(reversed(subdirs))
+
+def is_video_file(entry):
+    """Decides from a DirEntry whether the file looks like a video."""
+    ext = os.path.splitext(entry.name)[1].lower()
+    if ext in VIDEO_EXTENSIONS:
+        return True
+    if ext in MPEG_TS_EXTENSIONS:
+        return is_mpeg_ts(entry.path)
+    if ext in NON_MEDIA_EXTENSIONS:
+        return False
+    try:
+        if entry.stat().st_size < MIN_SNIFF_SIZE:
+            return False
+        with open(entry.path, 'rb') as f:
+            return detect_container(f.read(SNIFF_BYTES)) is not None
+    except OSError:
+        return False
+
+def is_mpeg_ts(filepath):
+    """True if the file starts with two MPEG-TS packets (sync byte 0x47 at 0 and 188)."""
+    try:
+        with open(filepath, 'rb') as f:
+            header = f.read(TS_PACKET_SIZE + 1)
+    except OSError:
+        return False
+    return (len(header) > TS_PACKET_SIZE and header[0] == TS_SYNC_BYTE
+            and header[TS_PACKET_SIZE] == TS_SYNC_BYTE)
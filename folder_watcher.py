@@ -0,0 +1,327 @@
+# folder_watcher.py
+
+import logging
+import os
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, QFileSystemWatcher, Signal, Slot
+from folder_scanner import scan_directory, walk_tree
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryJobSignals(QObject):
+    """Signals for the watcher's workers (QRunnable is not a QObject)."""
+    done = Signal(object, object)  # worker, result
+
+
+class WatchSetupWorker(QRunnable):
+    """Lists every directory below the watched roots, with its mtime: [(directory, mtime_ns), ...]."""
+
+    def __init__(self, roots):
+        super().__init__()
+        self.setAutoDelete(False)  # The watcher keeps the reference
+        self.roots = roots
+        self.signals = DirectoryJobSignals()
+
+    def run(self):
+        directories = []
+        try:
+            for root in self.roots:
+                for directory, _, _ in walk_tree(root):
+                    try:
+                        directories.append((directory, os.stat(directory).st_mtime_ns))
+                    except OSError:
+                        continue
+        except Exception as e:
+            logger.error(f"Listing watched folders failed: {e}", exc_info=True)
+        finally:
+            self.signals.done.emit(self, directories)
+
+
+class DirectoryDiffWorker(QRunnable):
+    """
+    Re-lists the directories that reported a change and diffs them
+    against what the library knows about them. Only those directories
+    are read; a subdirectory that appeared is walked in full, since
+    nothing was known about it. Files already in the library
+    ('library_paths', which also covers subdirectories that could not
+    be watched and are walked on every change) and files the user
+    removed from it ('excluded') are never reported as added.
+
+    Result dict:
+        'added'        [(path, size, mtime_ns), ...] new video files
+        'removed'      [path, ...] files that are gone
+        'changed'      [(path, size, mtime_ns), ...] size or mtime differs
+        'recorded'     [(path, size, mtime_ns), ...] first stat of known files
+        'new_dirs'     [directory, ...] to start watching
+        'missing_dirs' [directory, ...] watched directories that are gone
+        'dir_mtimes'   [(directory, mtime_ns), ...] of every directory listed
+    """
+
+    def __init__(self, known, watched, library_paths=frozenset(), excluded=frozenset()):
+        super().__init__()
+        self.setAutoDelete(False)  # The watcher keeps the reference
+        self.known = known      # directory -> {path: (size, mtime_ns)}
+        self.watched = watched  # Snapshot of the watched directories
+        self.library_paths = library_paths  # Every library path below the listed directories
+        self.excluded = excluded
+        self.signals = DirectoryJobSignals()
+
+    def run(self):
+        result = {'added': [], 'removed': [], 'changed': [], 'recorded': [],
+                  'new_dirs': [], 'missing_dirs': [], 'dir_mtimes': []}
+        try:
+            for directory, known_files in self.known.items():
+                self.diff_directory(directory, known_files, result)
+        except Exception as e:
+            logger.error(f"Directory diff failed: {e}", exc_info=True)
+        finally:
+            self.signals.done.emit(self, result)
+
+    def diff_directory(self, directory, known_files, result):
+        try:
+            # Taken before listing, so a change made during the listing shows up next time
+            result['dir_mtimes'].append((directory, os.stat(directory).st_mtime_ns))
+            subdirs, videos = scan_directory(directory)
+        except OSError:
+            # The directory itself went away (deleted or moved)
+            result['removed'].extend(known_files)
+            result['missing_dirs'].append(directory)
+            return
+
+        seen = set()
+        for entry in videos:
+            path = entry.path
+            seen.add(path)
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            previous = known_files.get(path)
+            if path not in known_files:
+                if path not in self.excluded:
+                    result['added'].append((path,) + current)
+            elif previous == (None, None):
+                result['recorded'].append((path,) + current)
+            elif previous != current:
+                result['changed'].append((path,) + current)
+        result['removed'].extend(path for path in known_files if path not in seen)
+
+        for subdir in subdirs:
+            if subdir in self.watched:
+                continue
+            for new_dir, _, new_videos in walk_tree(subdir):
+                result['new_dirs'].append(new_dir)
+                try:
+                    result['dir_mtimes'].append((new_dir, os.stat(new_dir).st_mtime_ns))
+                except OSError:
+                    pass
+                for entry in new_videos:
+                    if entry.path in self.library_paths or entry.path in self.excluded:
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    result['added'].append((entry.path, stat.st_size, stat.st_mtime_ns))
+
+
+def outermost_directories(directories):
+    """Returns the directories that are not below another one in 'directories'."""
+    outermost = []
+    last_prefix = None
+    # Sorted with a trailing separator, everything below a directory follows it directly
+    for prefix, directory in sorted((d.rstrip(os.sep) + os.sep, d) for d in directories):
+        if last_prefix is None or not prefix.startswith(last_prefix):
+            outermost.append(directory)
+            last_prefix = prefix
+    return outermost
+
+
+class FolderWatcher(QObject):
+    """
+    Keeps watched folders in sync with the library.
+
+    Every directory below a watched root gets a QFileSystemWatcher
+    watch. Change notifications only mark their directory dirty; after
+    DEBOUNCE_MS of quiet the dirty directories are re-listed and diffed
+    in one background job, and the differences are reported as three
+    batched signals. Nothing is ever rescanned in full: at startup,
+    only directories whose mtime differs from the one stored at their
+    last diff (files added, removed or renamed while the app was
+    closed) are diffed, along with stored directories that are gone.
+
+    Files the user removes from the library are recorded as excluded,
+    so syncing a folder never brings them back; adding one again lifts
+    that.
+
+    Directory watches see files being created, deleted, renamed and
+    replaced by rename (how most tools save). A file rewritten in place
+    is picked up the next time its directory reports a change.
+    """
+
+    files_added = Signal(list)    # [path, ...]
+    files_removed = Signal(list)  # [path, ...]
+    files_changed = Signal(list)  # [path, ...]
+
+    DEBOUNCE_MS = 500
+
+    def __init__(self, library_db, parent=None):
+        super().__init__(parent)
+        self.library_db = library_db
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.dirty_dirs = set()
+        self.workers = set()
+        self.diff_running = False
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self.process_changes)
+
+    def start(self):
+        """
+        Installs watches for the folders saved in the library database,
+        then diffs the directories that changed while the app was closed.
+        """
+        roots = [root for root in self.library_db.watched_folders() if os.path.isdir(root)]
+        if roots:
+            self.run_worker(WatchSetupWorker(roots), self.on_startup_setup_done)
+
+    def watch_folder(self, root):
+        """Starts watching 'root' (and everything below it) from now on."""
+        self.library_db.add_watched_folder(root)
+        self.run_worker(WatchSetupWorker([root]), self.on_watch_setup_done)
+
+    def exclude(self, paths):
+        """Records user-removed files below watched folders so syncing does not re-add them."""
+        roots = [root.rstrip(os.sep) + os.sep for root in self.library_db.watched_folders()]
+        paths = [path for path in paths if path.startswith(tuple(roots))] if roots else []
+        if not paths:
+            return
+        try:
+            self.library_db.exclude_paths(paths)
+        except Exception as e:
+            logger.warning(f"Failed to save excluded paths: {e}")
+
+    def clear(self):
+        """Stops watching everything (the folders are forgotten by the caller)."""
+        directories = self.watcher.directories()
+        if directories:
+            self.watcher.removePaths(directories)
+        self.dirty_dirs.clear()
+        self.debounce_timer.stop()
+
+    def run_worker(self, worker, slot):
+        worker.signals.done.connect(slot)
+        self.workers.add(worker)
+        QThreadPool.globalInstance().start(worker)
+
+    def add_watches(self, directories):
+        watched = set(self.watcher.directories())
+        new = [directory for directory in directories if directory not in watched]
+        if not new:
+            return
+        failed = self.watcher.addPaths(new)
+        if failed:
+            logger.warning(f"Could not watch {len(failed)} directories "
+                           f"(inotify watch limit?), e.g. {failed[0]}")
+        logger.info(f"Watching {len(new) - len(failed)} more directories.")
+
+    @Slot(object, object)
+    def on_watch_setup_done(self, worker, directories):
+        self.workers.discard(worker)
+        self.add_watches([directory for directory, _ in directories])
+
+    @Slot(object, object)
+    def on_startup_setup_done(self, worker, directories):
+        self.workers.discard(worker)
+        self.add_watches([directory for directory, _ in directories])
+        stored = self.library_db.folder_mtimes()
+        listed = {directory for directory, _ in directories}
+        changed = [directory for directory, mtime_ns in directories if stored.get(directory) != mtime_ns]
+        roots = tuple(root.rstrip(os.sep) + os.sep for root in worker.roots)
+        # Directories deleted while the app was closed; diffing them reports their files as removed
+        vanished = [directory for directory in stored
+                    if directory not in listed and (directory + os.sep).startswith(roots)]
+        logger.info(f"Folder sync at startup: {len(changed)} of {len(directories)} directories "
+                    f"changed, {len(vanished)} gone")
+        if changed or vanished:
+            self.dirty_dirs.update(changed)
+            self.dirty_dirs.update(vanished)
+            self.process_changes()
+
+    @Slot(str)
+    def on_directory_changed(self, directory):
+        self.dirty_dirs.add(directory)
+        self.debounce_timer.start(self.DEBOUNCE_MS)
+
+    @Slot()
+    def process_changes(self):
+        """Diffs the directories that changed since the last pass, in the background."""
+        if self.diff_running:
+            return  # Picked up again when the running diff completes
+        if not self.dirty_dirs:
+            return
+        dirty = self.dirty_dirs
+        self.dirty_dirs = set()
+        known = {directory: {} for directory in dirty}
+        library_paths = set()
+        excluded = set()
+        # One range scan per outermost directory rather than one per directory
+        for top in outermost_directories(dirty):
+            for path, stats in self.library_db.files_under(top).items():
+                library_paths.add(path)
+                files = known.get(os.path.dirname(path))
+                if files is not None:
+                    files[path] = stats
+            excluded |= self.library_db.excluded_under(top)
+        self.diff_running = True
+        self.run_worker(
+            DirectoryDiffWorker(known, set(self.watcher.directories()), library_paths, excluded),
+            self.on_diff_done
+        )
+
+    @Slot(object, object)
+    def on_diff_done(self, worker, result):
+        self.workers.discard(worker)
+        self.diff_running = False
+
+        removed = list(result['removed'])
+        removed_set = set(removed)
+        if result['missing_dirs']:
+            gone = [d for d in self.watcher.directories()
+                    if any(d == m or d.startswith(m + os.sep) for m in result['missing_dirs'])]
+            if gone:
+                self.watcher.removePaths(gone)
+            # Files in subdirectories of a vanished directory are gone too
+            for directory in result['missing_dirs']:
+                for path in self.library_db.files_under(directory):
+                    if path not in removed_set:
+                        removed_set.add(path)
+                        removed.append(path)
+        self.add_watches(result['new_dirs'])
+        try:
+            if result['missing_dirs']:
+                self.library_db.forget_folders(result['missing_dirs'])
+            self.library_db.update_folder_mtimes(result['dir_mtimes'])
+        except Exception as e:
+            logger.warning(f"Failed to save folder mtimes: {e}")
+
+        stats = result['recorded'] + result['changed']
+        if removed:
+            self.files_removed.emit(removed)
+        if result['added']:
+            self.files_added.emit([path for path, _, _ in result['added']])
+            stats += result['added']  # Recorded after the library has inserted them
+        if result['changed']:
+            self.files_changed.emit([path for path, _, _ in result['changed']])
+        if stats:
+            try:
+                self.library_db.update_file_stats(stats)
+            except Exception as e:
+                logger.warning(f"Failed to save file stats: {e}")
+        logger.info(f"Folder sync: {len(result['added'])} added, {len(removed)} removed, "
+                    f"{len(result['changed'])} changed")
+
+        if self.dirty_dirs:
+            self.debounce_timer.start(self.DEBOUNCE_MS)
@@ -38,6 +38,10 @@ class K:
         "key": Qt.Key.Key_Down, "mod": Qt.KeyboardModifier.NoModifier, 
         "display": "↓", "desc": "Volume Down (-5)"
     }
+    STATS = {
+        "key": Qt.Key.Key_I, "mod": Qt.KeyboardModifier.NoModifier,
+        "display": "I", "desc": "Show / Hide Playback Stats"
+    }
 
     # --- Tracks & Chapters ---
     NEXT_CHAPTER = {
@@ -70,6 +74,10 @@ class K:
         "key": Qt.Key.Key_Left, "mod": Qt.KeyboardModifier.ControlModifier,
         "display": "Ctrl + ←", "desc": "Previous in Playlist"
     }
+    SHUFFLE = {
+        "key": Qt.Key.Key_S, "mod": Qt.KeyboardModifier.NoModifier,
+        "display": "S", "desc": "Toggle Shuffle"
+    }
     
     # --- Window ---
     FULLSCREEN = {
@@ -86,6 +94,18 @@ class K:
         "key": None, "mod": None, 
         "display": "Ctrl+O", "desc": "Add File(s) to Library"
     }
+    ADD_FOLDER = {
+        "key": None, "mod": None, 
+        "display": "Ctrl+Shift+O", "desc": "Add Folder to Library"
+    }
+    IMPORT_PLAYLIST = {
+        "key": None, "mod": None, 
+        "display": "Ctrl+I", "desc": "Import Playlist"
+    }
+    EXPORT_PLAYLIST = {
+        "key": None, "mod": None, 
+        "display": "Ctrl+E", "desc": "Export Playlist"
+    }
     NET_STREAM = {
         "key": None, "mod": None, 
         "display": "Ctrl+N", "desc": "Open Network Stream"
@@ -104,7 +124,8 @@ SHORTCUT_GROUPS = {
         K.SEEK_FWD, 
         K.SEEK_BACK, 
         K.VOL_UP, 
-        K.VOL_DOWN
+        K.VOL_DOWN,
+        K.STATS
     ],
     "Tracks & Chapters": [
         K.NEXT_CHAPTER,
@@ -115,7 +136,8 @@ SHORTCUT_GROUPS = {
     ],
     "Playlist Controls": [
         K.NEXT_PLAYLIST,
-        K.PREV_PLAYLIST
+        K.PREV_PLAYLIST,
+        K.SHUFFLE
     ],
     "Window Controls": [
         K.FULLSCREEN, 
@@ -124,6 +146,9 @@ SHORTCUT_GROUPS = {
     ],
     "File Menu": [
         K.ADD_FILES, 
+        K.ADD_FOLDER,
+        K.IMPORT_PLAYLIST,
+        K.EXPORT_PLAYLIST,
         K.NET_STREAM
     ]
 }
\ No newline at end of file
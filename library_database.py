@@ -0,0 +1,272 @@
+# library_database.py
+
+import logging
+import os
+import sqlite3
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+APP_DATA_NAME = "py-mpv-player"
+
+def default_data_dir():
+    """Returns the per-user data directory (XDG on Linux/macOS, APPDATA on Windows)."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, APP_DATA_NAME)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    added_at REAL NOT NULL,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    bitrate INTEGER,
+    size INTEGER,
+    mtime_ns INTEGER,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS watched_folders (
+    path TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS excluded_paths (
+    path TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS folder_mtimes (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_position ON entries(position);
+CREATE INDEX IF NOT EXISTS entries_title ON entries(title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS entries_added_at ON entries(added_at);
+CREATE INDEX IF NOT EXISTS entries_duration ON entries(duration);
+"""
+
+
+class LibraryDatabase:
+    """
+    SQLite store for the library: one row per entry with its playlist
+    position and the cached metadata columns (duration, resolution,
+    bitrate, and the file's size and mtime).
+
+    'path' is unique (and indexed by that constraint); 'position' is
+    indexed so the library can be read back in pages in playlist order
+    (keyset pagination) instead of all at once. Used from the GUI
+    thread only; every statement is small and indexed.
+    """
+
+    FILE_NAME = "library.sqlite3"
+    PAGE_SIZE = 2000
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(default_data_dir(), self.FILE_NAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.migrate()
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        row = self.conn.execute("SELECT MAX(position) FROM entries").fetchone()
+        self.next_position = 0 if row[0] is None else row[0] + 1
+        logger.info(f"Library database opened: {self.db_path}")
+
+    def migrate(self):
+        """Adds columns introduced after a database was first created."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(entries)")}
+        if not columns:
+            return  # Fresh database; SCHEMA creates everything
+        for name, column_type in (('size', 'INTEGER'), ('mtime_ns', 'INTEGER'),
+                                  ('bitrate', 'INTEGER'), ('content_hash', 'TEXT')):
+            if name not in columns:
+                self.conn.execute(f"ALTER TABLE entries ADD COLUMN {name} {column_type}")
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def iter_pages(self, page_size=None):
+        """
+        Yields lists of (path, title, duration, width, height, bitrate,
+        size, added_at) in playlist order, one page per next(). Each page is a fresh indexed query,
+        so nothing is held open between pages.
+        """
+        page_size = page_size or self.PAGE_SIZE
+        last_position = -1
+        while True:
+            rows = self.conn.execute(
+                "SELECT position, path, title, duration, width, height, bitrate, size, added_at "
+                "FROM entries "
+                "WHERE position > ? ORDER BY position LIMIT ?",
+                (last_position, page_size)
+            ).fetchall()
+            if not rows:
+                return
+            last_position = rows[-1][0]
+            yield [row[1:] for row in rows]
+
+    def add_entries(self, entries):
+        """
+        Appends [(path, title), ...] at the end of the playlist.
+        Returns the set of paths that were new; paths already in the
+        library are left where they are. Adding a path lifts its
+        exclusion from folder sync.
+        """
+        added = set()
+        now = time.time()
+        with self.conn:
+            for path, title in entries:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO entries (path, title, position, added_at) VALUES (?, ?, ?, ?)",
+                    (path, title, self.next_position, now)
+                )
+                if cursor.rowcount:
+                    added.add(path)
+                    self.next_position += 1
+            self.conn.executemany("DELETE FROM excluded_paths WHERE path = ?", [(path,) for path in added])
+        return added
+
+    def update_metadata(self, updates):
+        """Stores [(path, duration, width, height, bitrate), ...] in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE entries SET duration = ?, width = ?, height = ?, bitrate = ? WHERE path = ?",
+                [(duration, width, height, bitrate, path)
+                 for path, duration, width, height, bitrate in updates]
+            )
+
+    def remove_paths(self, paths):
+        with self.conn:
+            self.conn.executemany("DELETE FROM entries WHERE path = ?", [(path,) for path in paths])
+
+    def save_order(self, paths):
+        """
+        Renumbers the given paths 0..n-1 in order. 'paths' may be just the
+        loaded head of the playlist: it always holds the lowest positions,
+        so the rows after it keep their (higher) positions.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE entries SET position = ? WHERE path = ?",
+                [(position, path) for position, path in enumerate(paths)]
+            )
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.execute("DELETE FROM watched_folders")
+            self.conn.execute("DELETE FROM excluded_paths")
+            self.conn.execute("DELETE FROM folder_mtimes")
+        self.next_position = 0
+
+    # --- Watched folders ---
+
+    def watched_folders(self):
+        return [row[0] for row in self.conn.execute("SELECT path FROM watched_folders")]
+
+    def add_watched_folder(self, path):
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO watched_folders (path) VALUES (?)", (path,))
+
+    def files_under(self, directory):
+        """
+        Returns {path: (size, mtime_ns)} for every entry below 'directory'
+        (any depth). Size and mtime are None until first recorded. Uses a
+        range scan on the path index rather than LIKE.
+        """
+        prefix = directory.rstrip(os.sep) + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        rows = self.conn.execute(
+            "SELECT path, size, mtime_ns FROM entries WHERE path >= ? AND path < ?",
+            (prefix, upper)
+        )
+        return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+    def folder_mtimes(self):
+        """Returns {directory: mtime_ns} as of each watched directory's last diff."""
+        return dict(self.conn.execute("SELECT path, mtime_ns FROM folder_mtimes"))
+
+    def update_folder_mtimes(self, updates):
+        """Stores [(directory, mtime_ns), ...] in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO folder_mtimes (path, mtime_ns) VALUES (?, ?)", updates
+            )
+
+    def forget_folders(self, directories):
+        """Drops the stored mtimes of 'directories' and everything below them."""
+        with self.conn:
+            for directory in directories:
+                prefix = directory.rstrip(os.sep) + os.sep
+                upper = prefix[:-1] + chr(ord(os.sep) + 1)
+                self.conn.execute(
+                    "DELETE FROM folder_mtimes WHERE path = ? OR (path >= ? AND path < ?)",
+                    (directory, prefix, upper)
+                )
+
+    def exclude_paths(self, paths):
+        """Keeps folder sync from adding these paths back (the user removed them)."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO excluded_paths (path) VALUES (?)", [(path,) for path in paths]
+            )
+
+    def excluded_under(self, directory):
+        """Returns the set of excluded paths below 'directory' (any depth)."""
+        prefix = directory.rstrip(os.sep) + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        rows = self.conn.execute(
+            "SELECT path FROM excluded_paths WHERE path >= ? AND path < ?", (prefix, upper)
+        )
+        return {path for path, in rows}
+
+    def files_in(self, directory):
+        """Like files_under(), but only the direct children of 'directory'."""
+        directory = directory.rstrip(os.sep)
+        return {
+            path: stats for path, stats in self.files_under(directory).items()
+            if os.path.dirname(path) == directory
+        }
+
+    def update_file_stats(self, updates):
+        """
+        Stores [(path, size, mtime_ns), ...] in one transaction. A cached
+        content hash is dropped when the stats it was computed for change.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE entries SET "
+                "content_hash = CASE WHEN size IS ? AND mtime_ns IS ? THEN content_hash END, "
+                "size = ?, mtime_ns = ? WHERE path = ?",
+                [(size, mtime_ns, size, mtime_ns, path) for path, size, mtime_ns in updates]
+            )
+
+    # --- Duplicate detection ---
+
+    def content_hashes(self):
+        """Returns {path: (size, mtime_ns, content_hash)} for every hashed entry."""
+        rows = self.conn.execute(
+            "SELECT path, size, mtime_ns, content_hash FROM entries WHERE content_hash IS NOT NULL"
+        )
+        return {path: (size, mtime_ns, content_hash) for path, size, mtime_ns, content_hash in rows}
+
+    def update_content_hashes(self, updates):
+        """Stores [(path, size, mtime_ns, content_hash), ...] in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE entries SET size = ?, mtime_ns = ?, content_hash = ? WHERE path = ?",
+                [(size, mtime_ns, content_hash, path) for path, size, mtime_ns, content_hash in updates]
+            )
+
+    def close(self):
+        try:
+            self.conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to close library database: {e}")
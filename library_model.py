@@ -0,0 +1,755 @@
+# library_model.py
+
+import bisect
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from PySide6.QtCore import (
+    Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex,
+    QPersistentModelIndex, QMimeData, QByteArray, QTimer, Signal, Slot
+)
+from PySide6.QtGui import QPixmap
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QApplication
+from utils import format_time, format_size, format_bitrate
+from search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+COLUMN_THUMBNAIL = 0
+COLUMN_TITLE = 1
+COLUMN_DURATION = 2
+COLUMN_RESOLUTION = 3
+COLUMN_BITRATE = 4
+COLUMN_SIZE = 5
+COLUMN_ADDED = 6
+COLUMN_HEADERS = ["", "Title", "Duration", "Resolution", "Bitrate", "Size", "Added"]
+METADATA_COLUMNS = (COLUMN_DURATION, COLUMN_RESOLUTION, COLUMN_BITRATE, COLUMN_SIZE)
+
+ThumbnailRole = Qt.ItemDataRole.UserRole + 1
+
+# Thumbnail states for LibraryEntry.thumbnail_state
+THUMB_NONE = 0     # Not generated yet
+THUMB_READY = 1    # Generated (may have to be reloaded from the disk cache)
+THUMB_EMPTY = 2    # Source has no thumbnail (metadata only)
+THUMB_FAILED = 3
+
+ROWS_MIME_TYPE = "application/x-library-rows"
+
+FILTER_SLICE_MS = 5  # Search work per event loop iteration while filtering
+
+class LibraryEntry:
+    """
+    One library row. Kept small: 100k of these must stay cheap.
+    'item_id' never changes or gets reused, so async results can be
+    routed to the entry no matter how rows are moved in the meantime.
+    """
+    __slots__ = ('item_id', 'filepath', 'title', 'duration', 'width', 'height',
+                 'bitrate', 'size', 'added_at', 'thumbnail_state')
+
+    _ids = itertools.count(1)
+
+    def __init__(self, filepath, title, duration=None, width=None, height=None,
+                 bitrate=None, size=None, added_at=None):
+        self.item_id = next(LibraryEntry._ids)
+        self.filepath = filepath  # Local path or original URL
+        self.title = title
+        self.duration = duration  # Seconds; None until known
+        self.width = width        # Pixels; None until known, 0 if no video
+        self.height = height
+        self.bitrate = bitrate    # Bits per second; None until known
+        self.size = size          # Bytes; None until known
+        self.added_at = added_at or time.time()
+        self.thumbnail_state = THUMB_NONE
+
+    def duration_text(self):
+        if self.thumbnail_state == THUMB_FAILED:
+            return "Error"
+        return "..." if self.duration is None else format_time(self.duration)
+
+    def resolution_text(self):
+        if self.thumbnail_state == THUMB_FAILED:
+            return "Error"
+        if self.width is None:
+            return "..."
+        return f"{self.width}x{self.height}" if self.width > 0 else "N/A"
+
+    def search_text(self):
+        """Text the library filter matches against: path, title and resolution."""
+        parts = [self.filepath]
+        if self.title not in self.filepath:
+            parts.append(self.title)
+        if self.width:
+            parts.append(f"{self.width}x{self.height}")
+        return "\n".join(parts)
+
+
+class LibraryModel(QAbstractTableModel):
+    """
+    Table model behind the library view.
+
+    Rows are plain LibraryEntry objects in a list; thumbnails are not
+    stored on them but served from a bounded in-memory pixmap cache.
+    When a visible row's pixmap has been evicted, the view's scheduler
+    reloads it from the disk thumbnail cache. Inserts, removals, moves
+    and sorts are each a single batched model operation.
+
+    Entries are addressed by their stable item_id. The id -> row index
+    is only trusted below 'index_valid_from'; edits lower that mark and
+    the stale tail is renumbered on the next lookup that needs it, so
+    a burst of removals or moves costs one renumbering, not one each.
+    """
+
+    ICON_CACHE_SIZE = 600  # ~35 MB of 160x90 pixmaps
+
+    fetched = Signal()  # Rows were appended by fetchMore()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        self.by_id = {}       # item_id -> LibraryEntry
+        self.row_index = {}   # item_id -> row (valid below index_valid_from)
+        self.index_valid_from = 0
+        self.icons = OrderedDict()  # item_id -> QPixmap, LRU order
+        self.fetcher = None  # Iterator of entry batches still to be loaded
+        self.appended_ids = set()  # Rows added ahead of the fetcher; later batches go before them
+        self.search_index = SearchIndex()  # Filled as rows are loaded or inserted
+        self.sort_cache = {}  # column -> entries in ascending order
+        self.rank_cache = {}  # column -> {item_id: rank}
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMN_HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COLUMN_TITLE:
+                return entry.title
+            if column == COLUMN_DURATION:
+                return entry.duration_text()
+            if column == COLUMN_RESOLUTION:
+                return entry.resolution_text()
+            if column == COLUMN_BITRATE:
+                return "..." if entry.bitrate is None else format_bitrate(entry.bitrate)
+            if column == COLUMN_SIZE:
+                return "..." if entry.size is None else format_size(entry.size)
+            if column == COLUMN_ADDED:
+                return time.strftime("%Y-%m-%d", time.localtime(entry.added_at))
+        elif role == ThumbnailRole and column == COLUMN_THUMBNAIL:
+            return self.icon_for(entry)
+        elif role == Qt.ItemDataRole.UserRole and column == COLUMN_TITLE:
+            return entry.filepath
+        elif role == Qt.ItemDataRole.ToolTipRole and column == COLUMN_TITLE:
+            return entry.filepath
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column > COLUMN_TITLE:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsDragEnabled
+        if index.column() != COLUMN_THUMBNAIL:
+            flags |= Qt.ItemFlag.ItemIsSelectable
+        return flags
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self):
+        return [ROWS_MIME_TYPE]
+
+    def mimeData(self, indexes):
+        rows = sorted({index.row() for index in indexes})
+        mime = QMimeData()
+        mime.setData(ROWS_MIME_TYPE, QByteArray(",".join(map(str, rows)).encode()))
+        return mime
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action != Qt.DropAction.MoveAction or not data.hasFormat(ROWS_MIME_TYPE):
+            return False
+        if row < 0:
+            row = parent.row() if parent.isValid() else len(self.entries)
+        rows = [int(r) for r in bytes(data.data(ROWS_MIME_TYPE)).decode().split(",") if r]
+        self.move_rows(rows, row)
+        # Returning False stops the view from removing the source rows;
+        # the move has already been applied.
+        return False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetcher is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.fetcher is None:
+            return
+        batch = next(self.fetcher, None)
+        if not batch:
+            self.fetcher = None
+            self.appended_ids.clear()
+            return
+        self.insert_entries_at(self.fetch_row(), batch)
+        self.fetched.emit()
+
+    def fetch_row(self):
+        """Where fetched rows go: before the rows appended ahead of the fetcher."""
+        row = len(self.entries)
+        while row > 0 and self.entries[row - 1].item_id in self.appended_ids:
+            row -= 1
+        return row
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_by([(column, order)])
+
+    # --- Sorting ---
+
+    def sort_by(self, sort_keys):
+        """
+        Sorts by [(column, order), ...], the first pair being the primary
+        key. Each column's ascending order is computed once and cached
+        until its values change, so a single-key sort (either direction)
+        is a permutation of the cached list and a multi-key sort compares
+        small integer ranks instead of titles or floats. Rows with equal
+        keys stay in item_id (insertion) order in both directions, so
+        toggling the direction does not shuffle them.
+        """
+        sort_keys = [(column, order) for column, order in sort_keys if column in SORT_KEYS]
+        if not sort_keys:
+            return
+        self.fetch_all()
+        start = time.perf_counter()
+        if len(sort_keys) == 1:
+            column, order = sort_keys[0]
+            new_entries = list(self.sorted_by_column(column))
+            if order == Qt.SortOrder.DescendingOrder:
+                # Stable sort of the ascending list: ties keep their order
+                rank = self.ranks_for_column(column)
+                new_entries.sort(key=lambda entry: -rank[entry.item_id])
+        else:
+            ranks = [(self.ranks_for_column(column), order == Qt.SortOrder.DescendingOrder)
+                     for column, order in sort_keys]
+            new_entries = sorted(self.entries, key=lambda entry: tuple(
+                -rank[entry.item_id] if descending else rank[entry.item_id]
+                for rank, descending in ranks
+            ) + (entry.item_id,))
+        self.apply_order(new_entries)
+        logger.debug(f"Sorted {len(new_entries)} rows by {sort_keys} in "
+                     f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def sorted_by_column(self, column):
+        order = self.sort_cache.get(column)
+        if order is None:
+            key = SORT_KEYS[column]
+            order = self.sort_cache[column] = sorted(
+                self.entries, key=lambda entry: (key(entry), entry.item_id))
+        return order
+
+    def ranks_for_column(self, column):
+        """item_id -> dense rank in the column's ascending order (equal values share a rank)."""
+        ranks = self.rank_cache.get(column)
+        if ranks is None:
+            key = SORT_KEYS[column]
+            ranks = {}
+            rank = -1
+            previous = object()
+            for entry in self.sorted_by_column(column):
+                value = key(entry)
+                if value != previous:
+                    rank += 1
+                    previous = value
+                ranks[entry.item_id] = rank
+            self.rank_cache[column] = ranks
+        return ranks
+
+    def invalidate_sort_cache(self, columns=None):
+        if columns is None:
+            self.sort_cache.clear()
+            self.rank_cache.clear()
+            return
+        for column in columns:
+            self.sort_cache.pop(column, None)
+            self.rank_cache.pop(column, None)
+
+    # --- Lazy loading ---
+
+    def set_fetcher(self, batches):
+        """
+        Loads rows lazily from an iterator of LibraryEntry lists: the
+        first batch now, the rest as the view scrolls towards the end.
+        """
+        self.fetcher = iter(batches)
+        self.fetchMore()
+
+    def fetch_all(self):
+        """Loads every remaining batch (before operations that need all rows)."""
+        while self.fetcher is not None:
+            self.fetchMore()
+
+    def fetch_until(self, row):
+        """Loads batches until 'row' exists or nothing is left."""
+        while row >= len(self.entries) and self.fetcher is not None:
+            self.fetchMore()
+
+    # --- Search ---
+
+    def search(self, query):
+        """
+        Returns the ids of entries matching 'query', or None for an empty
+        query. Rows are indexed as they are loaded, so this only has to
+        load (and index) whatever part of the library is still unfetched.
+        """
+        self.fetch_all()
+        return self.search_index.search(query)
+
+    def start_search(self, query):
+        """Like search(), as a SearchJob the caller runs in time slices."""
+        self.fetch_all()
+        return self.search_index.start_search(query)
+
+    # --- Batched operations ---
+
+    def add_entries(self, entries):
+        """
+        Appends entries in one insert operation. While rows are still to
+        be fetched, the new rows stay at the end: fetched batches are
+        inserted before them, so they are shown right away and the
+        playlist order still matches the database once all is loaded.
+        """
+        if self.fetcher is not None:
+            self.appended_ids.update(entry.item_id for entry in entries)
+        self.insert_entries_at(len(self.entries), entries)
+
+    def insert_entries_at(self, first, entries):
+        if not entries:
+            return
+        appending = first == len(self.entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.entries[first:first] = entries
+        for row, entry in enumerate(entries, first):
+            self.by_id[entry.item_id] = entry
+            self.row_index[entry.item_id] = row
+            self.search_index.add(entry.item_id, entry.search_text())
+        if not appending:
+            self.index_valid_from = min(self.index_valid_from, first)  # Rows after the insert moved down
+        elif self.index_valid_from == first:
+            self.index_valid_from = len(self.entries)
+        self.invalidate_sort_cache()
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        """Removes the given rows (any order), one operation per contiguous run."""
+        removed = []
+        for start, end in contiguous_runs(sorted(set(rows), reverse=True)):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            run = self.entries[start:end + 1]
+            del self.entries[start:end + 1]
+            self.index_valid_from = min(self.index_valid_from, start)
+            for entry in run:
+                self.appended_ids.discard(entry.item_id)
+                del self.by_id[entry.item_id]
+                del self.row_index[entry.item_id]
+                self.icons.pop(entry.item_id, None)
+                self.search_index.remove(entry.item_id)
+            removed.extend(run)
+            self.invalidate_sort_cache()
+            self.endRemoveRows()
+        return removed
+
+    def clear(self):
+        self.beginResetModel()
+        self.fetcher = None
+        self.appended_ids.clear()
+        self.entries = []
+        self.by_id.clear()
+        self.row_index.clear()
+        self.index_valid_from = 0
+        self.icons.clear()
+        self.invalidate_sort_cache()
+        self.search_index.clear()
+        self.endResetModel()
+
+    def move_rows(self, rows, destination):
+        """Moves the given rows so they sit together before 'destination'."""
+        moving = set(rows)
+        if not moving:
+            return
+        if self.appended_ids:
+            # The saved order only covers the loaded head of the playlist,
+            # so finish loading before rows ahead of the fetcher can move
+            target = self.entries[destination] if destination < len(self.entries) else None
+            moving_ids = [self.entries[row].item_id for row in moving]
+            self.fetch_all()
+            moving = {self.row_of(item_id) for item_id in moving_ids}
+            destination = self.row_of(target.item_id) if target is not None else len(self.entries)
+        block = [self.entries[r] for r in sorted(moving)]
+        before = [e for r, e in enumerate(self.entries[:destination]) if r not in moving]
+        after = [e for r, e in enumerate(self.entries[destination:], destination) if r not in moving]
+        self.apply_order(before + block + after)
+
+    def apply_order(self, new_entries):
+        """Reorders rows as one layout change, keeping selections and the current row."""
+        self.layoutAboutToBeChanged.emit()
+        new_rows = {id(entry): row for row, entry in enumerate(new_entries)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [
+            self.index(new_rows[id(self.entries[index.row()])], index.column())
+            for index in old_indexes
+        ]
+        first_changed = next(
+            (row for row, (old, new) in enumerate(zip(self.entries, new_entries)) if old is not new),
+            len(new_entries)
+        )
+        self.entries = new_entries
+        self.index_valid_from = min(self.index_valid_from, first_changed)
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    # --- Entry access and updates ---
+
+    def entry(self, row):
+        return self.entries[row] if 0 <= row < len(self.entries) else None
+
+    def entry_for_id(self, item_id):
+        return self.by_id.get(item_id)
+
+    def row_of(self, item_id):
+        """Current row of 'item_id', or -1 if it is no longer in the model."""
+        row = self.row_index.get(item_id)
+        if row is None:
+            return -1
+        if row >= self.index_valid_from:
+            self.reindex()
+            row = self.row_index[item_id]
+        return row
+
+    def reindex(self):
+        """Renumbers the rows from the first one an edit may have shifted."""
+        for row in range(self.index_valid_from, len(self.entries)):
+            self.row_index[self.entries[row].item_id] = row
+        self.index_valid_from = len(self.entries)
+
+    def set_metadata(self, item_id, duration=None, width=None, height=None, bitrate=None, size=None):
+        """Updates the known metadata of 'item_id'. None leaves a field unchanged."""
+        row = self.row_of(item_id)
+        if row < 0:
+            return
+        entry = self.entries[row]
+        if duration is not None:
+            entry.duration = duration
+        if width is not None:
+            entry.width, entry.height = width, height or 0
+            self.search_index.add(item_id, entry.search_text())
+        if bitrate is not None:
+            entry.bitrate = bitrate
+        if size is not None:
+            entry.size = size
+        self.invalidate_sort_cache(METADATA_COLUMNS)
+        self.dataChanged.emit(self.index(row, COLUMN_DURATION), self.index(row, COLUMN_SIZE))
+
+    def set_thumbnail(self, item_id, image):
+        """Stores a thumbnail (QImage) for 'item_id'. A null image means 'none available'."""
+        row = self.row_of(item_id)
+        if row < 0:
+            return
+        entry = self.entries[row]
+        if image.isNull():
+            entry.thumbnail_state = THUMB_EMPTY
+        else:
+            entry.thumbnail_state = THUMB_READY
+            self.icons[item_id] = QPixmap.fromImage(image)
+            self.icons.move_to_end(item_id)
+            while len(self.icons) > self.ICON_CACHE_SIZE:
+                self.icons.popitem(last=False)
+        index = self.index(row, COLUMN_THUMBNAIL)
+        self.dataChanged.emit(index, index)
+
+    def set_failed(self, item_id):
+        row = self.row_of(item_id)
+        if row < 0:
+            return
+        self.entries[row].thumbnail_state = THUMB_FAILED
+        self.dataChanged.emit(self.index(row, COLUMN_DURATION), self.index(row, COLUMN_RESOLUTION))
+
+    def reset_entry(self, item_id):
+        """Forgets the thumbnail and metadata of 'item_id' (its file changed on disk)."""
+        row = self.row_of(item_id)
+        if row < 0:
+            return
+        entry = self.entries[row]
+        entry.duration = entry.width = entry.height = entry.bitrate = entry.size = None
+        entry.thumbnail_state = THUMB_NONE
+        self.invalidate_sort_cache(METADATA_COLUMNS)
+        self.icons.pop(item_id, None)
+        self.search_index.add(item_id, entry.search_text())
+        self.dataChanged.emit(self.index(row, COLUMN_THUMBNAIL), self.index(row, COLUMN_SIZE))
+
+    def icon_for(self, entry):
+        pixmap = self.icons.get(entry.item_id)
+        if pixmap is not None:
+            self.icons.move_to_end(entry.item_id)
+        return pixmap
+
+    def needs_thumbnail(self, entry):
+        """True if the row has never been processed or its pixmap was evicted."""
+        if entry.thumbnail_state == THUMB_NONE:
+            return True
+        return entry.thumbnail_state == THUMB_READY and entry.item_id not in self.icons
+
+
+def contiguous_runs(sorted_rows_desc):
+    """Groups descending row numbers into (start, end) runs, highest run first."""
+    runs = []
+    for row in sorted_rows_desc:
+        if runs and runs[-1][0] == row + 1:
+            runs[-1][0] = row
+        else:
+            runs.append([row, row])
+    return [(start, end) for start, end in runs]
+
+# Numeric keys (unknown values sort first); titles compare case-insensitively
+SORT_KEYS = {
+    COLUMN_TITLE: lambda entry: entry.title.casefold(),
+    COLUMN_DURATION: lambda entry: entry.duration or 0.0,
+    COLUMN_RESOLUTION: lambda entry: (entry.width or 0) * (entry.height or 0),
+    COLUMN_BITRATE: lambda entry: entry.bitrate or 0,
+    COLUMN_SIZE: lambda entry: entry.size or 0,
+    COLUMN_ADDED: lambda entry: entry.added_at,
+}
+
+
+class LibraryFilterProxy(QAbstractProxyModel):
+    """
+    Shows the LibraryModel rows that match the filter text, in library
+    order. Matching comes from the model's search index; the proxy only
+    keeps the sorted list of matching source rows, so a query never
+    walks the model through data() the way QSortFilterProxyModel would.
+    With an empty filter, or one every row matches, every call maps
+    straight through.
+
+    Broad queries take more than a frame to verify on a large library,
+    so a new query's search runs in FILTER_SLICE_MS slices; the view
+    keeps showing the previous rows until it finishes, and a newer
+    keystroke drops an unfinished search.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+        self.source_rows = None  # Matching source rows in order; None = all rows
+        self.saved_persistent = None
+        self.filter_job = None  # Unfinished SearchJob for 'query'
+        self.filter_start = 0.0
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.timeout.connect(self.continue_filter)
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.rowsAboutToBeInserted.connect(self.on_source_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self.on_source_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self.on_source_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self.on_source_rows_removed)
+        model.layoutAboutToBeChanged.connect(self.begin_layout_change)
+        model.layoutChanged.connect(self.end_layout_change)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self.on_source_reset)
+        model.dataChanged.connect(self.on_source_data_changed)
+
+    # --- Filtering ---
+
+    def set_filter(self, query):
+        """Filters to the entries matching 'query' (an empty query shows everything)."""
+        query = query.strip()
+        if query == self.query:
+            return
+        self.sourceModel().fetch_all()  # Before the query changes, so loading rows does not search
+        self.query = query
+        self.filter_start = time.perf_counter()
+        self.filter_job = self.sourceModel().start_search(query) if query else None
+        self.continue_filter()
+
+    @Slot()
+    def continue_filter(self):
+        job = self.filter_job
+        if job is not None and not job.run(time.perf_counter() + FILTER_SLICE_MS / 1000):
+            self.filter_timer.start(0)
+            return
+        self.filter_job = None
+        rows = self.matching_rows(job.matches if job is not None else None)
+        logger.debug(f"Filter '{self.query}': {len(rows) if rows is not None else 'all'} rows in "
+                     f"{(time.perf_counter() - self.filter_start) * 1000:.1f} ms")
+        if rows == self.source_rows:
+            return  # Same rows (e.g. a query every row matches); the view keeps its state
+        self.beginResetModel()
+        self.source_rows = rows
+        self.endResetModel()
+
+    def cancel_filter_job(self):
+        self.filter_job = None
+        self.filter_timer.stop()
+
+    def refilter(self):
+        """Recomputes the matching rows at once (inside a source change)."""
+        self.cancel_filter_job()
+        model = self.sourceModel()
+        self.source_rows = self.matching_rows(model.search(self.query) if self.query else None)
+
+    def matching_rows(self, matches):
+        """Sorted source rows of the 'matches' ids, or None when all rows match."""
+        model = self.sourceModel()
+        if matches is None or len(matches) == len(model.entries):
+            return None
+        if len(matches) * 8 < len(model.entries):
+            return sorted(row for row in map(model.row_of, matches) if row >= 0)
+        return [row for row, entry in enumerate(model.entries) if entry.item_id in matches]
+
+    def is_filtered(self):
+        return self.source_rows is not None
+
+    def source_row(self, proxy_row):
+        """Maps a view row to a LibraryModel row (-1 if out of range)."""
+        if self.source_rows is None:
+            return proxy_row
+        return self.source_rows[proxy_row] if 0 <= proxy_row < len(self.source_rows) else -1
+
+    def proxy_row(self, source_row):
+        """Maps a LibraryModel row to a view row (-1 if filtered out)."""
+        if self.source_rows is None:
+            return source_row
+        pos = bisect.bisect_left(self.source_rows, source_row)
+        if pos < len(self.source_rows) and self.source_rows[pos] == source_row:
+            return pos
+        return -1
+
+    # --- QAbstractProxyModel interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.source_rows is None:
+            return self.sourceModel().rowCount()
+        return len(self.source_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount()) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = self.source_row(proxy_index.row())
+        if row < 0:
+            return QModelIndex()
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self.proxy_row(source_index.row())
+        if row < 0:
+            return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    # --- Source change handling ---
+    # Without a query, inserts and removals are forwarded one to one;
+    # with one, the matching rows are recomputed inside a reset. Reorders are a
+    # layout change either way, with persistent indexes (selection,
+    # current row) following their source rows.
+
+    def on_source_rows_about_to_be_inserted(self, parent, first, last):
+        if not self.query:
+            self.beginInsertRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def on_source_rows_inserted(self, parent, first, last):
+        if self.query:
+            self.refilter()
+            self.endResetModel()
+        else:
+            self.endInsertRows()
+
+    def on_source_rows_about_to_be_removed(self, parent, first, last):
+        if not self.query:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def on_source_rows_removed(self, parent, first, last):
+        if self.query:
+            self.refilter()
+            self.endResetModel()
+        else:
+            self.endRemoveRows()
+
+    def begin_layout_change(self):
+        self.layoutAboutToBeChanged.emit()
+        indexes = self.persistentIndexList()
+        self.saved_persistent = (indexes, [QPersistentModelIndex(self.mapToSource(i)) for i in indexes])
+
+    def end_layout_change(self):
+        if self.query:
+            self.refilter()
+        indexes, source_indexes = self.saved_persistent or ([], [])
+        self.saved_persistent = None
+        self.changePersistentIndexList(
+            indexes, [self.mapFromSource(QModelIndex(source)) for source in source_indexes]
+        )
+        self.layoutChanged.emit()
+
+    def on_source_reset(self):
+        if self.query:
+            self.refilter()
+        self.endResetModel()
+
+    def on_source_data_changed(self, top_left, bottom_right, roles=()):
+        if self.source_rows is None:
+            self.dataChanged.emit(self.mapFromSource(top_left), self.mapFromSource(bottom_right), roles)
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            proxy_row = self.proxy_row(row)
+            if proxy_row >= 0:
+                self.dataChanged.emit(
+                    self.index(proxy_row, top_left.column()),
+                    self.index(proxy_row, bottom_right.column()),
+                    roles
+                )
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Paints the cached thumbnail pixmap centered in its cell."""
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+        self.initStyleOption(option, index)
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        pixmap = index.data(ThumbnailRole)
+        if pixmap is None or pixmap.isNull():
+            return
+        x = option.rect.x() + (option.rect.width() - pixmap.width()) // 2
+        y = option.rect.y() + (option.rect.height() - pixmap.height()) // 2
+        painter.drawPixmap(x, y, pixmap)
@@ -2,20 +2,53 @@
 # (UPDATED to store and pass stream_data)
 
 import logging
+import os
+import time
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QFileDialog,    
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+    QPushButton, QFileDialog, QLineEdit,
     QAbstractItemView, QSizePolicy, QMessageBox, QLabel,
-    QHeaderView, QListWidgetItem
+    QHeaderView, QApplication
 )
-from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer
-from PySide6.QtGui import QFont, QIcon
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer, QThreadPool, QModelIndex
+from PySide6.QtGui import QFont, QImage
 from persistence_manager import PersistenceManager
 from pathlib import Path
-from thumbnail_worker import ThumbnailWorker
+from thumbnail_scheduler import ThumbnailScheduler
+from thumbnail_cache import ThumbnailCache
+from probe_worker import ProbeWorker
+from folder_scanner import FolderScanWorker
+from library_database import LibraryDatabase
+from folder_watcher import FolderWatcher
+from duplicate_finder import DuplicateFinder
+from playlist_io import PlaylistImportWorker, write_playlist, PLAYLIST_FILTER
+from shuffle_order import ShuffleOrder
+from utils import format_size
+from library_model import (
+    LibraryModel, LibraryEntry, LibraryFilterProxy, ThumbnailDelegate,
+    COLUMN_THUMBNAIL, COLUMN_TITLE, COLUMN_DURATION, COLUMN_RESOLUTION, COLUMN_BITRATE,
+    COLUMN_SIZE, COLUMN_ADDED, COLUMN_HEADERS, SORT_KEYS
+)
 
 logger = logging.getLogger(__name__)
 
+# Widest expected text of each metadata column. Widths are computed from
+# these once; ResizeToContents would query every row on each relayout.
+COLUMN_WIDTH_SAMPLES = {
+    COLUMN_DURATION: "00:00:00", COLUMN_RESOLUTION: "3840x2160",
+    COLUMN_BITRATE: "999.9 Mbps", COLUMN_SIZE: "999.9 GB", COLUMN_ADDED: "2000-00-00",
+}
+
+FETCH_BATCH_SIZE = 250  # Rows the model loads per fetch
+BACKGROUND_FETCH_INTERVAL_MS = 20  # Between batches loaded in the background
+
+# Thumbnail scheduling: visible rows first, then a prefetch margin
+# around the viewport, then everything else in small background batches.
+PREFETCH_ROWS = 20
+PREFETCH_PRIORITY = 1000
+BACKGROUND_PRIORITY = 100000
+BACKGROUND_BATCH = 32
+
 class LibraryWidget(QWidget):
     
     # --- UPDATED SIGNAL ---
@@ -28,15 +61,52 @@ class LibraryWidget(QWidget):
         self.file_dialog = QFileDialog(self)
         self.file_dialog.setFileMode(QFileDialog.FileMode.ExistingFiles)
         self.file_dialog.setNameFilter("Video Files (*.mp4 *.mkv *.avi *.mov);;All Files (*.*)")
-        self.worker_threads = []
+        cache_dir = self.persistence_manager.cache_dir
+        self.thumbnail_cache = ThumbnailCache(
+            os.path.join(cache_dir, "thumbnails") if cache_dir else None,
+            max_bytes=self.persistence_manager.load_thumbnail_cache_bytes()
+        )
+        self.thumbnail_scheduler = ThumbnailScheduler(
+            self.thumbnail_cache,
+            max_workers=self.persistence_manager.load_thumbnail_workers(),
+            mode=self.persistence_manager.load_thumbnail_mode(),
+            parent=self
+        )
         self.stream_data_cache = {}
         self.thumbnail_delay_timer = QTimer(self)  # Delay timer
         self.thumbnail_delay_timer.setSingleShot(True)
-        self.thumbnail_delay_timer.timeout.connect(self.process_pending_thumbnails)
-        self.pending_thumbnail_requests = []  # Queue for thumbnail requests
+        self.thumbnail_delay_timer.timeout.connect(self.schedule_thumbnails)
+        self.thumbnail_pending = {}  # item_id -> filepath, until its thumbnail arrives
+        self.probe_queue = []  # (item_id, filepath) waiting for a header probe
+        self.probe_workers = set()
+        self.scan_workers = set()
+        self.duplicate_finder = None
+        self.shuffle = None  # ShuffleOrder while shuffle playback is on
+        self.probe_timer = QTimer(self)
+        self.probe_timer.setSingleShot(True)
+        self.probe_timer.timeout.connect(self.start_probe_worker)
+        data_dir = self.persistence_manager.data_dir
+        self.library_db = LibraryDatabase(
+            os.path.join(data_dir, LibraryDatabase.FILE_NAME) if data_dir else None
+        )
+        self.metadata_updates = {}  # filepath -> (duration, width, height, bitrate), written in batches
+        self.sort_keys = []  # [(column, order), ...], primary key first
+        self.db_flush_timer = QTimer(self)
+        self.db_flush_timer.setSingleShot(True)
+        self.db_flush_timer.timeout.connect(self.flush_library_db)
+        self.order_save_timer = QTimer(self)
+        self.order_save_timer.setSingleShot(True)
+        self.order_save_timer.timeout.connect(self.save_library_order)
+        self.background_fetch_timer = QTimer(self)  # Loads the rest of the library when idle
+        self.background_fetch_timer.setInterval(BACKGROUND_FETCH_INTERVAL_MS)
+        self.background_fetch_timer.timeout.connect(self.fetch_next_page)
+        self.appended_ahead = set()  # Paths added while the saved library was still loading (already shown)
+        self.folder_watcher = FolderWatcher(self.library_db, self)
         
         self.init_ui()
         self.create_connections()
+        self.load_library()
+        self.folder_watcher.start()
         
     def init_ui(self):
         layout = QVBoxLayout()
@@ -47,14 +117,25 @@ class LibraryWidget(QWidget):
         title.setFont(title_font); title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         button_layout = QHBoxLayout()
         self.add_files_btn = QPushButton("Add Files")
+        self.add_folder_btn = QPushButton("Add Folder")
+        self.duplicates_btn = QPushButton("Find Duplicates")
         self.remove_btn = QPushButton("Remove Selected")
         self.clear_btn = QPushButton("Clear All")
-        button_layout.addWidget(self.add_files_btn); button_layout.addWidget(self.remove_btn)
+        button_layout.addWidget(self.add_files_btn); button_layout.addWidget(self.add_folder_btn)
+        button_layout.addWidget(self.duplicates_btn); button_layout.addWidget(self.remove_btn)
         button_layout.addWidget(self.clear_btn); button_layout.addStretch()
-        self.table_widget = QTableWidget()
-        self.table_widget.setColumnCount(4)
-        self.table_widget.setHorizontalHeaderLabels(["", "Title", "Duration", "Resolution"])
+        self.library_model = LibraryModel(self)
+        self.filter_proxy = LibraryFilterProxy(self)
+        self.filter_proxy.setSourceModel(self.library_model)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Filter by title, path or resolution...")
+        self.search_box.setClearButtonEnabled(True)
+        self.table_widget = QTableView()
+        self.table_widget.setModel(self.filter_proxy)
+        self.table_widget.setItemDelegateForColumn(COLUMN_THUMBNAIL, ThumbnailDelegate(self.table_widget))
         self.table_widget.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.table_widget.setDefaultDropAction(Qt.DropAction.MoveAction)
+        self.table_widget.setDragDropOverwriteMode(False)
         self.table_widget.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.table_widget.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table_widget.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
@@ -64,23 +145,202 @@ class LibraryWidget(QWidget):
         header = self.table_widget.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        cell_metrics = self.table_widget.fontMetrics()
+        header_metrics = header.fontMetrics()
+        for column, sample in COLUMN_WIDTH_SAMPLES.items():
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+            width = max(cell_metrics.horizontalAdvance(sample),
+                        header_metrics.horizontalAdvance(COLUMN_HEADERS[column]) + 20)  # Sort arrow
+            self.table_widget.setColumnWidth(column, width + 16)
+        # Sorting is driven from header clicks (see on_header_clicked) so
+        # Shift+click can add secondary keys
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        header.setToolTip("Click to sort, Shift+click to add a secondary sort column")
         self.table_widget.setColumnWidth(0, 160)
         self.table_widget.verticalHeader().setVisible(False)
+        # Fixed row height lets the view skip per-row size hints on large libraries
+        self.table_widget.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.table_widget.verticalHeader().setDefaultSectionSize(90)
         self.table_widget.setIconSize(QSize(160, 90))
+        self.status_label = QLabel("")
+        scan_layout = QHBoxLayout()
+        self.scan_label = QLabel("")
+        self.cancel_scan_btn = QPushButton("Cancel Scan")
+        self.cancel_scan_btn.hide()
+        scan_layout.addWidget(self.scan_label); scan_layout.addStretch()
+        scan_layout.addWidget(self.cancel_scan_btn)
         layout.addWidget(title)
         layout.addLayout(button_layout)
+        layout.addWidget(self.search_box)
         layout.addWidget(self.table_widget)
+        layout.addLayout(scan_layout)
+        layout.addWidget(self.status_label)
         self.setLayout(layout)
 
     def create_connections(self):
         # ... (this method is unchanged) ...
         self.add_files_btn.clicked.connect(self.open_add_files_dialog)
+        self.add_folder_btn.clicked.connect(self.open_add_folder_dialog)
+        self.cancel_scan_btn.clicked.connect(self.cancel_folder_scans)
+        self.duplicates_btn.clicked.connect(self.find_duplicates)
         self.remove_btn.clicked.connect(self.remove_selected_items)
         self.clear_btn.clicked.connect(self.clear_all_items)
-        self.table_widget.itemDoubleClicked.connect(self.play_item)
+        self.table_widget.doubleClicked.connect(self.play_item)
+        self.table_widget.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
+        self.thumbnail_scheduler.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.thumbnail_scheduler.thumbnail_failed.connect(self.on_thumbnail_failed)
+        self.thumbnail_scheduler.stats_changed.connect(self.on_thumbnail_stats_changed)
+        self.thumbnail_scheduler.queue_low.connect(self.feed_background_thumbnails)
+        self.table_widget.verticalScrollBar().valueChanged.connect(self.on_viewport_changed)
+        self.search_box.textChanged.connect(self.on_search_text_changed)
+        self.filter_proxy.modelReset.connect(self.on_viewport_changed)
+        self.library_model.layoutChanged.connect(self.on_viewport_changed)
+        self.library_model.layoutChanged.connect(self.on_library_order_changed)
+        self.library_model.fetched.connect(self.on_library_fetched)
+        self.folder_watcher.files_added.connect(self.add_files)
+        self.folder_watcher.files_removed.connect(self.remove_paths)
+        self.folder_watcher.files_changed.connect(self.refresh_paths)
+
+    def load_library(self):
+        """
+        Shows the saved library. Rows past the first page load as the view
+        scrolls, and otherwise one page at a time while the GUI is idle, so
+        the search index covers the whole library before the first query.
+        """
+        start = time.perf_counter()
+        self.library_model.set_fetcher(self.iter_library_pages())
+        logger.info(f"Library loaded {self.library_model.rowCount()} of "
+                    f"{self.library_db.count()} entries in {(time.perf_counter() - start) * 1000:.0f} ms")
+        if self.library_model.canFetchMore():
+            self.background_fetch_timer.start()
+
+    @Slot()
+    def fetch_next_page(self):
+        if self.library_model.canFetchMore():
+            self.library_model.fetchMore()
+        if not self.library_model.canFetchMore():
+            self.background_fetch_timer.stop()
+            logger.debug(f"Library fully loaded: {self.library_model.rowCount()} entries")
+
+    def iter_library_pages(self):
+        # Model batches are smaller than database pages, so each fetch
+        # (rows plus their search index entries) fits between frames
+        for page in self.library_db.iter_pages():
+            for start in range(0, len(page), FETCH_BATCH_SIZE):
+                batch = [
+                    LibraryEntry(path, title, duration, width, height, bitrate, size, added_at)
+                    for path, title, duration, width, height, bitrate, size, added_at
+                    in page[start:start + FETCH_BATCH_SIZE]
+                ]
+                if self.appended_ahead:
+                    shown = {entry.filepath for entry in batch} & self.appended_ahead
+                    if shown:
+                        self.appended_ahead -= shown
+                        batch = [entry for entry in batch if entry.filepath not in shown]
+                if batch:  # An empty batch would end the fetch
+                    yield batch
+        self.appended_ahead.clear()
+
+    @Slot(str)
+    def on_search_text_changed(self, text):
+        # The shuffle order is kept as it is: ids the filter hides are
+        # skipped when they come up, so the cycle and history survive typing
+        self.filter_proxy.set_filter(text)  # Logs its own timing once the rows are in
+
+    @Slot(int)
+    def on_header_clicked(self, column):
+        """
+        A click sorts by 'column' (again to reverse it); Shift+click adds
+        it as the next sort key, or reverses it if it already is one.
+        """
+        if column not in SORT_KEYS:
+            return
+        keys = dict(self.sort_keys)
+        shift = QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier
+        if column in keys and (shift or self.sort_keys[0][0] == column):
+            flipped = (Qt.SortOrder.AscendingOrder if keys[column] == Qt.SortOrder.DescendingOrder
+                       else Qt.SortOrder.DescendingOrder)
+            if shift:
+                self.sort_keys = [(c, flipped if c == column else o) for c, o in self.sort_keys]
+            else:
+                self.sort_keys = [(column, flipped)]
+        elif shift and self.sort_keys:
+            self.sort_keys.append((column, Qt.SortOrder.AscendingOrder))
+        else:
+            self.sort_keys = [(column, Qt.SortOrder.AscendingOrder)]
+        self.apply_sort()
+
+    def apply_sort(self):
+        start = time.perf_counter()
+        self.library_model.sort_by(self.sort_keys)
+        header = self.table_widget.horizontalHeader()
+        primary_column, primary_order = self.sort_keys[0]
+        header.setSortIndicator(primary_column, primary_order)
+        description = ", then ".join(
+            f"{COLUMN_HEADERS[column]} {'descending' if order == Qt.SortOrder.DescendingOrder else 'ascending'}"
+            for column, order in self.sort_keys
+        )
+        self.status_label.setText(f"Sorted by {description} "
+                                  f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    def view_row_of(self, item_id):
+        """Returns the view row showing 'item_id', or -1 if it is not shown."""
+        source_row = self.library_model.row_of(item_id)
+        if source_row < 0:
+            return -1
+        index = self.filter_proxy.mapFromSource(self.library_model.index(source_row, COLUMN_TITLE))
+        return index.row() if index.isValid() else -1
+
+    def view_entry(self, view_row):
+        """Returns the LibraryEntry shown at 'view_row' of the (filtered) table."""
+        return self.library_model.entry(self.filter_proxy.source_row(view_row))
+
+    @Slot()
+    def on_library_fetched(self):
+        self.count_changed.emit(self.library_model.rowCount())
+        self.on_viewport_changed()
+
+    @Slot()
+    def on_library_order_changed(self):
+        self.order_save_timer.start(1000)
+
+    @Slot()
+    def save_library_order(self):
+        try:
+            self.library_db.save_order([entry.filepath for entry in self.library_model.entries])
+        except Exception as e:
+            logger.warning(f"Failed to save library order: {e}")
+
+    def record_metadata(self, item_id, duration, width, height, bitrate=None, size=None):
+        """
+        Updates a row's metadata and queues it for the library database.
+        None leaves a field unchanged. The size is only shown here; the
+        database stores it together with the mtime (see on_files_probed).
+        """
+        entry = self.library_model.entry_for_id(item_id)
+        if entry is None:
+            return
+        current = (entry.duration, entry.width, entry.height, entry.bitrate, entry.size)
+        new = (duration, width, height, bitrate, size)
+        if all(value is None or value == old for value, old in zip(new, current)):
+            return
+        self.library_model.set_metadata(item_id, duration, width, height, bitrate, size)
+        self.metadata_updates[entry.filepath] = (entry.duration, entry.width, entry.height, entry.bitrate)
+        if not self.db_flush_timer.isActive():
+            self.db_flush_timer.start(2000)
+
+    @Slot()
+    def flush_library_db(self):
+        if not self.metadata_updates:
+            return
+        updates = [(path,) + values for path, values in self.metadata_updates.items()]
+        self.metadata_updates = {}
+        try:
+            self.library_db.update_metadata(updates)
+        except Exception as e:
+            logger.warning(f"Failed to save library metadata: {e}")
 
     @Slot()
     def open_add_files_dialog(self):
@@ -91,8 +351,191 @@ class LibraryWidget(QWidget):
             filepaths = self.file_dialog.selectedFiles()
             if filepaths:
                 self.persistence_manager.save_last_open_path(filepaths[0])
-                for filepath in filepaths:
-                    self.add_file(filepath)
+                self.add_files(filepaths)
+
+    @Slot()
+    def open_add_folder_dialog(self):
+        folder = QFileDialog.getExistingDirectory(
+            self, "Add Folder to Library", self.persistence_manager.load_last_open_path()
+        )
+        if folder:
+            self.persistence_manager.save_last_open_path(folder)
+            self.add_folder(folder)
+
+    @Slot()
+    def open_import_playlist_dialog(self):
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Import Playlist", self.persistence_manager.load_last_open_path(), PLAYLIST_FILTER
+        )
+        if filepath:
+            self.persistence_manager.save_last_open_path(filepath)
+            self.import_playlist(filepath)
+
+    def import_playlist(self, filepath):
+        """Adds the entries of an M3U/M3U8/XSPF playlist as they are read."""
+        worker = PlaylistImportWorker(filepath)
+        worker.signals.batch_found.connect(self.on_playlist_batch_found)
+        worker.signals.finished.connect(self.on_scan_finished)
+        self.scan_workers.add(worker)
+        self.scan_label.setText(f"Importing {os.path.basename(filepath)}...")
+        self.cancel_scan_btn.show()
+        QThreadPool.globalInstance().start(worker)
+
+    @Slot(object, list)
+    def on_playlist_batch_found(self, worker, items):
+        if worker.cancelled:
+            return
+        self.insert_entries([
+            LibraryEntry(location, title or (location if location.startswith('http')
+                                              else os.path.basename(location)), duration)
+            for location, title, duration in items
+        ])
+        self.scan_label.setText(f"Importing {os.path.basename(worker.filepath)}: "
+                                f"{self.library_model.rowCount()} entries in the library")
+
+    @Slot()
+    def open_export_playlist_dialog(self):
+        filepath, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Playlist", self.persistence_manager.load_last_open_path(), PLAYLIST_FILTER
+        )
+        if not filepath:
+            return
+        if not os.path.splitext(filepath)[1]:
+            filepath += ".xspf" if selected_filter.startswith("XSPF") else ".m3u8"
+        self.export_playlist(filepath)
+
+    def export_playlist(self, filepath):
+        """
+        Writes the rows the table shows (the whole library, or the
+        current filter's matches) in view order, streamed from the model.
+        """
+        self.library_model.fetch_all()
+        start = time.perf_counter()
+        entries = (self.view_entry(row) for row in range(self.filter_proxy.rowCount()))
+        try:
+            count = write_playlist(filepath, entries)
+        except OSError as e:
+            logger.error(f"Failed to export playlist {filepath}: {e}")
+            QMessageBox.warning(self, "Export Playlist", f"Could not write the playlist:\n{e}")
+            return
+        logger.info(f"Exported {count} entries to {filepath} in "
+                    f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def add_folder(self, folder):
+        """
+        Scans 'folder' recursively in the background, adding videos as
+        they are found, and keeps watching it for changes afterwards.
+        """
+        self.folder_watcher.watch_folder(folder)
+        worker = FolderScanWorker(folder)
+        worker.signals.batch_found.connect(self.on_scan_batch_found)
+        worker.signals.progress.connect(self.on_scan_progress)
+        worker.signals.finished.connect(self.on_scan_finished)
+        self.scan_workers.add(worker)
+        self.scan_label.setText(f"Scanning {folder}...")
+        self.cancel_scan_btn.show()
+        QThreadPool.globalInstance().start(worker)
+
+    @Slot()
+    def cancel_folder_scans(self):
+        """Cancels running folder scans and the duplicate search."""
+        for worker in self.scan_workers:
+            worker.cancel()
+        if self.duplicate_finder is not None:
+            self.duplicate_finder.cancel()
+
+    @Slot(object, list)
+    def on_scan_batch_found(self, worker, filepaths):
+        if not worker.cancelled:
+            self.add_files(filepaths)
+
+    @Slot(object, int, int)
+    def on_scan_progress(self, worker, dirs_scanned, files_found):
+        if not worker.cancelled:
+            self.scan_label.setText(
+                f"Scanning {worker.root}: {files_found} videos in {dirs_scanned} folders"
+            )
+
+    @Slot(object, int)
+    def on_scan_finished(self, worker, files_found):
+        self.scan_workers.discard(worker)
+        if not self.scan_workers:
+            self.scan_label.setText("")
+            self.cancel_scan_btn.hide()
+
+    @Slot()
+    def find_duplicates(self):
+        """Looks for library files with identical content in the background."""
+        if self.duplicate_finder is not None:
+            return
+        self.library_model.fetch_all()
+        filepaths = [entry.filepath for entry in self.library_model.entries
+                     if not entry.filepath.startswith('http')]
+        try:
+            cached_hashes = self.library_db.content_hashes()
+        except Exception as e:
+            logger.warning(f"Failed to read cached content hashes: {e}")
+            cached_hashes = {}
+        worker = DuplicateFinder(filepaths, cached_hashes)
+        worker.signals.progress.connect(self.on_duplicate_progress)
+        worker.signals.finished.connect(self.on_duplicates_found)
+        self.duplicate_finder = worker
+        self.duplicates_btn.setEnabled(False)
+        self.scan_label.setText(f"Looking for duplicates among {len(filepaths)} files...")
+        self.cancel_scan_btn.show()
+        QThreadPool.globalInstance().start(worker)
+
+    @Slot(object, int, int)
+    def on_duplicate_progress(self, worker, hashed, total):
+        if not worker.cancelled:
+            self.scan_label.setText(f"Looking for duplicates: {hashed} of {total} candidates checked")
+
+    @Slot(object, list, list)
+    def on_duplicates_found(self, worker, groups, new_hashes):
+        self.duplicate_finder = None
+        self.duplicates_btn.setEnabled(True)
+        if not self.scan_workers:
+            self.scan_label.setText("")
+            self.cancel_scan_btn.hide()
+        if new_hashes:
+            try:
+                self.library_db.update_content_hashes(new_hashes)
+            except Exception as e:
+                logger.warning(f"Failed to save content hashes: {e}")
+        if worker.cancelled:
+            return
+        if not groups:
+            QMessageBox.information(self, "Find Duplicates", "No duplicate files found in the library.")
+            return
+        self.merge_duplicates(groups)
+
+    def merge_duplicates(self, groups):
+        """
+        Reports duplicate groups and offers to keep only the first copy
+        (in playlist order) of each. Files on disk are never touched.
+        """
+        extra_copies = [path for paths in groups for path in paths[1:]]
+        wasted = 0
+        for path in extra_copies:
+            try:
+                wasted += os.path.getsize(path)
+            except OSError:
+                pass
+        box = QMessageBox(self)
+        box.setWindowTitle("Find Duplicates")
+        box.setIcon(QMessageBox.Icon.Question)
+        box.setText(f"Found {len(groups)} files with {len(extra_copies)} extra copies "
+                    f"({format_size(wasted)}).\n\n"
+                    f"Remove the extra copies from the library? Files on disk are not deleted.")
+        box.setDetailedText("\n\n".join(
+            "\n".join([f"Keep:   {paths[0]}"] + [f"Remove: {path}" for path in paths[1:]])
+            for paths in groups
+        ))
+        box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if box.exec() == QMessageBox.StandardButton.Yes:
+            self.remove_paths(extra_copies)
+            self.folder_watcher.exclude(extra_copies)
+            logger.info(f"Removed {len(extra_copies)} duplicate entries from the library.")
 
     def add_file(self, filepath, display_name=None, stream_data=None):
         """
@@ -109,129 +552,339 @@ class LibraryWidget(QWidget):
         if stream_data:
             self.stream_data_cache[filepath] = stream_data
         
-        row_position = self.table_widget.rowCount()
-        self.table_widget.insertRow(row_position)
-        
-        thumb_item = QTableWidgetItem()
-        thumb_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        thumb_item.setFlags(thumb_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-        
-        title_item = QTableWidgetItem(display_name)
-        title_item.setData(Qt.ItemDataRole.UserRole, filepath) # Store the *original* path/URL
-        title_item.setToolTip(filepath)
-        
-        duration_item = QTableWidgetItem("...")
-        duration_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        resolution_item = QTableWidgetItem("...")
-        resolution_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        self.table_widget.setItem(row_position, 0, thumb_item)
-        self.table_widget.setItem(row_position, 1, title_item)
-        self.table_widget.setItem(row_position, 2, duration_item)
-        self.table_widget.setItem(row_position, 3, resolution_item)
-        
-        self.pending_thumbnail_requests.append((filepath, row_position))
-        
+        self.insert_entries([LibraryEntry(filepath, display_name)])
         logger.info(f"Added to playlist: {filepath}")
-        self.count_changed.emit(self.table_widget.rowCount())
 
-        self.thumbnail_delay_timer.start(100)  # .1 second delay
+    def add_files(self, filepaths):
+        """
+        Adds many local files or URLs at once: one model insert, one
+        count_changed and one thumbnail scheduling pass for the batch.
+        """
+        entries = [
+            LibraryEntry(filepath, filepath if filepath.startswith('http') else os.path.basename(filepath))
+            for filepath in filepaths
+        ]
+        if entries:
+            self.insert_entries(entries)
+            logger.info(f"Added {len(entries)} files to playlist.")
 
-    def process_pending_thumbnails(self):
-        """Process queued thumbnail requests after startup delay."""
-        for filepath, row in self.pending_thumbnail_requests:
-            self.start_thumbnail_worker(filepath, row)
-        self.pending_thumbnail_requests.clear()
-    
-    
-    def start_thumbnail_worker(self, filepath, row):
-        worker = ThumbnailWorker(filepath, row)
-        worker.thumbnail_ready.connect(self.on_thumbnail_ready)
-        worker.thumbnail_failed.connect(self.on_thumbnail_failed)
-        worker.finished.connect(lambda: self.cleanup_worker(worker))
-        worker.start()
-        self.worker_threads.append(worker)
-
-    @Slot(int, QIcon, str, str)
-    def on_thumbnail_ready(self, row, icon, duration_str, resolution_str):
+    def insert_entries(self, entries):
         try:
-            self.table_widget.item(row, 0).setIcon(icon)
-            self.table_widget.item(row, 2).setText(duration_str)
-            self.table_widget.item(row, 3).setText(resolution_str)
+            added = self.library_db.add_entries([(entry.filepath, entry.title) for entry in entries])
+            saved = True
         except Exception as e:
-            logger.warning(f"Failed to set table data for row {row}: {e}")
-    @Slot(int, str)
-    def on_thumbnail_failed(self, row, error_message):
+            logger.warning(f"Failed to save library entries: {e}")
+            added = {entry.filepath for entry in entries}
+            saved = False
+        # Paths already in the library are not added twice
+        new_entries = []
+        for entry in entries:
+            if entry.filepath in added:
+                added.discard(entry.filepath)
+                new_entries.append(entry)
+        entries = new_entries
+        if not entries:
+            return
+        if not saved:
+            self.library_model.fetch_all()  # Not in the database, so the pager will not place them
+        elif self.library_model.canFetchMore():
+            # Saved after the whole playlist: shown at the end now, while the
+            # rest loads in front of them (the pager skips them)
+            self.appended_ahead.update(entry.filepath for entry in entries)
+        self.library_model.add_entries(entries)
+        if self.shuffle is not None:
+            for entry in entries:
+                self.shuffle.add(entry.item_id)
+        for entry in entries:
+            self.thumbnail_pending[entry.item_id] = entry.filepath
+            if not entry.filepath.startswith('http'):
+                self.probe_queue.append((entry.item_id, entry.filepath))
+        if self.probe_queue:
+            self.probe_timer.start(0)
+        self.count_changed.emit(self.library_model.rowCount())
+
+        self.thumbnail_delay_timer.start(100)  # .1 second delay
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.on_viewport_changed()
+
+    @Slot()
+    def on_viewport_changed(self):
+        """Re-prioritize thumbnails shortly after scrolling/resizing settles."""
+        if self.filter_proxy.rowCount():
+            self.thumbnail_delay_timer.start(50)
+
+    def visible_row_range(self):
+        """Returns (first, last) rows currently shown in the table viewport."""
+        row_count = self.filter_proxy.rowCount()
+        if row_count == 0:
+            return 0, -1
+        first = self.table_widget.rowAt(0)
+        last = self.table_widget.rowAt(self.table_widget.viewport().height() - 1)
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = row_count - 1
+        return first, last
+
+    @Slot()
+    def schedule_thumbnails(self):
+        """
+        Queues thumbnails for the visible rows first, then for a prefetch
+        margin around them. Jobs queued for rows that have scrolled away
+        are dropped and come back later through the background feed.
+        """
+        self.thumbnail_scheduler.cancel_queued()
+
+        jobs = []
+        first, last = self.visible_row_range()
+        start = max(0, first - PREFETCH_ROWS)
+        end = min(self.filter_proxy.rowCount() - 1, last + PREFETCH_ROWS)
+        for row in range(start, end + 1):
+            entry = self.view_entry(row)
+            filepath = self.thumbnail_pending.get(entry.item_id)
+            if filepath is None:
+                # Pixmaps evicted from the model's memory cache are
+                # reloaded (from the disk cache) when they scroll back in
+                if not self.library_model.needs_thumbnail(entry):
+                    continue
+                filepath = self.thumbnail_pending[entry.item_id] = entry.filepath
+            if first <= row <= last:
+                priority = row - first
+            else:
+                priority = PREFETCH_PRIORITY + min(abs(row - first), abs(row - last))
+            jobs.append((entry.item_id, filepath, priority))
+        self.thumbnail_scheduler.submit_many(jobs)
+
+        self.feed_background_thumbnails()
+        self.thumbnail_scheduler.emit_stats()
+
+    @Slot()
+    def feed_background_thumbnails(self):
+        """Tops up the scheduler with off-screen rows, a small batch at a time."""
+        jobs = []
+        for item_id, filepath in self.thumbnail_pending.items():
+            if len(jobs) >= BACKGROUND_BATCH:
+                break
+            if self.thumbnail_scheduler.is_pending(item_id):
+                continue
+            jobs.append((item_id, filepath, BACKGROUND_PRIORITY))
+        self.thumbnail_scheduler.submit_many(jobs)
+
+    def set_thumbnail_workers(self, count):
+        """Changes how many thumbnails are generated in parallel."""
+        self.thumbnail_scheduler.set_max_workers(count)
+        self.persistence_manager.save_thumbnail_workers(self.thumbnail_scheduler.max_workers)
+
+    def set_thumbnail_mode(self, mode):
+        """Switches between 'fast' (keyframe) and 'accurate' thumbnails."""
+        self.thumbnail_scheduler.set_mode(mode)
+        self.persistence_manager.save_thumbnail_mode(mode)
+
+    @Slot(dict)
+    def on_thumbnail_stats_changed(self, stats):
+        if stats['queued'] == 0 and stats['running'] == 0:
+            self.status_label.setText("")
+            return
+        self.status_label.setText(
+            f"Thumbnails: {stats['queued']} queued, "
+            f"{stats['running']}/{stats['max_workers']} running, "
+            f"{stats['throughput']:.1f}/s"
+        )
+
+    @Slot()
+    def start_probe_worker(self):
+        """Reads container headers for newly added files in the background."""
+        if not self.probe_queue:
+            return
+        worker = ProbeWorker(self.probe_queue)
+        self.probe_queue = []
+        worker.signals.probed.connect(self.on_files_probed)
+        worker.signals.finished.connect(self.probe_workers.discard)
+        self.probe_workers.add(worker)
+        QThreadPool.globalInstance().start(worker)
+
+    @Slot(object)
+    def on_files_probed(self, results):
+        """
+        Fills the metadata columns from header probes until thumbnails
+        arrive, and stores each file's size and mtime for folder sync.
+        """
+        file_stats = []
+        for item_id, result in results:
+            entry = self.library_model.entry_for_id(item_id)
+            if entry is None:
+                continue
+            if result is None:
+                # Missing or unreadable (e.g. a stale playlist entry)
+                if self.thumbnail_pending.pop(item_id, None) is not None:
+                    self.thumbnail_scheduler.cancel(item_id)
+                    self.library_model.set_failed(item_id)
+                continue
+            file_stats.append((entry.filepath, result['size'], result['mtime_ns']))
+            # Rows that already got mpv metadata are not overwritten
+            if item_id not in self.thumbnail_pending:
+                self.record_metadata(item_id, None, None, None, size=result['size'])
+                continue
+            width, height = result['width'], result['height']
+            self.record_metadata(
+                item_id,
+                result['duration'] if result['duration'] > 0 else None,
+                width if width > 0 and height > 0 else None,
+                height if width > 0 and height > 0 else None,
+                result['bitrate'] or None,
+                result['size']
+            )
+        if file_stats:
+            try:
+                self.library_db.update_file_stats(file_stats)
+            except Exception as e:
+                logger.warning(f"Failed to save file stats: {e}")
+
+    @Slot(object, QImage, dict)
+    def on_thumbnail_ready(self, item_id, image, metadata):
+        # Results are routed by item ID, so rows moved or removed while
+        # the job ran are handled by the model's ID -> row index.
+        filepath = self.thumbnail_pending.pop(item_id, None)
         try:
-            self.table_widget.item(row, 2).setText("Error")
-            self.table_widget.item(row, 3).setText("Error")
-            logger.error(f"Worker for row {row} failed: {error_message}")
+            self.library_model.set_thumbnail(item_id, image)
+            self.record_metadata(item_id, metadata['duration'], metadata['width'], metadata['height'],
+                                 metadata['bitrate'] or None, metadata['size'] or None)
         except Exception as e:
-            logger.warning(f"Failed to set table error data for row {row}: {e}")
+            logger.warning(f"Failed to set table data for {filepath}: {e}")
 
-    def cleanup_worker(self, worker):
-        """Remove finished worker from list to prevent memory leak."""
+    @Slot(object, str)
+    def on_thumbnail_failed(self, item_id, error_message):
+        filepath = self.thumbnail_pending.pop(item_id, None)
         try:
-            if worker in self.worker_threads:
-                self.worker_threads.remove(worker)
-                worker.deleteLater()
+            self.library_model.set_failed(item_id)
+            logger.error(f"Worker for {filepath} failed: {error_message}")
         except Exception as e:
-            logger.warning(f"Failed to cleanup worker: {e}")
-    
+            logger.warning(f"Failed to set table error data for {filepath}: {e}")
+
     def cleanup_all_workers(self):
-        """Stop and cleanup all worker threads."""
-        for worker in self.worker_threads:
-            try:
-                if worker.isRunning():
-                    worker.terminate()
-                    worker.wait(1000)  # Wait up to 1 second
-                worker.deleteLater()
-            except Exception as e:
-                logger.warning(f"Failed to cleanup worker: {e}")
-        self.worker_threads.clear()
+        """Cancel all thumbnail jobs; running ones stop at their next checkpoint."""
+        self.cancel_folder_scans()
+        self.thumbnail_pending.clear()
+        self.probe_queue.clear()
+        self.thumbnail_scheduler.clear()
+
+    def shutdown(self):
+        """Stops thumbnail generation for good (on application exit)."""
+        self.cancel_folder_scans()
+        self.thumbnail_pending.clear()
+        self.probe_queue.clear()
+        self.thumbnail_scheduler.shutdown()
+        if self.order_save_timer.isActive():
+            self.order_save_timer.stop()
+            self.save_library_order()
+        self.flush_library_db()
+        self.library_db.close()
 
     @Slot()
     def remove_selected_items(self):
-        selected_rows = sorted(
-            list(set(index.row() for index in self.table_widget.selectedIndexes())),
-            reverse=True
-        )
+        selected_rows = {
+            self.filter_proxy.source_row(index.row()) for index in self.table_widget.selectedIndexes()
+        }
         if not selected_rows: return
-        
-        for row in selected_rows:
+        removed = self.remove_rows(selected_rows)
+        self.folder_watcher.exclude([entry.filepath for entry in removed])
+
+    @Slot(list)
+    def remove_paths(self, filepaths):
+        """Drops entries by path, including ones not loaded into the model yet."""
+        paths = set(filepaths)
+        rows = [row for row, entry in enumerate(self.library_model.entries) if entry.filepath in paths]
+        removed = {entry.filepath for entry in self.remove_rows(rows)}
+        leftover = [path for path in paths if path not in removed]
+        if leftover:
+            try:
+                self.library_db.remove_paths(leftover)
+            except Exception as e:
+                logger.warning(f"Failed to remove entries from the library database: {e}")
+
+    @Slot(list)
+    def refresh_paths(self, filepaths):
+        """Regenerates thumbnail and metadata for files that changed on disk."""
+        paths = set(filepaths)
+        for entry in self.library_model.entries:
+            if entry.filepath not in paths:
+                continue
+            self.thumbnail_scheduler.cancel(entry.item_id)
+            self.library_model.reset_entry(entry.item_id)
+            self.thumbnail_pending[entry.item_id] = entry.filepath
+            self.probe_queue.append((entry.item_id, entry.filepath))
+        if self.probe_queue:
+            self.probe_timer.start(0)
+        self.on_viewport_changed()
+
+    def remove_rows(self, rows):
+        """Removes model rows and everything tied to them. Returns the removed entries."""
+        removed = self.library_model.remove_rows(rows)
+        if not removed:
+            return removed
+        try:
+            self.library_db.remove_paths([entry.filepath for entry in removed])
+        except Exception as e:
+            logger.warning(f"Failed to remove entries from the library database: {e}")
+        for entry in removed:
+            if self.shuffle is not None:
+                self.shuffle.remove(entry.item_id)
             try:
-                item = self.table_widget.item(row, 1)
-                filepath = item.data(Qt.ItemDataRole.UserRole)
-                if filepath in self.stream_data_cache:
-                    del self.stream_data_cache[filepath]
+                self.thumbnail_scheduler.cancel(entry.item_id)
+                self.thumbnail_pending.pop(entry.item_id, None)
+                self.stream_data_cache.pop(entry.filepath, None)
             except Exception as e:
                 logger.warning(f"Could not remove from cache: {e}")
-            self.table_widget.removeRow(row)
+        self.probe_queue = [job for job in self.probe_queue if job[0] in self.thumbnail_pending]
             
-        self.count_changed.emit(self.table_widget.rowCount())
+        self.count_changed.emit(self.library_model.rowCount())
+        return removed
 
     @Slot()
     def clear_all_items(self):
-        self.table_widget.setRowCount(0)
+        self.cleanup_all_workers()
+        self.folder_watcher.clear()
+        self.library_model.clear()
+        self.appended_ahead.clear()
+        self.metadata_updates.clear()
+        try:
+            self.library_db.clear()
+        except Exception as e:
+            logger.warning(f"Failed to clear the library database: {e}")
         self.stream_data_cache.clear()
+        if self.shuffle is not None:
+            self.shuffle = ShuffleOrder([])
         self.count_changed.emit(0)
-        self.cleanup_all_workers()
 
     # --- UPDATED play_item ---
-    @Slot(QTableWidgetItem)
-    def play_item(self, item):
-        """Emits the signal to play the selected item's row."""
-        row = item.row()
-        title_item = self.table_widget.item(row, 1)
-        filepath = title_item.data(Qt.ItemDataRole.UserRole) # This is the original URL/path
-        
-        if not filepath:
+    @Slot(QModelIndex)
+    def play_item(self, index):
+        """Emits the signal to play the given table index's row."""
+        entry = self.select_playing_row(index.row())
+        if entry is None:
+            return
+        source = self.playback_source(entry)
+        if source is None:
             return
+        logger.info(f"Requesting playback for: {entry.filepath}")
+        self.play_file_requested.emit(*source)
+    # -----------------------------------------------
 
-        logger.info(f"Requesting playback for: {filepath}")
-        self.table_widget.setCurrentItem(title_item)
-        
+    def select_playing_row(self, view_row):
+        """Marks 'view_row' as the playing row. Returns its entry (None if out of range)."""
+        entry = self.view_entry(view_row)
+        if entry is None or not entry.filepath:
+            return None
+        self.table_widget.setCurrentIndex(self.filter_proxy.index(view_row, COLUMN_TITLE))
+        if self.shuffle is not None:
+            self.shuffle.mark_played(entry.item_id)  # No-op when the shuffle picked it
+        return entry
+
+    def playback_source(self, entry):
+        """Returns (url, audio tracks, video tracks) to hand to the player, or None."""
+        filepath = entry.filepath # This is the original URL/path
         if filepath in self.stream_data_cache:
             stream_data = self.stream_data_cache[filepath]
             video_streams = stream_data.get('video_streams', [])
@@ -239,61 +892,127 @@ class LibraryWidget(QWidget):
             
             if not video_streams:
                 logger.error("No video streams found for this item.")
-                return
+                return None
                 
-            main_video_url = video_streams[0]['url']
-            other_video_tracks = video_streams[1:]
-            
-            self.play_file_requested.emit(main_video_url, audio_streams, other_video_tracks)
+            return video_streams[0]['url'], audio_streams, video_streams[1:]
+        return filepath, [], [] # Local file
+
+    def upcoming_source(self, loop_all=False):
+        """
+        Returns the playback source play_next() would start, without
+        advancing, or None if there is none (or it cannot be known yet,
+        like the first item of the next shuffle cycle).
+        """
+        if self.shuffle is not None:
+            item_id = self.shuffle.peek_next()
+            view_row = -1 if item_id is None else self.view_row_of(item_id)
         else:
-            self.play_file_requested.emit(filepath, [], []) # Local file
-    # -----------------------------------------------
+            view_row = self.next_sequential_row(loop_all)
+        entry = self.view_entry(view_row) if view_row >= 0 else None
+        return self.playback_source(entry) if entry is not None else None
+
+    def advance_to(self, url, loop_all=False):
+        """
+        Moves the playing row on after the player continued into a
+        preloaded 'url' by itself. If the library's next item is no
+        longer that one (the list changed meanwhile), it is played
+        instead. Returns False when there is no next item.
+        """
+        next_row = self.next_row(loop_all)
+        entry = self.select_playing_row(next_row) if next_row >= 0 else None
+        if entry is None:
+            return False
+        source = self.playback_source(entry)
+        if source is None:
+            return False
+        if source[0] != url:
+            logger.info(f"Preloaded item is no longer next; playing {entry.filepath}")
+            self.play_file_requested.emit(*source)
+        return True
+
+    @Slot(bool)
+    def set_shuffle(self, enabled):
+        """
+        Turns shuffle playback on or off. The order covers the whole
+        library; items the filter hides when their turn comes are skipped.
+        """
+        if not enabled:
+            self.shuffle = None
+            return
+        self.library_model.fetch_all()
+        item_ids = [entry.item_id for entry in self.library_model.entries]
+        current = self.view_entry(self.table_widget.currentIndex().row())
+        self.shuffle = ShuffleOrder(item_ids, current.item_id if current else None)
+        logger.info(f"Shuffle on: {len(item_ids)} items")
+
+    def next_shuffled_row(self, loop_all):
+        """Advances the shuffle and returns the view row to play next (-1 if none)."""
+        for new_cycle in (False, True):
+            if new_cycle:
+                if not loop_all or not len(self.shuffle):
+                    return -1
+                logger.info("Shuffle cycle finished, reshuffling.")
+                self.shuffle.new_cycle()
+            # Ids hidden by the filter since they were queued are skipped
+            while (item_id := self.shuffle.next()) is not None:
+                view_row = self.view_row_of(item_id)
+                if view_row >= 0:
+                    return view_row
+        return -1
 
     def has_next_video(self, loop_all=False):
         """Check if there's a next video to play."""
-        current_row = self.table_widget.currentRow()
+        if self.shuffle is not None:
+            return self.shuffle.peek_next() is not None or (loop_all and len(self.shuffle) > 0)
+        current_row = self.table_widget.currentIndex().row()
         next_row = current_row + 1
-        row_count = self.table_widget.rowCount()
+        self.library_model.fetch_until(next_row)
+        row_count = self.filter_proxy.rowCount()
         
         if next_row >= row_count:
             # At end of playlist
             return loop_all and row_count > 0
         return True
     
+    def next_sequential_row(self, loop_all):
+        """Returns the view row after the current one (wrapping with Loop All), or -1."""
+        current_row = self.table_widget.currentIndex().row()
+        next_row = current_row + 1
+        self.library_model.fetch_until(next_row)
+        row_count = self.filter_proxy.rowCount()
+        if next_row >= row_count:
+            return 0 if loop_all and row_count > 0 else -1
+        return next_row
+
+    def next_row(self, loop_all):
+        """Advances the play order and returns the view row to play next (-1 if none)."""
+        if self.shuffle is not None:
+            return self.next_shuffled_row(loop_all)
+        return self.next_sequential_row(loop_all)
+
     @Slot(bool)
     def play_next(self, loop_all=False):
         """Play the next video in the playlist."""
-        current_row = self.table_widget.currentRow()
-        next_row = current_row + 1
-        row_count = self.table_widget.rowCount()
-        
-        # Calculate next row (with looping if needed)
-        if next_row >= row_count:
-            if loop_all and row_count > 0:
-                logger.info("Looping playlist back to first video.")
-                next_row = 0
-            else:
-                logger.warning("play_next called but no next video available.")
-                return
-        
-        # Play the next item
-        next_item = self.table_widget.item(next_row, 1)
-        if next_item:
-            self.table_widget.setCurrentItem(next_item)
-            self.play_item(next_item)
-        else:
-            logger.error(f"No item found at row {next_row}")
+        next_row = self.next_row(loop_all)
+        if next_row < 0:
+            logger.warning("play_next called but no next video available.")
+            return
+        self.play_item(self.filter_proxy.index(next_row, COLUMN_TITLE))
             
     @Slot()
     def play_previous(self):
-        # ... (this method is unchanged) ...
-        current_row = self.table_widget.currentRow()
+        if self.shuffle is not None:
+            while (item_id := self.shuffle.previous()) is not None:
+                view_row = self.view_row_of(item_id)
+                if view_row >= 0:
+                    self.play_item(self.filter_proxy.index(view_row, COLUMN_TITLE))
+                    return
+            return
+        current_row = self.table_widget.currentIndex().row()
         prev_row = current_row - 1
         if prev_row < 0:
-            prev_row = self.table_widget.rowCount() - 1
+            self.library_model.fetch_all()
+            prev_row = self.filter_proxy.rowCount() - 1
             if prev_row < 0:
                 return
-        prev_item = self.table_widget.item(prev_row, 1)
-        if prev_item:
-            self.table_widget.setCurrentItem(prev_item)
-            self.play_item(prev_item)
\ No newline at end of file
+        self.play_item(self.filter_proxy.index(prev_row, COLUMN_TITLE))
\ No newline at end of file
@@ -1,5 +1,6 @@
 import sys
 import logging
+import multiprocessing
 from pathlib import Path
 from PySide6.QtWidgets import QApplication, QMessageBox
 from main_window import MainWindow
@@ -58,4 +59,7 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Must come first: in a frozen (PyInstaller) build the duplicate
+    # finder's spawned hash workers re-run this entry point
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
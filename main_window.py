@@ -13,7 +13,7 @@ from PySide6.QtGui import (
     QAction, QKeySequence, 
     QDesktopServices, QIcon, QActionGroup 
 )
-from PySide6.QtCore import QSize, Slot, QUrl, Qt
+from PySide6.QtCore import QSize, Slot, QUrl, Qt, QTimer
 from pathlib import Path
 
 from persistence_manager import PersistenceManager
@@ -26,6 +26,8 @@ from key_config import K
 
 logger = logging.getLogger(__name__)
 
+WARM_UP_DELAY_MS = 300  # Lets the library paint before the player is built
+
 def resource_path(relative_path):
     # ... (this function is unchanged) ...
     try:
@@ -70,6 +72,15 @@ class MainWindow(QMainWindow):
             lambda: self.library_widget.play_next(loop_all=False)
         )
         self.library_widget.count_changed.connect(self.on_playlist_count_changed)
+        self.player_widget.shuffle_changed.connect(self.library_widget.set_shuffle)
+        self.player_widget.advanced_to_preloaded.connect(self.on_advanced_to_preloaded)
+        # After set_shuffle, so the preload follows the new order
+        self.player_widget.shuffle_changed.connect(self.preload_next_item)
+        self.player_widget.loop_state_changed.connect(self.preload_next_item)
+
+        if self.persistence_manager.load_warm_player():
+            # Once the event loop is running, i.e. after the library is shown
+            QTimer.singleShot(WARM_UP_DELAY_MS, self.player_widget.warm_up)
 
     def create_menu(self):
 
@@ -80,6 +91,18 @@ class MainWindow(QMainWindow):
         add_files_action.setShortcut(QKeySequence.StandardKey.Open)
         add_files_action.triggered.connect(self.library_widget.open_add_files_dialog)
         file_menu.addAction(add_files_action)
+        add_folder_action = QAction("Add &Folder to Library...", self)
+        add_folder_action.setShortcut(QKeySequence("Ctrl+Shift+O"))
+        add_folder_action.triggered.connect(self.library_widget.open_add_folder_dialog)
+        file_menu.addAction(add_folder_action)
+        import_playlist_action = QAction("&Import Playlist...", self)
+        import_playlist_action.setShortcut(QKeySequence("Ctrl+I"))
+        import_playlist_action.triggered.connect(self.library_widget.open_import_playlist_dialog)
+        file_menu.addAction(import_playlist_action)
+        export_playlist_action = QAction("&Export Playlist...", self)
+        export_playlist_action.setShortcut(QKeySequence("Ctrl+E"))
+        export_playlist_action.triggered.connect(self.library_widget.open_export_playlist_dialog)
+        file_menu.addAction(export_playlist_action)
         open_network_action = QAction("&Open Network Stream...", self)
         open_network_action.setShortcut(QKeySequence("Ctrl+N"))
         open_network_action.triggered.connect(self.open_network_stream)
@@ -96,6 +119,29 @@ class MainWindow(QMainWindow):
         go_to_library_action.setShortcut("Ctrl+P")
         go_to_library_action.triggered.connect(self.switch_to_library) 
         view_menu.addAction(go_to_library_action)
+        thumbnail_workers_action = QAction("Thumbnail Workers...", self)
+        thumbnail_workers_action.triggered.connect(self.open_thumbnail_workers_dialog)
+        view_menu.addAction(thumbnail_workers_action)
+        thumbnail_mode_menu = view_menu.addMenu("Thumbnail Mode")
+        thumbnail_mode_group = QActionGroup(self)
+        thumbnail_mode_group.setExclusive(True)
+        current_mode = self.library_widget.thumbnail_scheduler.mode
+        for mode, label in (("fast", "Fast (Keyframe)"), ("accurate", "Accurate")):
+            action = QAction(label, self, checkable=True)
+            action.setChecked(mode == current_mode)
+            action.triggered.connect(
+                lambda checked, m=mode: self.library_widget.set_thumbnail_mode(m)
+            )
+            thumbnail_mode_group.addAction(action)
+            thumbnail_mode_menu.addAction(action)
+        warm_player_action = QAction("Pre-warm Player at Startup", self, checkable=True)
+        warm_player_action.setChecked(self.persistence_manager.load_warm_player())
+        warm_player_action.toggled.connect(self.set_warm_player)
+        view_menu.addAction(warm_player_action)
+        disk_cache_action = QAction("Cache Network Media on Disk", self, checkable=True)
+        disk_cache_action.setChecked(self.persistence_manager.load_disk_cache())
+        disk_cache_action.toggled.connect(self.persistence_manager.save_disk_cache)
+        view_menu.addAction(disk_cache_action)
 
         # --- THEMES MENU ---
         themes_menu = menu_bar.addMenu("&Themes")
@@ -135,6 +181,18 @@ class MainWindow(QMainWindow):
         """Applies the selected theme."""
         self.theme_manager.apply_theme(theme_name)
 
+    @Slot()
+    def open_thumbnail_workers_dialog(self):
+        """Lets the user change thumbnail concurrency at runtime."""
+        current = self.library_widget.thumbnail_scheduler.max_workers
+        count, ok = QInputDialog.getInt(
+            self, "Thumbnail Workers",
+            "Number of thumbnails to generate in parallel:",
+            current, 1, 64
+        )
+        if ok:
+            self.library_widget.set_thumbnail_workers(count)
+
     @Slot(int)
     def on_playlist_count_changed(self, count):
         # ... (this method is unchanged) ...
@@ -150,6 +208,7 @@ class MainWindow(QMainWindow):
         
         if has_next:
             logger.info("Advancing to next video in playlist.")
+            self.player_widget.begin_transition()
             self.library_widget.play_next(loop_all=loop_all_is_active)
         else:
             logger.info("Playlist finished, returning to library.")
@@ -177,6 +236,33 @@ class MainWindow(QMainWindow):
         
         # Load the file with controls visible
         self.player_widget.load_file(filepath, audio_tracks, video_tracks, show_controls=True)
+        self.preload_next_item()
+
+    @Slot(bool)
+    def set_warm_player(self, enabled):
+        self.persistence_manager.save_warm_player(enabled)
+        if enabled:
+            self.player_widget.warm_up()
+
+    @Slot(str, bool)
+    def on_advanced_to_preloaded(self, url, loop_all_is_active):
+        """mpv continued into the preloaded item; catch the library up and queue the next one."""
+        if self.library_widget.advance_to(url, loop_all=loop_all_is_active):
+            self.preload_next_item()
+        else:
+            logger.info("Playlist finished, returning to library.")
+            QTimer.singleShot(50, lambda: self.player_widget.overlay.back_btn.click())
+
+    @Slot()
+    def preload_next_item(self):
+        """Hands the upcoming playlist item to the player for a gapless transition."""
+        if not self.player_widget.player or self.player_widget.loop_state == 1:
+            return
+        source = self.library_widget.upcoming_source(loop_all=self.player_widget.loop_state == 2)
+        if source:
+            self.player_widget.preload_next(*source)
+        else:
+            self.player_widget.clear_preload()
 
     @Slot()
     def switch_to_library(self):
@@ -196,6 +282,7 @@ class MainWindow(QMainWindow):
         
         # Save position and stop player
         self.player_widget.save_current_position()
+        self.player_widget.clear_preload()
         
         if self.player_widget.player:
             try:
@@ -291,7 +378,8 @@ class MainWindow(QMainWindow):
         logger.info("Shutting down...") 
         self.player_widget.save_current_position()
         self.player_widget.shutdown()
-        self.library_widget.cleanup_all_workers()
+        self.library_widget.shutdown()
+        self.persistence_manager.close()
         event.accept()
 
     def keyPressEvent(self, event):
@@ -351,6 +439,12 @@ class MainWindow(QMainWindow):
             elif key == K.PREV_PLAYLIST["key"] and mods == K.PREV_PLAYLIST["mod"]:
                 self.library_widget.play_previous()
                 event.accept()
+            elif key == K.SHUFFLE["key"] and mods == K.SHUFFLE["mod"]:
+                self.player_widget.toggle_shuffle()
+                event.accept()
+            elif key == K.STATS["key"] and mods == K.STATS["mod"]:
+                self.player_widget.toggle_stats()
+                event.accept()
 
         # --- Handle Global Keys (work in any view) ---
         if key == K.FULLSCREEN["key"] and mods == K.FULLSCREEN["mod"]:
@@ -0,0 +1,293 @@
+# media_probe.py
+
+"""
+Pure-Python container header probe.
+
+Reads just enough of an MP4/MOV, Matroska/WebM or AVI file to return
+its duration and video resolution, without starting a decoder. Every
+read is a small seek into the header area, so probing a file on a
+network share costs a handful of round trips rather than a playback
+start-up. Returns None for anything it does not recognise; callers
+fall back to mpv in that case.
+"""
+
+import logging
+import os
+import struct
+
+logger = logging.getLogger(__name__)
+
+SNIFF_BYTES = 16
+MAX_MOOV_BYTES = 64 * 1024 * 1024  # Refuse absurd moov atoms
+MAX_EBML_ELEMENTS = 4096  # Top-level Segment children scanned before giving up
+MAX_EBML_MASTER_BYTES = 4 * 1024 * 1024  # Refuse absurd Info/Tracks elements
+
+# --- Container detection ---
+
+def detect_container(header):
+    """Identifies a container from the first SNIFF_BYTES bytes of a file."""
+    if len(header) >= 8 and header[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip'):
+        return 'mp4'
+    if header[:4] == b'\x1a\x45\xdf\xa3':
+        return 'matroska'
+    if header[:4] == b'RIFF' and header[8:12] == b'AVI ':
+        return 'avi'
+    return None
+
+def probe(filepath):
+    """
+    Returns {'duration': seconds, 'width': px, 'height': px} for a
+    supported local file, or None if the format is unknown or the
+    header is unreadable.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            container = detect_container(f.read(SNIFF_BYTES))
+            if container is None:
+                return None
+            f.seek(0, os.SEEK_END)
+            file_size = f.tell()
+            f.seek(0)
+            if container == 'mp4':
+                return probe_mp4(f, file_size)
+            if container == 'matroska':
+                return probe_matroska(f, file_size)
+            return probe_avi(f)
+    except (OSError, struct.error, ValueError, IndexError) as e:
+        logger.debug(f"Header probe failed for {filepath}: {e}")
+        return None
+
+# --- MP4 / MOV (ISO base media) ---
+
+def iter_atoms(f, start, end):
+    """Yields (type, payload_offset, payload_size) for atoms in [start, end)."""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        size, atom_type = struct.unpack('>I4s', f.read(8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield atom_type, offset + header_size, size - header_size
+        offset += size
+
+def find_atom(data, atom_type):
+    """Finds the first child atom 'atom_type' in an in-memory atom payload."""
+    for child_type, payload in iter_memory_atoms(data):
+        if child_type == atom_type:
+            return payload
+    return None
+
+def iter_memory_atoms(data):
+    offset = 0
+    while offset + 8 <= len(data):
+        size, atom_type = struct.unpack_from('>I4s', data, offset)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', data, offset + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = len(data) - offset
+        if size < header_size:
+            return
+        yield atom_type, data[offset + header_size:offset + size]
+        offset += size
+
+def probe_mp4(f, file_size):
+    moov = None
+    for atom_type, offset, size in iter_atoms(f, 0, file_size):
+        if atom_type == b'moov':
+            if size > MAX_MOOV_BYTES:
+                return None
+            f.seek(offset)
+            moov = f.read(size)
+            break
+    if moov is None:
+        return None
+
+    result = {'duration': 0.0, 'width': 0, 'height': 0}
+
+    mvhd = find_atom(moov, b'mvhd')
+    if mvhd:
+        if mvhd[0] == 1:
+            timescale, duration = struct.unpack_from('>IQ', mvhd, 20)
+        else:
+            timescale, duration = struct.unpack_from('>II', mvhd, 12)
+        if timescale:
+            result['duration'] = duration / timescale
+
+    for atom_type, trak in iter_memory_atoms(moov):
+        if atom_type != b'trak':
+            continue
+        tkhd = find_atom(trak, b'tkhd')
+        if not tkhd:
+            continue
+        # Width/height are the last two 16.16 fixed-point fields
+        width, height = struct.unpack_from('>II', tkhd, len(tkhd) - 8)
+        width >>= 16
+        height >>= 16
+        if width and height:
+            result['width'], result['height'] = width, height
+            break
+    return result
+
+# --- Matroska / WebM (EBML) ---
+
+EBML_SEGMENT = 0x18538067
+EBML_INFO = 0x1549A966
+EBML_TRACKS = 0x1654AE6B
+EBML_TIMECODE_SCALE = 0x2AD7B1
+EBML_DURATION = 0x4489
+EBML_TRACK_ENTRY = 0xAE
+EBML_TRACK_TYPE = 0x83
+EBML_VIDEO = 0xE0
+EBML_PIXEL_WIDTH = 0xB0
+EBML_PIXEL_HEIGHT = 0xBA
+EBML_UNKNOWN_SIZE = -1
+
+def read_vint(data, offset, keep_marker):
+    """Reads an EBML variable-length integer. Returns (value, length)."""
+    if offset >= len(data):
+        raise ValueError("Truncated EBML varint")
+    first = data[offset]
+    if first == 0:
+        raise ValueError("Invalid EBML varint")
+    length = 1
+    mask = 0x80
+    while not first & mask:
+        mask >>= 1
+        length += 1
+    if len(data) < offset + length:
+        raise ValueError("Truncated EBML varint")
+    value = first if keep_marker else first & (mask - 1)
+    all_ones = value == mask - 1
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+        all_ones = all_ones and byte == 0xFF
+    if not keep_marker and all_ones:
+        return EBML_UNKNOWN_SIZE, length
+    return value, length
+
+def read_element_header(f):
+    """Reads an element ID and size from a file. Returns (id, size, header_length)."""
+    header = f.read(12)
+    if len(header) < 2:
+        raise ValueError("Unexpected end of file")
+    element_id, id_length = read_vint(header, 0, keep_marker=True)
+    size, size_length = read_vint(header, id_length, keep_marker=False)
+    return element_id, size, id_length + size_length
+
+def iter_elements(data):
+    """Yields (id, payload) for the EBML children in an in-memory payload."""
+    offset = 0
+    while offset < len(data):
+        element_id, id_length = read_vint(data, offset, keep_marker=True)
+        size, size_length = read_vint(data, offset + id_length, keep_marker=False)
+        start = offset + id_length + size_length
+        if size == EBML_UNKNOWN_SIZE:
+            return
+        yield element_id, data[start:start + size]
+        offset = start + size
+
+def read_uint(payload):
+    return int.from_bytes(payload, 'big') if payload else 0
+
+def read_float(payload):
+    if len(payload) == 4:
+        return struct.unpack('>f', payload)[0]
+    if len(payload) == 8:
+        return struct.unpack('>d', payload)[0]
+    return 0.0
+
+def probe_matroska(f, file_size):
+    # Skip the EBML header element
+    _, size, header_length = read_element_header(f)
+    offset = header_length + size
+
+    f.seek(offset)
+    element_id, segment_size, header_length = read_element_header(f)
+    if element_id != EBML_SEGMENT:
+        return None
+    offset += header_length
+    segment_end = file_size if segment_size == EBML_UNKNOWN_SIZE else min(file_size, offset + segment_size)
+
+    result = {'duration': 0.0, 'width': 0, 'height': 0}
+    found_info = found_tracks = False
+
+    for _ in range(MAX_EBML_ELEMENTS):
+        if offset >= segment_end or (found_info and found_tracks):
+            break
+        f.seek(offset)
+        element_id, size, header_length = read_element_header(f)
+        if size == EBML_UNKNOWN_SIZE:
+            break  # Live/unfinished file; clusters have no known end
+        payload_offset = offset + header_length
+        if element_id in (EBML_INFO, EBML_TRACKS) and size > MAX_EBML_MASTER_BYTES:
+            return None
+
+        if element_id == EBML_INFO:
+            f.seek(payload_offset)
+            parse_matroska_info(f.read(size), result)
+            found_info = True
+        elif element_id == EBML_TRACKS:
+            f.seek(payload_offset)
+            parse_matroska_tracks(f.read(size), result)
+            found_tracks = True
+        offset = payload_offset + size
+
+    return result if found_info or found_tracks else None
+
+def parse_matroska_info(data, result):
+    timecode_scale = 1000000  # Matroska default: 1 ms ticks
+    duration = 0.0
+    for element_id, payload in iter_elements(data):
+        if element_id == EBML_TIMECODE_SCALE:
+            timecode_scale = read_uint(payload)
+        elif element_id == EBML_DURATION:
+            duration = read_float(payload)
+    result['duration'] = duration * timecode_scale / 1e9
+
+def parse_matroska_tracks(data, result):
+    for element_id, entry in iter_elements(data):
+        if element_id != EBML_TRACK_ENTRY:
+            continue
+        track_type = 0
+        video = None
+        for child_id, payload in iter_elements(entry):
+            if child_id == EBML_TRACK_TYPE:
+                track_type = read_uint(payload)
+            elif child_id == EBML_VIDEO:
+                video = payload
+        if track_type != 1 or video is None:
+            continue
+        for child_id, payload in iter_elements(video):
+            if child_id == EBML_PIXEL_WIDTH:
+                result['width'] = read_uint(payload)
+            elif child_id == EBML_PIXEL_HEIGHT:
+                result['height'] = read_uint(payload)
+        return
+
+# --- AVI (RIFF) ---
+
+def probe_avi(f):
+    # RIFF header (12 bytes), then the 'hdrl' LIST whose first child is 'avih'
+    f.seek(12)
+    list_id, _, list_type = struct.unpack('<4sI4s', f.read(12))
+    if list_id != b'LIST' or list_type != b'hdrl':
+        return None
+    chunk_id, chunk_size = struct.unpack('<4sI', f.read(8))
+    if chunk_id != b'avih' or chunk_size < 40:
+        return None
+    avih = f.read(40)
+    usec_per_frame, _, _, _, total_frames = struct.unpack_from('<5I', avih, 0)
+    width, height = struct.unpack_from('<2I', avih, 32)
+    return {
+        'duration': total_frames * usec_per_frame / 1e6,
+        'width': width,
+        'height': height,
+    }
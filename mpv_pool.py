@@ -0,0 +1,124 @@
+# mpv_pool.py
+
+import logging
+import threading
+from contextlib import contextmanager
+import mpv
+
+logger = logging.getLogger(__name__)
+
+class PooledPlayer:
+    """An mpv handle plus the bookkeeping the pool needs to recycle it."""
+    __slots__ = ('player', 'uses', 'broken')
+
+    def __init__(self, player):
+        self.player = player
+        self.uses = 0
+        self.broken = False
+
+
+class MpvPool:
+    """
+    A pool of long-lived headless mpv instances.
+
+    libmpv start-up and teardown cost more than loading a small file,
+    so workers borrow a handle with checkout() instead of creating one.
+    Handles are reset with 'stop' when returned, health-checked when
+    borrowed, and replaced after 'max_uses' files or after any error.
+    Safe to use from worker threads.
+    """
+
+    DEFAULT_MAX_USES = 100
+
+    def __init__(self, max_idle=4, max_uses=DEFAULT_MAX_USES, log_handler=None, **options):
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.log_handler = log_handler
+        self.options = options
+        self.idle = []
+        self.lock = threading.Lock()
+        self.closed = False
+        self.created = 0
+
+    @contextmanager
+    def checkout(self):
+        """
+        Borrows an mpv instance for one file:
+
+            with pool.checkout() as player:
+                player.play(path)
+        """
+        handle = self.acquire()
+        try:
+            yield handle.player
+        except Exception:
+            handle.broken = True
+            raise
+        finally:
+            self.release(handle)
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                handle = self.idle.pop() if self.idle else None
+            if handle is None:
+                return self.create()
+            if self.is_healthy(handle):
+                return handle
+            self.destroy(handle)
+
+    def release(self, handle):
+        handle.uses += 1
+        if not handle.broken:
+            try:
+                handle.player.command('stop')
+            except Exception as e:
+                logger.warning(f"Failed to reset pooled mpv instance: {e}")
+                handle.broken = True
+
+        with self.lock:
+            keep = (not self.closed and not handle.broken and
+                    handle.uses < self.max_uses and len(self.idle) < self.max_idle)
+            if keep:
+                self.idle.append(handle)
+        if not keep:
+            self.destroy(handle)
+
+    def set_max_idle(self, max_idle):
+        """Resizes the pool; surplus idle instances are terminated."""
+        with self.lock:
+            self.max_idle = max_idle
+            surplus = self.idle[max_idle:]
+            del self.idle[max_idle:]
+        for handle in surplus:
+            self.destroy(handle)
+
+    def shutdown(self):
+        """Terminates all idle instances. Borrowed ones are dropped on return."""
+        with self.lock:
+            self.closed = True
+            handles, self.idle = self.idle, []
+        for handle in handles:
+            self.destroy(handle)
+        logger.info(f"mpv pool shut down ({self.created} instances created in total).")
+
+    def create(self):
+        player = mpv.MPV(log_handler=self.log_handler, **self.options)
+        self.created += 1
+        logger.debug(f"Created pooled mpv instance #{self.created}")
+        return PooledPlayer(player)
+
+    def is_healthy(self, handle):
+        try:
+            # Any property read round-trips through the core;
+            # a dead or wedged instance raises here.
+            return handle.player.idle_active is not None
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy pooled mpv instance: {e}")
+            return False
+
+    def destroy(self, handle):
+        try:
+            handle.player.terminate()
+        except Exception as e:
+            logger.warning(f"Failed to terminate pooled mpv instance: {e}")
@@ -9,7 +9,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal, QEvent, Slot
 from PySide6.QtGui import QAction, QCursor
-from utils import format_time
+from utils import format_time, format_size
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,8 @@ class OverlayWidget(QWidget):
         self.player = player
         self.is_seeking = False
         self.video_duration = 0.0
+        self.shown_time = None  # (second, duration) the time label shows
+        self.shown_cache = None  # Text the cache label shows
         self.chapter_list = []
         self.setObjectName("ControlOverlay")
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
@@ -82,6 +84,13 @@ class OverlayWidget(QWidget):
         self.back_btn.setToolTip("Back to library")
         
         self.time_label = QLabel("00:00 / 00:00")
+        self.cache_label = QLabel()
+        self.cache_label.setToolTip("Demuxer cache: buffered ahead, cached data, input rate")
+        self.cache_label.hide()
+        self.stats_label = QLabel()
+        self.stats_label.setObjectName("StatsLabel")
+        self.stats_label.setStyleSheet("font-family: monospace;")
+        self.stats_label.hide()
         self.seek_slider = QSlider(Qt.Orientation.Horizontal)
         self.seek_slider.setTracking(True)
         self.seek_slider.setMouseTracking(True)
@@ -127,6 +136,11 @@ class OverlayWidget(QWidget):
         self.loop_btn.setFixedWidth(80) # Give it space
         self.loop_btn.setToolTip("Loop")
         # -------------------
+
+        self.shuffle_btn = QPushButton("Shuffle: Off")
+        self.shuffle_btn.setFixedWidth(90)
+        self.shuffle_btn.setToolTip("Shuffle (S)")
+        self.shuffle_btn.setVisible(False) # Shown with the playlist controls
         
         self.mute_btn = QPushButton()
         self.mute_btn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaVolume))
@@ -168,6 +182,7 @@ class OverlayWidget(QWidget):
         top_layout = QHBoxLayout()
         top_layout.addWidget(self.time_label)
         top_layout.addWidget(self.seek_slider)
+        top_layout.addWidget(self.cache_label)
         
         bottom_layout = QHBoxLayout()
         bottom_layout.addWidget(self.back_btn)
@@ -180,6 +195,7 @@ class OverlayWidget(QWidget):
         bottom_layout.addWidget(self.next_file_btn)
         bottom_layout.addWidget(self.stop_btn)
         bottom_layout.addWidget(self.loop_btn)
+        bottom_layout.addWidget(self.shuffle_btn)
         bottom_layout.addWidget(self.mute_btn)
         bottom_layout.addWidget(self.volume_slider)
         bottom_layout.addWidget(self.volume_label)
@@ -190,6 +206,7 @@ class OverlayWidget(QWidget):
         bottom_layout.addWidget(self.chapter_btn)
         bottom_layout.addWidget(self.fullscreen_btn)
         
+        layout.addWidget(self.stats_label)
         layout.addLayout(top_layout)
         layout.addLayout(bottom_layout)
         self.setLayout(layout)
@@ -220,6 +237,7 @@ class OverlayWidget(QWidget):
             self.seek_backward_btn.clicked.connect(player_widget.seek_backward)
             self.seek_forward_btn.clicked.connect(player_widget.seek_forward)
             self.loop_btn.clicked.connect(player_widget.cycle_loop_state)
+            self.shuffle_btn.clicked.connect(player_widget.toggle_shuffle)
 
 
         if player_widget and hasattr(player_widget, 'hide_timer'):
@@ -239,10 +257,34 @@ class OverlayWidget(QWidget):
         else:
             self.loop_btn.setText("Loop: Off")
 
+    @Slot(bool)
+    def update_shuffle_button(self, enabled):
+        self.shuffle_btn.setText("Shuffle: On" if enabled else "Shuffle: Off")
+
+    @Slot(bool)
+    def set_stats_visible(self, visible):
+        self.stats_label.setVisible(visible)
+
+    @Slot(dict)
+    def update_stats(self, stats):
+        """Fills the stats HUD from PlaybackMetrics.summary()."""
+        def number(value, spec):
+            return format(value, spec) if value is not None else "--"
+        lines = [
+            f"FPS {number(stats.get('fps'), '6.2f')}   low {number(stats.get('fps_p5'), '>4')}"
+            f"   A/V {number(stats.get('avsync_ms'), '5.1f')} ms   p95 {number(stats.get('avsync_ms_p95'), '>4')} ms",
+            f"Dropped {stats.get('dropped_frames', 0)} (decoder {stats.get('decoder_dropped_frames', 0)})"
+            f"   {number(stats.get('drops_per_s'), '.2f')}/s",
+            f"Cache [{stats.get('cache_profile') or '--'}] {number(stats.get('readahead_s'), '.1f')} s ahead"
+            f"   stalls {stats.get('rebuffer_count', 0)} ({number(stats.get('rebuffer_seconds'), '.1f')} s)",
+        ]
+        self.stats_label.setText("\n".join(lines))
+
     @Slot(bool)
     def set_playlist_controls_visible(self, visible):
         self.prev_file_btn.setVisible(visible)
         self.next_file_btn.setVisible(visible)
+        self.shuffle_btn.setVisible(visible)
 
     def eventFilter(self, watched, event):
         if watched == self.seek_slider:
@@ -340,13 +382,39 @@ class OverlayWidget(QWidget):
     
     def update_time(self, current_time):
         if current_time is None: current_time = 0.0
-        if not self.is_seeking: self.seek_slider.setValue(int(current_time))
+        # Only touch the widgets when the displayed second changes
+        shown = (int(current_time), int(self.video_duration))
+        if shown == self.shown_time:
+            return
+        self.shown_time = shown
+        if not self.is_seeking: self.seek_slider.setValue(shown[0])
         self.time_label.setText(f"{format_time(current_time)} / {format_time(self.video_duration)}")
     
+    @Slot(dict)
+    def update_cache_stats(self, stats):
+        """Shows readahead, cached bytes and input rate for network sources."""
+        if stats.get('profile') in (None, 'local'):
+            text = ""  # Local files are read faster than they play; nothing to show
+        elif stats.get('paused-for-cache'):
+            text = f"Buffering {stats.get('cache-buffering-state') or 0}%"
+        else:
+            state = stats.get('demuxer-cache-state') or {}
+            readahead = stats.get('demuxer-cache-duration') or 0.0
+            text = f"Cache {readahead:.0f}s · {format_size(state.get('fw-bytes') or 0)}"
+            rate = state.get('raw-input-rate')
+            if rate:
+                text += f" · {format_size(rate)}/s"
+        if text == self.shown_cache:
+            return
+        self.shown_cache = text
+        self.cache_label.setText(text)
+        self.cache_label.setVisible(bool(text))
+
     def update_duration(self, duration):
         if duration is None: duration = 0.0
         self.video_duration = duration
         self.seek_slider.setMaximum(int(duration))
+        self.shown_time = None  # The label shows the duration too
 
     def on_seek_press(self): 
         self.is_seeking = True
@@ -1,19 +1,36 @@
 # persistence_manager.py
 
 import logging
+import os
+import re
 from PySide6.QtCore import QSettings
 from pathlib import Path
+from position_store import PositionStore
 
 logger = logging.getLogger(__name__)
 
+# A URL as QSettings stores it as a key: 'https:/host/...' (a scheme of at
+# least two characters, so Windows drive letters do not match)
+URL_KEY = re.compile(r"^([A-Za-z][A-Za-z0-9+.-]+):/+(.*)$")
+
 class PersistenceManager:
     """
     Manages all application settings and persistent data,
     such as playback positions and last-used paths.
     """
-    def __init__(self):
+    def __init__(self, settings=None, data_dir=None, cache_dir=None):
+        """
+        'settings', 'data_dir' and 'cache_dir' default to the user's own
+        profile; benchmarks pass throwaway ones.
+        """
         # We define a company and app name for QSettings
-        self.settings = QSettings("MyAwesomePlayer", "PySideMPV")
+        self.settings = settings or QSettings("MyAwesomePlayer", "PySideMPV")
+        self.data_dir = data_dir  # None = the per-user data directory
+        self.cache_dir = cache_dir  # None = the per-user cache directory
+        self.position_store = PositionStore(
+            os.path.join(data_dir, PositionStore.FILE_NAME) if data_dir else None
+        )
+        self.migrate_playback_positions()
         logger.info("Persistence Manager initialized.")
 
     def save_last_open_path(self, filepath):
@@ -28,16 +45,71 @@ class PersistenceManager:
         """Loads the last-used directory path."""
         return self.settings.value("last_open_path", "")
 
+    def save_thumbnail_workers(self, count):
+        """Saves the thumbnail pool size."""
+        self.settings.setValue("thumbnail_workers", int(count))
+
+    def load_thumbnail_workers(self):
+        """
+        Loads the thumbnail pool size.
+        Returns None if unset, which means one worker per CPU core.
+        """
+        try:
+            count = int(self.settings.value("thumbnail_workers", 0))
+        except (TypeError, ValueError):
+            count = 0
+        return count if count > 0 else None
+
+    def save_thumbnail_mode(self, mode):
+        """Saves the thumbnail seek mode ('fast' or 'accurate')."""
+        self.settings.setValue("thumbnail_mode", mode)
+
+    def load_thumbnail_mode(self):
+        """Loads the thumbnail seek mode. Defaults to 'fast'."""
+        mode = self.settings.value("thumbnail_mode", "fast")
+        return mode if mode in ("fast", "accurate") else "fast"
+
+    def load_thumbnail_cache_bytes(self):
+        """
+        Loads the thumbnail cache budget ('thumbnail_cache_mb' in settings).
+        Returns None if unset, which means the cache's default budget.
+        """
+        try:
+            megabytes = int(self.settings.value("thumbnail_cache_mb", 0))
+        except (TypeError, ValueError):
+            megabytes = 0
+        return megabytes * 1024 * 1024 if megabytes > 0 else None
+
+    def save_warm_player(self, enabled):
+        """Saves whether the player is pre-warmed at startup."""
+        self.settings.setValue("warm_player", bool(enabled))
+
+    def load_warm_player(self):
+        """Loads whether the player is pre-warmed at startup. Off by default."""
+        value = self.settings.value("warm_player", False)
+        if isinstance(value, str):  # Some QSettings backends return strings
+            return value.lower() == "true"
+        return bool(value)
+
+    def save_disk_cache(self, enabled):
+        """Saves whether network and stream caches are kept on disk instead of in RAM."""
+        self.settings.setValue("disk_cache", bool(enabled))
+
+    def load_disk_cache(self):
+        """Loads whether network and stream caches are kept on disk. Off by default."""
+        value = self.settings.value("disk_cache", False)
+        if isinstance(value, str):  # Some QSettings backends return strings
+            return value.lower() == "true"
+        return bool(value)
+
     def save_playback_position(self, filepath, time_pos):
-        """Saves the playback time (in seconds) for a specific file."""
+        """
+        Records the playback time (in seconds) for a specific file.
+        Kept in memory until the next flush_playback_positions().
+        """
         if not filepath or time_pos is None:
             return
-        
-        # We store playback positions in a 'group'
-        self.settings.beginGroup("playback_positions")
-        # Use the filepath as the key
-        self.settings.setValue(filepath, time_pos)
-        self.settings.endGroup()
+        self.position_store.save(filepath, float(time_pos))
         logger.debug(f"Saved position for {filepath}: {time_pos}")
 
     def load_playback_position(self, filepath):
@@ -47,12 +119,48 @@ class PersistenceManager:
         """
         if not filepath:
             return 0.0
-            
+        try:
+            return float(self.position_store.load(filepath))
+        except (TypeError, ValueError):
+            return 0.0
+
+    def flush_playback_positions(self, wait=False):
+        """Writes recorded positions to disk in the background (or now, with 'wait')."""
+        self.position_store.flush(wait=wait)
+
+    def migrate_playback_positions(self):
+        """Moves positions from the old QSettings group into the position store."""
         self.settings.beginGroup("playback_positions")
-        time_pos = self.settings.value(filepath, 0.0)
+        keys = self.settings.allKeys()
+        positions = {}
+        for key in keys:
+            url = URL_KEY.match(key)
+            if url:
+                # Streams cannot be checked for existence; QSettings also
+                # collapsed the '//' after the scheme into one separator
+                candidates = [f"{url.group(1)}://{url.group(2)}"]
+            else:
+                # QSettings turned the path separators into key separators
+                candidates = [path for path in (key, "/" + key, key.replace("/", os.sep))
+                              if os.path.exists(path)][:1]
+            for filepath in candidates:
+                try:
+                    positions[filepath] = float(self.settings.value(key, 0.0))
+                except (TypeError, ValueError):
+                    pass
         self.settings.endGroup()
-        
+        if keys:
+            self.position_store.import_positions(positions)
+            # The old group is the only copy until the store has written them
+            if not self.position_store.flush(wait=True):
+                logger.warning("Could not save migrated playback positions; keeping the old ones.")
+                return
+            self.settings.remove("playback_positions")
+            logger.info(f"Migrated {len(positions)} of {len(keys)} saved playback positions.")
+
+    def close(self):
+        """Flushes and closes the position store (on application exit)."""
         try:
-            return float(time_pos)
-        except ValueError:
-            return 0.0
\ No newline at end of file
+            self.position_store.close()
+        except Exception as e:
+            logger.warning(f"Failed to close the position store: {e}")
@@ -0,0 +1,282 @@
+# playback_metrics.py
+
+"""
+Playback health metrics: dropped frames, decoder FPS, A/V sync,
+demuxer readahead and rebuffering.
+
+PlaybackMetrics keeps the latest value of each mpv property it is fed
+and, once per sample, turns them into rates and histogram samples. Each
+file gets a FileMetrics with rolling histograms (the last
+ROLLING_SAMPLES samples, for the HUD) and whole-file histograms (for
+the report). Histograms use fixed bins, so a sample is O(log bins) and
+memory stays constant however long a file plays.
+
+The session report is one JSON file per application run, listing every
+file played with its drop rate, FPS, A/V sync and rebuffer figures, so
+files and streams too heavy for a machine stand out.
+"""
+
+import bisect
+import json
+import logging
+import os
+import platform
+import time
+from collections import deque
+from library_database import default_data_dir
+
+logger = logging.getLogger(__name__)
+
+ROLLING_SAMPLES = 60  # One minute at the default sample rate
+MAX_REPORTS = 50      # Older session reports are deleted
+
+# Upper bin edges; values above the last edge go to an overflow bin
+FPS_BINS = (10, 15, 20, 23, 24, 25, 29, 30, 48, 50, 59, 60, 90, 120, 144)
+AVSYNC_BINS_MS = (1, 2, 5, 10, 20, 40, 80, 160, 320, 640)
+DROPS_BINS = (0, 1, 2, 5, 10, 20, 50)  # Dropped frames per second
+READAHEAD_BINS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)  # Seconds buffered ahead
+
+METRIC_PROPERTIES = (
+    'frame-drop-count', 'decoder-frame-drop-count', 'estimated-vf-fps',
+    'avsync', 'demuxer-cache-duration', 'paused-for-cache', 'pause', 'idle-active',
+)
+
+
+class Histogram:
+    """Counts of values in fixed bins, optionally over the last 'window' samples only."""
+
+    def __init__(self, edges, window=None):
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+        self.recent = deque(maxlen=window) if window else None
+        self.total = 0
+        self.sum = 0.0
+        self.max = None
+
+    def add(self, value):
+        index = bisect.bisect_left(self.edges, value)
+        if self.recent is not None:
+            if len(self.recent) == self.recent.maxlen:
+                old_index, old_value = self.recent[0]
+                self.counts[old_index] -= 1
+                self.sum -= old_value
+                self.total -= 1
+            self.recent.append((index, value))
+        self.counts[index] += 1
+        self.sum += value
+        self.total += 1
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def mean(self):
+        return self.sum / self.total if self.total else None
+
+    def percentile(self, q):
+        """Returns the upper edge of the bin holding the q-th percentile (None if empty)."""
+        if not self.total:
+            return None
+        rank = q / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return self.edges[index] if index < len(self.edges) else self.max
+        return self.max
+
+    def as_dict(self):
+        labels = [f"<={edge}" for edge in self.edges] + [f">{self.edges[-1]}"]
+        return {label: count for label, count in zip(labels, self.counts) if count}
+
+
+class FileMetrics:
+    """Metrics of one played file."""
+
+    def __init__(self, path, profile=None):
+        self.path = path
+        self.profile = profile
+        self.started_at = time.time()
+        self.played_seconds = 0.0
+        self.dropped_frames = 0
+        self.decoder_dropped_frames = 0
+        self.rebuffers = []  # Durations (seconds) of finished stalls
+        self.rebuffer_start = None
+        self.histograms = {
+            'fps': Histogram(FPS_BINS), 'avsync_ms': Histogram(AVSYNC_BINS_MS),
+            'drops_per_s': Histogram(DROPS_BINS), 'readahead_s': Histogram(READAHEAD_BINS),
+        }
+        self.rolling = {
+            'fps': Histogram(FPS_BINS, ROLLING_SAMPLES),
+            'avsync_ms': Histogram(AVSYNC_BINS_MS, ROLLING_SAMPLES),
+            'drops_per_s': Histogram(DROPS_BINS, ROLLING_SAMPLES),
+            'readahead_s': Histogram(READAHEAD_BINS, ROLLING_SAMPLES),
+        }
+
+    def add(self, name, value):
+        self.histograms[name].add(value)
+        self.rolling[name].add(value)
+
+    def stall_seconds(self, now):
+        ongoing = now - self.rebuffer_start if self.rebuffer_start is not None else 0.0
+        return sum(self.rebuffers) + ongoing
+
+    def report(self, now):
+        fps, avsync = self.histograms['fps'], self.histograms['avsync_ms']
+        readahead = self.histograms['readahead_s']
+        expected_frames = (fps.mean() or 0.0) * self.played_seconds
+        dropped = self.dropped_frames + self.decoder_dropped_frames
+        return {
+            'path': self.path,
+            'cache_profile': self.profile,
+            'started_at': self.started_at,
+            'played_seconds': round(self.played_seconds, 1),
+            'dropped_frames': self.dropped_frames,
+            'decoder_dropped_frames': self.decoder_dropped_frames,
+            'drop_rate': round(dropped / expected_frames, 4) if expected_frames else None,
+            'fps_mean': round(fps.mean(), 2) if fps.total else None,
+            'fps_p5': fps.percentile(5),
+            'avsync_ms_p50': avsync.percentile(50),
+            'avsync_ms_p95': avsync.percentile(95),
+            'avsync_ms_max': round(avsync.max, 1) if avsync.max is not None else None,
+            'readahead_s_p5': readahead.percentile(5),
+            'rebuffer_count': len(self.rebuffers) + (self.rebuffer_start is not None),
+            'rebuffer_seconds': round(self.stall_seconds(now), 2),
+            'longest_rebuffer_seconds': round(max(self.rebuffers), 2) if self.rebuffers else None,
+            'histograms': {name: h.as_dict() for name, h in self.histograms.items()},
+        }
+
+
+class PlaybackMetrics:
+
+    def __init__(self, report_dir=None):
+        self.report_dir = report_dir or os.path.join(default_data_dir(), "playback_reports")
+        self.session_start = time.time()
+        self.files = []  # Finished FileMetrics
+        self.current = None
+        self.latest = {}
+        self.last_sample = None
+        self.drop_counts = (0, 0)  # frame-drop-count, decoder-frame-drop-count at the last sample
+
+    def start_file(self, path, profile=None):
+        self.finish_file()
+        self.current = FileMetrics(path, profile)
+        self.latest = {'pause': self.latest.get('pause')}  # Not reported again unless it changes
+        self.last_sample = None
+        self.drop_counts = (0, 0)
+
+    def finish_file(self):
+        if self.current is None:
+            return
+        now = time.monotonic()
+        if self.current.rebuffer_start is not None:
+            self.current.rebuffers.append(now - self.current.rebuffer_start)
+            self.current.rebuffer_start = None
+        if self.current.played_seconds > 0 or self.current.rebuffers:
+            self.files.append(self.current)
+        self.current = None
+
+    def update(self, snapshot):
+        """Takes the latest values of METRIC_PROPERTIES from a property snapshot."""
+        for name in METRIC_PROPERTIES:
+            if name in snapshot:
+                self.latest[name] = snapshot[name]
+        if 'paused-for-cache' in snapshot and self.current is not None:
+            now = time.monotonic()
+            stalled = bool(snapshot['paused-for-cache'])
+            if stalled and self.current.rebuffer_start is None:
+                self.current.rebuffer_start = now
+                logger.info(f"Rebuffering: {self.current.path}")
+            elif not stalled and self.current.rebuffer_start is not None:
+                duration = now - self.current.rebuffer_start
+                self.current.rebuffers.append(duration)
+                self.current.rebuffer_start = None
+                logger.info(f"Rebuffered for {duration:.2f} s")
+
+    def sample(self):
+        """Records one sample of the latest values (call periodically during playback)."""
+        current = self.current
+        now = time.monotonic()
+        last, self.last_sample = self.last_sample, now
+        if current is None or last is None:
+            return
+        latest = self.latest
+        if latest.get('pause') or latest.get('paused-for-cache') or latest.get('idle-active'):
+            return  # Only playing time counts
+        elapsed = now - last
+        current.played_seconds += elapsed
+
+        drops = (latest.get('frame-drop-count') or 0, latest.get('decoder-frame-drop-count') or 0)
+        # Counters restart at 0 for each file (and on some seeks)
+        new_drops = [count - previous if count >= previous else count
+                     for count, previous in zip(drops, self.drop_counts)]
+        self.drop_counts = drops
+        current.dropped_frames += new_drops[0]
+        current.decoder_dropped_frames += new_drops[1]
+        if elapsed > 0:
+            current.add('drops_per_s', sum(new_drops) / elapsed)
+
+        fps = latest.get('estimated-vf-fps')
+        if fps:
+            current.add('fps', fps)
+        avsync = latest.get('avsync')
+        if avsync is not None:
+            current.add('avsync_ms', abs(avsync) * 1000)
+        readahead = latest.get('demuxer-cache-duration')
+        if readahead is not None:
+            current.add('readahead_s', readahead)
+
+    def summary(self):
+        """Returns the figures shown in the stats HUD (rolling window of the current file)."""
+        current = self.current
+        if current is None:
+            return {}
+        rolling = current.rolling
+        return {
+            'fps': self.latest.get('estimated-vf-fps'),
+            'fps_p5': rolling['fps'].percentile(5),
+            'avsync_ms': abs(self.latest.get('avsync') or 0.0) * 1000,
+            'avsync_ms_p95': rolling['avsync_ms'].percentile(95),
+            'dropped_frames': current.dropped_frames,
+            'decoder_dropped_frames': current.decoder_dropped_frames,
+            'drops_per_s': rolling['drops_per_s'].mean(),
+            'readahead_s': self.latest.get('demuxer-cache-duration'),
+            'rebuffer_count': len(current.rebuffers) + (current.rebuffer_start is not None),
+            'rebuffer_seconds': current.stall_seconds(time.monotonic()),
+            'cache_profile': current.profile,
+        }
+
+    def write_report(self):
+        """Writes the session report as JSON; returns its path (None if nothing was played)."""
+        self.finish_file()
+        if not self.files:
+            return None
+        now = time.monotonic()
+        report = {
+            'session_start': self.session_start,
+            'session_end': time.time(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'files': [metrics.report(now) for metrics in self.files],
+        }
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.session_start))
+        path = os.path.join(self.report_dir, f"session-{stamp}.json")
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(self.report_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            os.replace(tmp_path, path)
+            logger.info(f"Playback report for {len(self.files)} files written to {path}")
+        except OSError as e:
+            logger.warning(f"Failed to write playback report: {e}")
+            return None
+        self.prune_reports()
+        return path
+
+    def prune_reports(self):
+        try:
+            reports = sorted(name for name in os.listdir(self.report_dir)
+                             if name.startswith("session-") and name.endswith(".json"))
+            for name in reports[:-MAX_REPORTS]:
+                os.remove(os.path.join(self.report_dir, name))
+        except OSError as e:
+            logger.warning(f"Failed to prune playback reports: {e}")
@@ -2,18 +2,35 @@
 # (UPDATED to remove emojis from the log handler)
 
 import logging 
+import threading
+import time
+from collections import deque
 import mpv
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, 
     QApplication, QMessageBox
 )
-from PySide6.QtCore import Qt, QTimer, Signal, Slot
+from PySide6.QtCore import Qt, QTimer, Signal, Slot, QObject, QRunnable, QThreadPool
 from overlay_widget import OverlayWidget
+from property_bridge import PropertyBridge, FRAME_INTERVAL_MS, HIDDEN_INTERVAL_MS
 from persistence_manager import PersistenceManager
+from cache_profiles import classify_source, cache_options
+from playback_metrics import PlaybackMetrics, METRIC_PROPERTIES
 from utils import format_time
 
 logger = logging.getLogger(__name__)
 
+PROCESS_START = time.perf_counter()  # Reference point for startup-to-first-frame timings
+CHECKPOINT_INTERVAL_MS = 15000  # Resume position is saved this often during playback
+METRICS_INTERVAL_MS = 1000  # Playback health is sampled this often
+
+# mpv default bindings for keys the app uses itself (see key_config); with
+# input-vo-keyboard the video window would otherwise run both actions
+MPV_KEYS_TAKEN_BY_APP = (
+    's',  # Shuffle; mpv takes a screenshot
+    'i',  # Stats HUD; mpv shows its own stats page
+)
+
 # --- UPDATED LOG HANDLER (Emojis removed) ---
 def mpv_log_handler(level, prefix, text):
     """
@@ -35,6 +52,68 @@ def mpv_log_handler(level, prefix, text):
         logger.debug(f"[MPV:{prefix} ({level})] {text}")
 # ------------------------------------------
 
+def create_player(wid):
+    """Creates and configures the main mpv instance, rendering into window 'wid'."""
+    player = mpv.MPV(
+        wid=wid, vo='gpu',
+        log_handler=mpv_log_handler, # Use the safe handler
+        input_default_bindings=True,
+        input_vo_keyboard=True,
+        ytdl=True
+    )
+    player.volume = 100 
+    for key in MPV_KEYS_TAKEN_BY_APP:
+        try:
+            player.command('keybind', key, 'ignore')
+        except Exception as e:
+            logger.warning(f"Could not unbind mpv key '{key}': {e}")
+    try:
+        # Open and buffer the next playlist entry before the current one ends
+        player['prefetch-playlist'] = 'yes'
+    except Exception as e:
+        logger.warning(f"Playlist prefetching not available: {e}")
+    return player
+
+
+class PlayerWarmupSignals(QObject):
+    """Signals for PlayerWarmupWorker (QRunnable is not a QObject)."""
+    done = Signal(object)  # The worker
+
+
+class PlayerWarmupWorker(QRunnable):
+    """
+    Builds the main mpv instance off the GUI thread: libmpv init, config
+    and script loading (including the ytdl hook) and, with
+    force-window, the video output. Only the window handle is taken
+    from the GUI thread, before the worker starts.
+    """
+
+    def __init__(self, wid):
+        super().__init__()
+        self.setAutoDelete(False)  # The player widget keeps the reference
+        self.wid = wid
+        self.player = None
+        self.error = None
+        self.elapsed = 0.0
+        self.finished = threading.Event()
+        self.signals = PlayerWarmupSignals()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.player = create_player(self.wid)
+            try:
+                self.player.force_window = 'immediate'  # Create the VO now, not on first play
+            except Exception as e:
+                logger.debug(f"Could not pre-create the video output: {e}")
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - start
+            self.finished.set()
+            self.signals.done.emit(self)
+
+
 class PlayerWidget(QWidget):
     # ... (rest of the file is unchanged) ...
     
@@ -46,6 +125,10 @@ class PlayerWidget(QWidget):
     chapter_changed = Signal(int); playback_finished = Signal(bool)
     show_library_requested = Signal()
     loop_state_changed = Signal(str)
+    shuffle_changed = Signal(bool)
+    advanced_to_preloaded = Signal(str, bool)  # url, loop all active
+    cache_stats_changed = Signal(dict)
+    stats_changed = Signal(dict)  # PlaybackMetrics.summary(), while the stats HUD is shown
     end_file_signal = Signal()
     
     def __init__(self, parent=None, persistence_manager: PersistenceManager = None):
@@ -60,8 +143,23 @@ class PlayerWidget(QWidget):
         self.current_chapter = 0
         self.current_filepath = None
         self.loop_state = 0
+        self.shuffle_enabled = False
+        self.preloaded_url = None  # Next item, already in mpv's playlist
+        self.eof_time = None  # When the last file reached its end
+        self.transition_start = None  # Set while waiting for the next file's first frame
+        self.transition_gapless = False
+        self.transition_times = deque(maxlen=20)  # Recent item-to-item latencies (ms)
         self.pending_resume_time = 0.0
         self.is_initialized = False
+        self.warmup_worker = None
+        self.warmed_up = False
+        self.init_wait = 0.0  # Seconds the first play spent waiting for the player to exist
+        self.load_start = None  # Set by load_file until the file's first frame
+        self.first_frame_logged = False
+        self.cache_profile = None  # Cache profile of the current file
+        self.cache_stats = {}  # Latest values of CACHE_PROPERTIES
+        self.metrics = PlaybackMetrics()
+        self.stats_visible = False
        
         self.video_widget = QWidget(self)
         self.video_widget.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
@@ -81,13 +179,55 @@ class PlayerWidget(QWidget):
         self.hide_timer.setSingleShot(True)
         self.hide_timer.timeout.connect(self.hide_controls)
 
+        # Periodic position checkpoints, so a crash loses at most one interval
+        self.checkpoint_timer = QTimer(self)
+        self.checkpoint_timer.setInterval(CHECKPOINT_INTERVAL_MS)
+        self.checkpoint_timer.timeout.connect(self.save_current_position)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(METRICS_INTERVAL_MS)
+        self.metrics_timer.timeout.connect(self.sample_metrics)
+
         self.overlay = OverlayWidget(None, self)  # Create overlay without player
+        self.property_bridge = PropertyBridge(self)
+        self.property_bridge.changed.connect(self.apply_properties)
         self.create_basic_connections()
 
+    def warm_up(self):
+        """
+        Starts building the player in the background (opt-in, at startup),
+        so the first video does not pay for mpv's initialization.
+        """
+        if self.is_initialized or self.warmup_worker is not None:
+            return
+        logger.info("Pre-warming the MPV player in the background.")
+        self.warmup_worker = PlayerWarmupWorker(str(int(self.video_widget.winId())))
+        self.warmup_worker.signals.done.connect(self.on_warmup_done)
+        QThreadPool.globalInstance().start(self.warmup_worker)
+
+    @Slot(object)
+    def on_warmup_done(self, worker):
+        if not self.is_initialized:
+            self.ensure_initialized()
+
     def ensure_initialized(self):
-        """Initialize MPV player on first use."""
+        """Initialize MPV player on first use (or adopt the pre-warmed one)."""
         if not self.is_initialized:
-            self.initialize_player()
+            start = time.perf_counter()
+            worker = self.warmup_worker
+            if worker is not None:
+                # Played before the warm-up finished: it is still the quickest way
+                worker.finished.wait()
+                self.warmup_worker = None
+                if worker.error is None:
+                    self.player = worker.player
+                    self.warmed_up = True
+                    logger.info(f"MPV Player pre-warmed in {worker.elapsed * 1000:.0f} ms.")
+                else:
+                    logger.error(f"Pre-warming MPV failed: {worker.error}")
+                    self.initialize_player()
+            else:
+                self.initialize_player()
             if self.player:
                 self.player.event_callback('playback-restart')(self.on_playback_restart_event)
                 self.player.event_callback('end-file')(self.on_end_file_event)
@@ -95,12 +235,14 @@ class PlayerWidget(QWidget):
                 self.setup_observers()
                 self.setup_full_connections()
             self.is_initialized = True
+            self.init_wait = time.perf_counter() - start
 
     def create_basic_connections(self):
         """Setup connections that don't require MPV player."""
         if self.overlay:
             self.overlay.fullscreen_toggled.connect(self.toggle_fullscreen_requested.emit)
             self.overlay.back_requested.connect(self.show_library_requested.emit)
+            self.shuffle_changed.connect(self.overlay.update_shuffle_button)
 
     def setup_full_connections(self):
         """Setup all MPV-dependent connections."""
@@ -119,6 +261,8 @@ class PlayerWidget(QWidget):
         self.chapter_list_changed.connect(self.overlay.update_chapter_menu)
         self.chapter_changed.connect(self.overlay.update_chapter_selection)
         self.loop_state_changed.connect(self.overlay.update_loop_button)
+        self.cache_stats_changed.connect(self.overlay.update_cache_stats)
+        self.stats_changed.connect(self.overlay.update_stats)
         self.end_file_signal.connect(self.handle_end_file)
         
         # Connect overlay buttons to player methods
@@ -131,38 +275,71 @@ class PlayerWidget(QWidget):
 
     def initialize_player(self):
         try:
-            self.player = mpv.MPV(
-                wid=str(int(self.video_widget.winId())), vo='gpu',
-                log_handler=mpv_log_handler, # Use the safe handler
-                input_default_bindings=True,
-                input_vo_keyboard=True,
-                ytdl=True
-            )
-            self.player.volume = 100 
-            logger.info("MPV Player initialized successfully.")
+            start = time.perf_counter()
+            self.player = create_player(str(int(self.video_widget.winId())))
+            logger.info(f"MPV Player initialized successfully in {(time.perf_counter() - start) * 1000:.0f} ms.")
         except Exception as e:
             logger.error(f"Error initializing MPV: {e}", exc_info=True)
             error_label = QLabel(f"Error: {e}\nIs mpv installed?", self.video_widget)
             error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             error_label.setStyleSheet("color: red; background-color: black;")
 
+    # Applied in this order, so track-list sees the current aid/sid/vid
+    OBSERVED_PROPERTIES = (
+        'aid', 'sid', 'vid', 'track-list', 'chapter-list', 'chapter',
+        'duration', 'time-pos', 'pause', 'volume', 'mute',
+    )
+    CACHE_PROPERTIES = (
+        'demuxer-cache-duration', 'demuxer-cache-state',
+        'paused-for-cache', 'cache-buffering-state',
+    )
+
     def setup_observers(self):
         if not self.player: return
-        self.player.observe_property('pause', lambda n, v: self.pause_changed.emit(v if v is not None else False))
-        self.player.observe_property('time-pos', lambda n, v: self.time_pos_changed.emit(v if v is not None else 0.0))
-        self.player.observe_property('duration', lambda n, v: self.duration_changed.emit(v if v is not None else 0.0))
-        self.player.observe_property('volume', lambda n, v: self.volume_changed.emit(int(v) if v is not None else 100))
-        self.player.observe_property('mute', lambda n, v: self.mute_changed.emit(v if v is not None else False))
-        self.player.observe_property('track-list', 
-            lambda n, v: self.track_list_changed.emit(
-                v if v is not None else [], self.current_aid,
-                self.current_sid, self.current_vid
-            ))
-        self.player.observe_property('aid', self.on_aid_change)
-        self.player.observe_property('sid', self.on_sid_change)
-        self.player.observe_property('vid', self.on_vid_change)
-        self.player.observe_property('chapter-list', self.on_chapter_list_change)
-        self.player.observe_property('chapter', self.on_chapter_change)
+        # All observers feed one bridge that hands the GUI a coalesced
+        # snapshot at most once per frame, instead of a signal per change
+        observed = self.OBSERVED_PROPERTIES + self.CACHE_PROPERTIES
+        self.property_bridge.observe(
+            self.player, observed + tuple(name for name in METRIC_PROPERTIES if name not in observed)
+        )
+
+    @Slot(object)
+    def apply_properties(self, snapshot):
+        """Emits the change signals for a batch of mpv property changes."""
+        for name in self.OBSERVED_PROPERTIES:
+            if name not in snapshot:
+                continue
+            v = snapshot[name]
+            if name == 'time-pos':
+                self.time_pos_changed.emit(v if v is not None else 0.0)
+            elif name == 'duration':
+                self.duration_changed.emit(v if v is not None else 0.0)
+            elif name == 'pause':
+                self.pause_changed.emit(v if v is not None else False)
+            elif name == 'volume':
+                self.volume_changed.emit(int(v) if v is not None else 100)
+            elif name == 'mute':
+                self.mute_changed.emit(v if v is not None else False)
+            elif name == 'track-list':
+                self.track_list_changed.emit(
+                    v if v is not None else [], self.current_aid,
+                    self.current_sid, self.current_vid
+                )
+            elif name == 'aid':
+                self.on_aid_change(name, v)
+            elif name == 'sid':
+                self.on_sid_change(name, v)
+            elif name == 'vid':
+                self.on_vid_change(name, v)
+            elif name == 'chapter-list':
+                self.on_chapter_list_change(name, v)
+            elif name == 'chapter':
+                self.on_chapter_change(name, v)
+        self.metrics.update(snapshot)
+        cache_changes = {name: snapshot[name] for name in self.CACHE_PROPERTIES if name in snapshot}
+        if cache_changes:
+            self.cache_stats.update(cache_changes)
+            self.cache_stats_changed.emit(dict(self.cache_stats, profile=self.cache_profile))
 
     def on_aid_change(self, name, value):
         self.current_aid = str(value) if value is not None else 'no'
@@ -200,6 +377,7 @@ class PlayerWidget(QWidget):
                 # 4 = ERROR (Playback error)
                 
                 if reason == 0:
+                    self.eof_time = time.perf_counter()
                     logger.info("Video playback finished (EOF). Emitting end_file_signal.")
                     self.end_file_signal.emit()
                 else:
@@ -210,6 +388,10 @@ class PlayerWidget(QWidget):
     def on_playback_restart_event(self, event):
         try:
             logger.debug("Playback-restart event triggered.")
+            if self.transition_start is not None:
+                self.finish_transition()
+            if self.load_start is not None:
+                self.log_first_frame()
             if self.pending_resume_time > 0:
                 self.player.time_pos = self.pending_resume_time
                 self.pending_resume_time = 0.0
@@ -226,9 +408,100 @@ class PlayerWidget(QWidget):
             return
         
         loop_all_active = self.loop_state == 2
+        if self.persistence_manager and self.current_filepath:
+            # Watched to the end: the next open starts from the beginning
+            self.persistence_manager.save_playback_position(self.current_filepath, 0.0)
+            self.persistence_manager.flush_playback_positions()
+        if self.preloaded_url:
+            # mpv has already moved on to the preloaded item
+            url = self.preloaded_url
+            self.preloaded_url = None
+            self.current_filepath = url
+            self.pending_resume_time = 0.0
+            self.cache_profile = classify_source(url)
+            self.cache_stats = {}
+            self.cache_stats_changed.emit({'profile': self.cache_profile})
+            self.metrics.start_file(url, self.cache_profile)
+            self.begin_transition(gapless=True)
+            logger.info(f"Playback finished, continued into preloaded item. Loop All: {loop_all_active}")
+            self.advanced_to_preloaded.emit(url, loop_all_active)
+            return
         logger.info(f"Playback finished. Loop All: {loop_all_active}")
         self.playback_finished.emit(loop_all_active)
 
+    # --- Gapless transitions ---
+
+    def preload_next(self, url, audio_tracks=None, video_tracks=None):
+        """
+        Queues 'url' behind the current file in mpv's playlist, so it is
+        opened and buffered (prefetch-playlist) before the current file
+        ends and playback continues into it without a gap.
+        Items with separate audio/video tracks, and items with a saved
+        position (so the user is asked whether to resume), are loaded
+        the usual way.
+        """
+        if not self.player or url == self.preloaded_url:
+            return
+        if audio_tracks or video_tracks:
+            self.clear_preload()
+            logger.debug("Next item has external tracks; it will be loaded on demand.")
+            return
+        if self.persistence_manager and self.persistence_manager.load_playback_position(url) > 0:
+            self.clear_preload()
+            logger.debug("Next item has a saved position; it will be loaded on demand.")
+            return
+        try:
+            self.player.playlist_clear()  # Drops a stale preload; keeps the current file
+            self.player.playlist_append(url, **self.source_cache_options(url))
+            self.preloaded_url = url
+            logger.debug(f"Preloaded next item: {url}")
+        except Exception as e:
+            self.preloaded_url = None
+            logger.warning(f"Failed to preload next item: {e}")
+
+    def source_cache_options(self, filepath):
+        """Returns the per-file mpv cache options for 'filepath' (see cache_profiles)."""
+        profile = classify_source(filepath)
+        disk_cache = self.persistence_manager.load_disk_cache() if self.persistence_manager else False
+        return cache_options(profile, disk_cache)
+
+    def clear_preload(self):
+        if not self.player or not self.preloaded_url:
+            return
+        self.preloaded_url = None
+        try:
+            self.player.playlist_clear()
+        except Exception as e:
+            logger.warning(f"Failed to clear preloaded item: {e}")
+
+    def log_first_frame(self):
+        """Logs time-to-first-frame of a load (and, once, since application start)."""
+        now = time.perf_counter()
+        latency = (now - self.load_start) * 1000
+        self.load_start = None
+        mode = "pre-warmed" if self.warmed_up else "on-demand"
+        if not self.first_frame_logged:
+            self.first_frame_logged = True
+            logger.info(f"First frame {latency:.0f} ms after load + {self.init_wait * 1000:.0f} ms "
+                        f"player setup ({mode} player), {now - PROCESS_START:.2f} s after startup")
+        else:
+            logger.info(f"First frame {latency:.0f} ms after load")
+
+    def begin_transition(self, gapless=False):
+        """Starts timing the switch to the next item, from the end of the last one."""
+        self.transition_start = self.eof_time or time.perf_counter()
+        self.eof_time = None
+        self.transition_gapless = gapless
+
+    def finish_transition(self):
+        latency = (time.perf_counter() - self.transition_start) * 1000
+        self.transition_start = None
+        self.transition_times.append(latency)
+        average = sum(self.transition_times) / len(self.transition_times)
+        logger.info(f"Item transition: {latency:.0f} ms "
+                    f"({'gapless' if self.transition_gapless else 'cold load'}); "
+                    f"average of last {len(self.transition_times)}: {average:.0f} ms")
+
     def toggle_pause(self):
         if self.player:
             try:
@@ -350,17 +623,41 @@ class PlayerWidget(QWidget):
         except Exception as e:
             logger.error(f"Failed to cycle loop state: {e}")
 
+    @Slot()
+    def toggle_shuffle(self):
+        # Playback order lives in the library; this only tracks the mode
+        self.shuffle_enabled = not self.shuffle_enabled
+        self.shuffle_changed.emit(self.shuffle_enabled)
+        logger.info(f"Shuffle {'ON' if self.shuffle_enabled else 'OFF'}.")
+
     @Slot(str, list, list)
     def load_file(self, filepath, audio_tracks=None, video_tracks=None, show_controls=True):
         if self.player:
             self.save_current_position()
             self.player.stop() 
             logger.info(f"Loading file: {filepath}")
+            if self.current_filepath:
+                received, delivered = self.property_bridge.take_stats()
+                logger.debug(f"Property bridge: {received} mpv property changes "
+                             f"delivered as {delivered} GUI updates")
             self.current_filepath = filepath
+            self.preloaded_url = None  # stop() cleared mpv's playlist
             
             self.check_for_resume() 
             
-            self.player.play(filepath)
+            # Per-file options only apply to this file; mpv restores the
+            # global values afterwards, so profiles never leak between items
+            self.cache_profile = classify_source(filepath)
+            options = self.source_cache_options(filepath)
+            logger.info(f"Cache profile '{self.cache_profile}' for {filepath}")
+            self.cache_stats = {}
+            self.cache_stats_changed.emit({'profile': self.cache_profile})
+            self.metrics.start_file(filepath, self.cache_profile)
+
+            self.load_start = time.perf_counter()
+            self.player.loadfile(filepath, **options)
+            self.checkpoint_timer.start()
+            self.metrics_timer.start()
 
             if video_tracks:
                 for track in video_tracks:
@@ -406,6 +703,25 @@ class PlayerWidget(QWidget):
             if reply == QMessageBox.StandardButton.Yes:
                 self.pending_resume_time = last_time
 
+    # --- Playback health ---
+
+    @Slot()
+    def sample_metrics(self):
+        self.metrics.sample()
+        if self.stats_visible:
+            self.stats_changed.emit(self.metrics.summary())
+
+    def toggle_stats(self):
+        """Shows or hides the playback stats HUD; the controls stay up while it is shown."""
+        self.stats_visible = not self.stats_visible
+        if self.overlay:
+            self.overlay.set_stats_visible(self.stats_visible)
+            self.position_overlay()
+        if self.stats_visible:
+            self.stats_changed.emit(self.metrics.summary())
+            self.show_controls()
+        logger.info(f"Stats HUD {'ON' if self.stats_visible else 'OFF'}.")
+
     def save_current_position(self):
         if (self.persistence_manager and 
             self.player and 
@@ -418,8 +734,17 @@ class PlayerWidget(QWidget):
                 self.persistence_manager.save_playback_position(self.current_filepath, 0.0)
             elif current_time > 10:
                 self.persistence_manager.save_playback_position(self.current_filepath, current_time)
+            self.persistence_manager.flush_playback_positions()  # Written in the background
                 
     def shutdown(self):
+        self.checkpoint_timer.stop()
+        self.metrics_timer.stop()
+        self.metrics.write_report()
+        if self.warmup_worker is not None:
+            # A pre-warmed player that was never adopted still needs terminating
+            self.warmup_worker.finished.wait()
+            self.player = self.player or self.warmup_worker.player
+            self.warmup_worker = None
         if self.player:
             logger.info("Shutting down MPV player.")
             try:
@@ -436,12 +761,15 @@ class PlayerWidget(QWidget):
             logger.info("Shutdown called, but no player instance found.")
             
     def resizeEvent(self, event):
+        self.position_overlay()
+        super().resizeEvent(event)
+
+    def position_overlay(self):
         if self.overlay:
             overlay_height = self.overlay.sizeHint().height()
             x = 0; y = self.height() - overlay_height
             w = self.width(); h = overlay_height
             self.overlay.setGeometry(x, y, w, h)
-        super().resizeEvent(event)
         
     def mouseMoveEvent(self, event):
         self.show_controls(); super().mouseMoveEvent(event)
@@ -464,6 +792,7 @@ class PlayerWidget(QWidget):
     def show_controls(self):
         if self.overlay and self.isVisible():
             self.overlay.show()
+            self.property_bridge.set_interval(FRAME_INTERVAL_MS)
             self.setCursor(Qt.CursorShape.ArrowCursor)
             self.hide_timer.start()
             focused_widget = QApplication.instance().focusWidget()
@@ -482,7 +811,7 @@ class PlayerWidget(QWidget):
                         if widget == self.overlay:
                             is_overlay_focused = True; break
                         widget = widget.parent()
-                if is_overlay_focused:
+                if is_overlay_focused or self.stats_visible:
                     self.hide_timer.start(); return
             
             # Stop the hide timer when forcing hide
@@ -490,5 +819,6 @@ class PlayerWidget(QWidget):
                 self.hide_timer.stop()
             
             self.overlay.hide()
+            self.property_bridge.set_interval(HIDDEN_INTERVAL_MS)
             self.setCursor(Qt.CursorShape.BlankCursor)
             logger.debug("Controls hidden.")
\ No newline at end of file
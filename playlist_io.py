@@ -0,0 +1,182 @@
+# playlist_io.py
+
+import logging
+import os
+import time
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+from urllib.parse import urlparse, unquote
+from xml.sax.saxutils import escape
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+logger = logging.getLogger(__name__)
+
+PLAYLIST_EXTENSIONS = ('.m3u', '.m3u8', '.xspf')
+PLAYLIST_FILTER = "Playlists (*.m3u *.m3u8 *.xspf);;M3U (*.m3u *.m3u8);;XSPF (*.xspf)"
+
+XSPF_NS = "{http://xspf.org/ns/0/}"
+
+
+def is_xspf(filepath):
+    return filepath.lower().endswith('.xspf')
+
+def resolve_location(location, base_dir):
+    """
+    Turns a playlist location into what the library stores: URLs stay
+    as they are, file:// URIs and relative paths become absolute paths.
+    """
+    location = location.strip()
+    if location.startswith('file:'):
+        parsed = urlparse(location)
+        path = unquote(parsed.path)
+        if os.name == 'nt' and path.startswith('/') and path[2:3] == ':':
+            path = path[1:]  # file:///C:/... -> C:/...
+        return os.path.normpath(path)
+    if '://' in location:
+        return location
+    return os.path.normpath(os.path.join(base_dir, os.path.expanduser(location)))
+
+def iter_m3u(filepath):
+    """
+    Yields (location, title or None, duration or None) for each entry
+    of an M3U/M3U8 file, reading it line by line. #EXTINF supplies the
+    title and duration of the entry that follows it.
+    """
+    base_dir = os.path.dirname(os.path.abspath(filepath))
+    title = duration = None
+    with open(filepath, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('#'):
+                if line.startswith('#EXTINF:'):
+                    info, _, name = line[8:].partition(',')
+                    try:
+                        seconds = float(info.split()[0]) if info.split() else -1
+                    except ValueError:
+                        seconds = -1
+                    duration = seconds if seconds > 0 else None
+                    title = name.strip() or None
+                continue
+            yield resolve_location(line, base_dir), title, duration
+            title = duration = None
+
+def iter_xspf(filepath):
+    """
+    Yields (location, title or None, duration or None) for each track
+    of an XSPF file. Parsed incrementally; every track element is
+    discarded once read, so memory stays flat for any playlist size.
+    """
+    base_dir = os.path.dirname(os.path.abspath(filepath))
+    for _, element in ElementTree.iterparse(filepath, events=('end',)):
+        if element.tag not in (XSPF_NS + 'track', 'track'):
+            continue
+        fields = {child.tag.rpartition('}')[2]: (child.text or "").strip() for child in element}
+        element.clear()
+        location = fields.get('location')
+        if not location:
+            continue
+        try:
+            duration = int(fields.get('duration') or 0) / 1000 or None
+        except ValueError:
+            duration = None
+        yield resolve_location(location, base_dir), fields.get('title') or None, duration
+
+def iter_playlist(filepath):
+    return iter_xspf(filepath) if is_xspf(filepath) else iter_m3u(filepath)
+
+def playlist_location(filepath, xspf):
+    """Returns how an entry is written to a playlist (XSPF wants URIs)."""
+    if '://' in filepath or not xspf:
+        return filepath
+    return Path(filepath).absolute().as_uri()
+
+def write_playlist(filepath, entries):
+    """
+    Writes an iterable of LibraryEntry to 'filepath' as M3U8 (or XSPF
+    for a .xspf name), one entry at a time. Returns the number written.
+    """
+    xspf = is_xspf(filepath)
+    count = 0
+    with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
+        if xspf:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<playlist version="1" xmlns="http://xspf.org/ns/0/">\n  <trackList>\n')
+        else:
+            f.write("#EXTM3U\n")
+        for entry in entries:
+            location = playlist_location(entry.filepath, xspf)
+            if xspf:
+                f.write(f"    <track>\n      <location>{escape(location)}</location>\n"
+                        f"      <title>{escape(entry.title)}</title>\n")
+                if entry.duration:
+                    f.write(f"      <duration>{int(entry.duration * 1000)}</duration>\n")
+                f.write("    </track>\n")
+            else:
+                seconds = int(round(entry.duration)) if entry.duration else -1
+                f.write(f"#EXTINF:{seconds},{entry.title}\n{location}\n")
+            count += 1
+        if xspf:
+            f.write("  </trackList>\n</playlist>\n")
+    return count
+
+
+class PlaylistImportSignals(QObject):
+    """Signals for PlaylistImportWorker (QRunnable is not a QObject)."""
+    batch_found = Signal(object, list)  # worker, [(location, title, duration), ...]
+    finished = Signal(object, int)      # worker, total entries read
+
+
+class PlaylistImportWorker(QRunnable):
+    """
+    Parses a playlist in the background and streams its entries back
+    in batches, so the first rows appear while the rest is still being
+    read. Entries are not checked for existence here; files that turn
+    out to be missing are flagged when the library probes them.
+    """
+
+    BATCH_SIZE = 250
+    EMIT_INTERVAL = 0.25  # Seconds; flush partial batches on slow storage
+
+    def __init__(self, filepath):
+        super().__init__()
+        self.setAutoDelete(False)  # The library keeps the reference
+        self.filepath = filepath
+        self.cancelled = False
+        self.signals = PlaylistImportSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        found = 0
+        try:
+            found = self.read()
+        except (OSError, ElementTree.ParseError) as e:
+            logger.error(f"Failed to read playlist {self.filepath}: {e}")
+        except Exception as e:
+            logger.error(f"Playlist import of {self.filepath} failed: {e}", exc_info=True)
+        finally:
+            self.signals.finished.emit(self, found)
+
+    def read(self):
+        start = time.monotonic()
+        last_emit = start
+        batch = []
+        found = 0
+        for item in iter_playlist(self.filepath):
+            if self.cancelled:
+                break
+            batch.append(item)
+            now = time.monotonic()
+            if len(batch) >= self.BATCH_SIZE or now - last_emit >= self.EMIT_INTERVAL:
+                found += len(batch)
+                self.signals.batch_found.emit(self, batch)
+                batch = []
+                last_emit = now
+        if batch and not self.cancelled:
+            found += len(batch)
+            self.signals.batch_found.emit(self, batch)
+        logger.info(f"Read {found} entries from {self.filepath} in {time.monotonic() - start:.1f} s")
+        return found
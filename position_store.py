@@ -0,0 +1,167 @@
+# position_store.py
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from library_database import default_data_dir
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    path TEXT PRIMARY KEY,
+    position REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class PositionStore:
+    """
+    Write-behind store for resume positions.
+
+    save() only updates an in-memory dirty map; flush() hands the dirty
+    entries to a single background writer thread, which applies them
+    to SQLite in one transaction. Lookups check the dirty map first and
+    then do a primary-key query, so playback never waits on a write.
+    A position of 0 deletes the row, and rows for local files that were
+    deleted are pruned in the background when the store opens.
+    """
+
+    FILE_NAME = "positions.sqlite3"
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(default_data_dir(), self.FILE_NAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)  # Reads, on the owner's thread
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.dirty = {}  # path -> position (0.0 = forget)
+        self.in_flight = {}  # Handed to the writer, not committed yet
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="position-store")
+        self.writer_conn = None  # Opened on the writer thread
+        self.writer.submit(self.prune)
+
+    def load(self, filepath):
+        with self.lock:
+            position = self.dirty.get(filepath, self.in_flight.get(filepath))
+        if position is not None:
+            return position
+        try:
+            row = self.conn.execute(
+                "SELECT position FROM positions WHERE path = ?", (filepath,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read playback position: {e}")
+            return 0.0
+        return row[0] if row else 0.0
+
+    def save(self, filepath, position):
+        with self.lock:
+            self.dirty[filepath] = position
+
+    def flush(self, wait=False):
+        """
+        Writes the dirty positions in the background (or before returning,
+        with 'wait', and then returns whether the write succeeded).
+        """
+        with self.lock:
+            updates = self.dirty
+            self.dirty = {}
+            self.in_flight.update(updates)
+        if not updates and not wait:
+            return
+        future = self.writer.submit(self.write, updates)
+        if wait:
+            return future.result()
+
+    def close(self):
+        self.flush(wait=True)
+        self.writer.submit(self.close_writer).result()
+        self.writer.shutdown()
+        self.conn.close()
+
+    # --- Writer thread ---
+
+    def connection(self):
+        if self.writer_conn is None:
+            self.writer_conn = sqlite3.connect(self.db_path)
+        return self.writer_conn
+
+    def write(self, updates):
+        """Applies {path: position} in one transaction. Returns False if it failed."""
+        if not updates:
+            return True
+        now = time.time()
+        try:
+            conn = self.connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO positions (path, position, updated_at) VALUES (?, ?, ?)",
+                    [(path, position, now) for path, position in updates.items() if position > 0]
+                )
+                conn.executemany(
+                    "DELETE FROM positions WHERE path = ?",
+                    [(path,) for path, position in updates.items() if position <= 0]
+                )
+            logger.debug(f"Saved {len(updates)} playback positions")
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to save playback positions: {e}")
+            # Keep them for the next flush unless newer values arrived meanwhile
+            with self.lock:
+                for path, position in updates.items():
+                    self.dirty.setdefault(path, position)
+            return False
+        finally:
+            with self.lock:
+                for path, position in updates.items():
+                    if self.in_flight.get(path) == position:
+                        del self.in_flight[path]
+
+    def prune(self):
+        """
+        Forgets positions of local files that were deleted: the file is
+        missing but its directory is there and not empty. A file whose
+        directory is gone or empty may be on an unmounted share or an
+        unplugged drive, so its position is kept.
+        """
+        try:
+            conn = self.connection()
+            paths = [row[0] for row in conn.execute("SELECT path FROM positions")]
+            reachable = {}  # directory -> exists and has entries
+
+            def is_reachable(directory):
+                if directory not in reachable:
+                    try:
+                        with os.scandir(directory) as entries:
+                            reachable[directory] = next(entries, None) is not None
+                    except OSError:
+                        reachable[directory] = False
+                return reachable[directory]
+
+            missing = [(path,) for path in paths
+                       if '://' not in path and not os.path.exists(path)
+                       and is_reachable(os.path.dirname(path))]
+            if missing:
+                with conn:
+                    conn.executemany("DELETE FROM positions WHERE path = ?", missing)
+                logger.info(f"Pruned {len(missing)} playback positions of missing files")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to prune playback positions: {e}")
+
+    def import_positions(self, positions):
+        """Queues {path: position} from an older store (dirty values win)."""
+        with self.lock:
+            for path, position in positions.items():
+                self.dirty.setdefault(path, position)
+
+    def close_writer(self):
+        if self.writer_conn is not None:
+            self.writer_conn.close()
+            self.writer_conn = None
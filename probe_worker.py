@@ -0,0 +1,72 @@
+# probe_worker.py
+
+import logging
+import os
+import time
+from PySide6.QtCore import QObject, QRunnable, Signal
+from media_probe import probe
+
+logger = logging.getLogger(__name__)
+
+class ProbeWorkerSignals(QObject):
+    """Signals for ProbeWorker (QRunnable is not a QObject)."""
+    probed = Signal(object)  # [(key, {'duration', 'width', 'height', 'bitrate', 'size', 'mtime_ns'} or None), ...]
+    finished = Signal(object)  # The worker
+
+
+class ProbeWorker(QRunnable):
+    """
+    Reads container headers for a batch of local files with media_probe.
+    Results are emitted in small groups as they come in, so the library
+    columns fill in progressively instead of waiting for the whole batch.
+    Every file reports its size and mtime; files the probe does not
+    understand report zero duration and resolution, and their thumbnail
+    job fills those in through mpv. Files that cannot be found report
+    None.
+    """
+
+    EMIT_INTERVAL = 0.05  # Seconds between result batches
+
+    def __init__(self, jobs):
+        super().__init__()
+        self.setAutoDelete(False)  # The library keeps the reference
+        self.jobs = jobs  # [(key, filepath), ...]
+        self.signals = ProbeWorkerSignals()
+
+    def run(self):
+        try:
+            self.probe_all()
+        except Exception as e:
+            logger.error(f"Probe worker failed: {e}", exc_info=True)
+        finally:
+            self.signals.finished.emit(self)
+
+    def probe_all(self):
+        results = []
+        last_emit = time.monotonic()
+        start = last_emit
+        for key, filepath in self.jobs:
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                results.append((key, None))
+                continue
+            try:
+                result = probe(filepath)
+            except Exception as e:
+                # One unreadable file must not cost the rest of the batch its metadata
+                logger.warning(f"Probe failed for {filepath}: {e}")
+                result = None
+            result = result or {'duration': 0.0, 'width': 0, 'height': 0}
+            duration = result['duration']
+            result['bitrate'] = int(stat.st_size * 8 / duration) if duration > 0 else 0
+            result['size'], result['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+            results.append((key, result))
+            now = time.monotonic()
+            if results and now - last_emit >= self.EMIT_INTERVAL:
+                self.signals.probed.emit(results)
+                results = []
+                last_emit = now
+        if results:
+            self.signals.probed.emit(results)
+        logger.debug(f"Probed {len(self.jobs)} files in {(time.monotonic() - start) * 1000:.0f} ms")
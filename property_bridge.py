@@ -0,0 +1,99 @@
+# property_bridge.py
+
+import logging
+import threading
+import time
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+logger = logging.getLogger(__name__)
+
+FRAME_INTERVAL_MS = 8     # Lets per-frame updates of 60 fps video through, coalesces faster ones
+HIDDEN_INTERVAL_MS = 250  # While nothing on screen shows the values
+
+
+class PropertyBridge(QObject):
+    """
+    Carries mpv property changes to the GUI thread in batches.
+
+    Observer callbacks (mpv's event thread) only store the latest value
+    of each property. The first change after a delivery posts a single
+    wakeup to the GUI thread. If the last delivery is at least
+    'interval_ms' old, the batch is delivered right away as one
+    {name: value} snapshot; otherwise a timer delivers it when the
+    interval is up, and changes arriving meanwhile join the same batch.
+    Changes slower than the interval thus cost one queued event each,
+    like a plain signal, while faster ones are coalesced to at most one
+    snapshot per interval. Nothing at all happens while no property
+    changes.
+    """
+
+    changed = Signal(object)  # {property name: latest value}; object avoids a QVariantMap copy
+    wakeup = Signal()         # Internal: crosses from mpv's thread to the GUI thread
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.wakeup_posted = False
+        self.interval_ms = FRAME_INTERVAL_MS
+        self.last_delivery = 0.0
+        self.received = 0   # Property changes reported by mpv
+        self.delivered = 0  # Snapshots handed to the GUI
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.deliver)
+        self.wakeup.connect(self.schedule)
+
+    def observe(self, player, names):
+        for name in names:
+            player.observe_property(name, self.on_property_change)
+
+    def on_property_change(self, name, value):
+        # Called on mpv's event thread
+        with self.lock:
+            self.pending[name] = value
+            self.received += 1
+            post = not self.wakeup_posted
+            self.wakeup_posted = True
+        if post:
+            self.wakeup.emit()
+
+    def set_interval(self, interval_ms):
+        if interval_ms == self.interval_ms:
+            return
+        self.interval_ms = interval_ms
+        if self.timer.isActive():
+            # Re-arm a pending delivery for the new interval
+            self.timer.stop()
+            self.schedule()
+
+    def remaining_ms(self):
+        return self.interval_ms - (time.monotonic() - self.last_delivery) * 1000
+
+    @Slot()
+    def schedule(self):
+        if self.timer.isActive():
+            return
+        remaining = self.remaining_ms()
+        if remaining <= 0:
+            self.deliver()  # Nothing delivered for a whole interval: no need to wait
+        else:
+            self.timer.start(int(remaining) + 1)
+
+    @Slot()
+    def deliver(self):
+        with self.lock:
+            snapshot = self.pending
+            self.pending = {}
+            self.wakeup_posted = False
+        self.last_delivery = time.monotonic()
+        if snapshot:
+            self.delivered += 1
+            self.changed.emit(snapshot)
+
+    def take_stats(self):
+        """Returns (changes received, snapshots delivered) since the last call."""
+        with self.lock:
+            stats = (self.received, self.delivered)
+            self.received = self.delivered = 0
+        return stats
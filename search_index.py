@@ -0,0 +1,198 @@
+# search_index.py
+
+"""
+In-memory substring search over the library.
+
+Every indexed item has a lowercased search text (title, path and
+metadata). Each trigram of that text maps to a compact posting list
+of item ids. A query term is answered from the shortest posting list
+among its trigrams, and the candidates are verified against the text,
+so the result is always an exact substring match.
+
+Postings are append-only arrays: removing or re-indexing an item only
+drops or replaces its text, and stale postings are filtered out by the
+verification step. When stale postings outnumber live items the
+postings are rebuilt from the texts.
+
+Verifying a broad query touches every candidate, which on a large
+library takes longer than a frame. start_search() returns a SearchJob
+that does the verification in time slices, so the caller can spread it
+over several event loop iterations and drop it when the query changes.
+"""
+
+import logging
+import time
+from array import array
+
+logger = logging.getLogger(__name__)
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def normalize(text):
+    return text.casefold()
+
+
+class SearchIndex:
+
+    def __init__(self):
+        self.texts = {}     # item_id -> normalized search text
+        self.postings = {}  # trigram -> array of item ids (may hold stale ids)
+        self.total = 0      # Postings in all lists
+        self.stale = 0      # Postings that belong to removed or re-indexed text
+        self.last_query = None    # Last search, reused while the user keeps typing
+        self.last_matches = None
+        self.version = 0  # Bumped by every change, so unfinished searches can tell they are stale
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, item_id, text):
+        """Indexes (or re-indexes) 'item_id' under 'text'."""
+        text = normalize(text)
+        old_text = self.texts.get(item_id)
+        if old_text == text:
+            return
+        old_grams = set()
+        if old_text is not None:
+            old_grams = trigrams(old_text)
+        self.texts[item_id] = text
+        self.last_query = None
+        self.version += 1
+        new_grams = trigrams(text)
+        # Postings of trigrams the item keeps are still valid
+        self.stale += len(old_grams - new_grams)
+        for gram in new_grams - old_grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array('I')
+            posting.append(item_id)
+            self.total += 1
+        self.maybe_compact()
+
+    def remove(self, item_id):
+        text = self.texts.pop(item_id, None)
+        if text is not None:
+            self.last_query = None
+            self.version += 1
+            self.stale += len(trigrams(text))
+            self.maybe_compact()
+
+    def clear(self):
+        self.texts.clear()
+        self.postings.clear()
+        self.last_query = None
+        self.version += 1
+        self.total = 0
+        self.stale = 0
+
+    def search(self, query):
+        """
+        Returns the set of item ids whose text contains every
+        whitespace-separated term of 'query', or None for an empty query.
+        """
+        job = self.start_search(query)
+        job.run()
+        return job.matches
+
+    def start_search(self, query):
+        """Returns a SearchJob for 'query' (see SearchJob.run)."""
+        query = normalize(query)
+        terms = query.split()
+        if not terms:
+            self.last_query, self.last_matches = None, None
+            return SearchJob(self, query, (), [], done=True)
+
+        # While typing, each keystroke usually extends the last query,
+        # so its matches are a subset of the previous ones
+        candidates = None
+        if self.last_query is not None and query.startswith(self.last_query) \
+                and len(self.last_query.split()) <= len(terms):
+            candidates = self.last_matches
+
+        # Otherwise start from the shortest posting list of any term
+        for term in terms:
+            if len(term) < 3:
+                continue
+            for gram in trigrams(term):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    candidates = set()
+                    break
+                if candidates is None or len(posting) < len(candidates):
+                    candidates = posting
+        if candidates is None:
+            candidates = self.texts.keys()
+
+        if len(terms) == 1 and len(terms[0]) == 3 and self.stale == 0 and candidates is not self.last_matches:
+            # A posting list without stale ids is the exact answer for its trigram
+            job = SearchJob(self, query, (), [], done=True)
+            job.finish(set(candidates))
+            return job
+        # One pass per term, most selective (longest) first
+        return SearchJob(self, query, candidates, sorted(set(terms), key=len, reverse=True))
+
+    def maybe_compact(self):
+        if self.stale > 4096 and self.stale * 2 > self.total:
+            self.rebuild()
+
+    def rebuild(self):
+        postings = {}
+        for item_id, text in self.texts.items():
+            for gram in trigrams(text):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                posting.append(item_id)
+        self.postings = postings
+        self.total = sum(map(len, postings.values()))
+        self.stale = 0
+        logger.debug(f"Search index rebuilt: {len(self.texts)} items, {len(postings)} trigrams")
+
+
+class SearchJob:
+    """
+    Verification of one query's candidates against the indexed texts.
+    run() works until it is done or a deadline passes; 'matches' holds
+    the result once run() has returned True. A job is only valid while
+    the index does not change; start a new one after an update.
+    """
+
+    CHUNK = 2048  # Candidates verified between deadline checks
+
+    def __init__(self, index, query, candidates, terms, done=False):
+        self.index = index
+        self.version = index.version
+        self.query = query
+        self.terms = terms
+        self.term_pos = 0
+        self.pending = list(candidates)  # A copy: postings and texts may grow later
+        self.pos = 0
+        self.found = []
+        self.done = done
+        self.matches = None
+
+    def run(self, deadline=None):
+        """Verifies candidates until done (returns True) or perf_counter() passes 'deadline'."""
+        if self.done:
+            return True
+        texts = self.index.texts
+        while self.term_pos < len(self.terms):
+            term = self.terms[self.term_pos]
+            while self.pos < len(self.pending):
+                chunk = self.pending[self.pos:self.pos + self.CHUNK]
+                self.pos += self.CHUNK
+                self.found.extend(i for i in chunk if term in texts.get(i, ""))
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return False
+            self.pending, self.found, self.pos = self.found, [], 0
+            self.term_pos += 1
+        self.finish(set(self.pending))
+        return True
+
+    def finish(self, matches):
+        self.matches = matches
+        self.done = True
+        # Later keystrokes usually refine this query; let them start from its matches
+        if self.version == self.index.version:
+            self.index.last_query, self.index.last_matches = self.query, matches
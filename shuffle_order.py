@@ -0,0 +1,133 @@
+# shuffle_order.py
+
+"""
+Shuffle playback order over library item ids.
+
+The whole cycle is one permutation, shuffled once when shuffle is
+turned on. A pointer splits it into the part already played this cycle
+and the part still to come, so "next" is O(1) and nothing repeats
+until every item has been played. A history list backs "previous" (and
+"next" again after going back).
+
+Items added mid-session are swapped into a random slot of the unplayed
+part; removed items are swapped out to the end and popped. Both are
+O(1) and keep the remaining order uniformly random, so the list is
+never reshuffled as a whole except to start a new cycle.
+"""
+
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+
+class ShuffleOrder:
+
+    def __init__(self, item_ids, current_id=None, rng=None):
+        self.rng = rng or random.Random()
+        self.order = list(item_ids)
+        self.rng.shuffle(self.order)
+        self.slots = {item_id: slot for slot, item_id in enumerate(self.order)}
+        self.pointer = 0     # order[:pointer] played this cycle, order[pointer:] to come
+        self.history = []    # Played ids, oldest first (may hold removed ids)
+        self.history_pos = -1
+        if current_id is not None:
+            self.mark_played(current_id)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, item_id):
+        return item_id in self.slots
+
+    def remaining(self):
+        return len(self.order) - self.pointer
+
+    def swap(self, i, j):
+        order = self.order
+        order[i], order[j] = order[j], order[i]
+        self.slots[order[i]] = i
+        self.slots[order[j]] = j
+
+    # --- Membership ---
+
+    def add(self, item_id):
+        """Inserts 'item_id' at a random place among the items still to come."""
+        if item_id in self.slots:
+            return
+        self.order.append(item_id)
+        self.slots[item_id] = len(self.order) - 1
+        self.swap(len(self.order) - 1, self.rng.randint(self.pointer, len(self.order) - 1))
+
+    def remove(self, item_id):
+        slot = self.slots.get(item_id)
+        if slot is None:
+            return
+        if slot < self.pointer:
+            # Keep the played block contiguous: move the hole to its end first
+            self.pointer -= 1
+            self.swap(slot, self.pointer)
+            slot = self.pointer
+        self.swap(slot, len(self.order) - 1)
+        self.order.pop()
+        del self.slots[item_id]
+        # History entries are skipped lazily by previous()/next()
+
+    # --- Navigation ---
+
+    def current(self):
+        return self.history[self.history_pos] if self.history_pos >= 0 else None
+
+    def mark_played(self, item_id):
+        """Records 'item_id' as played now (e.g. picked by hand while shuffling)."""
+        slot = self.slots.get(item_id)
+        if slot is None or item_id == self.current():
+            return
+        if slot >= self.pointer:
+            self.swap(slot, self.pointer)
+            self.pointer += 1
+        del self.history[self.history_pos + 1:]
+        self.history.append(item_id)
+        self.history_pos = len(self.history) - 1
+
+    def peek_next(self):
+        """Returns what next() would return, without moving (None at the end of the cycle)."""
+        for item_id in self.history[self.history_pos + 1:]:
+            if item_id in self.slots:
+                return item_id
+        return self.order[self.pointer] if self.pointer < len(self.order) else None
+
+    def next(self):
+        """Returns the next item id, or None when the cycle is exhausted."""
+        # After going back, "next" replays the history forward first
+        while self.history_pos + 1 < len(self.history):
+            self.history_pos += 1
+            if self.history[self.history_pos] in self.slots:
+                return self.history[self.history_pos]
+        if self.pointer >= len(self.order):
+            return None
+        item_id = self.order[self.pointer]
+        self.pointer += 1
+        self.history.append(item_id)
+        self.history_pos = len(self.history) - 1
+        return item_id
+
+    def previous(self):
+        """Returns the previously played item id, or None at the start of the history."""
+        pos = self.history_pos - 1
+        while pos >= 0 and self.history[pos] not in self.slots:
+            pos -= 1
+        if pos < 0:
+            return None
+        self.history_pos = pos
+        return self.history[pos]
+
+    def new_cycle(self):
+        """Reshuffles everything for another pass (Loop All), avoiding an immediate repeat."""
+        last = self.current()
+        self.rng.shuffle(self.order)
+        if len(self.order) > 1 and self.order[0] == last:
+            self.order[0], self.order[-1] = self.order[-1], self.order[0]
+        self.slots = {item_id: slot for slot, item_id in enumerate(self.order)}
+        self.pointer = 0
+        logger.debug(f"Shuffle: new cycle over {len(self.order)} items")
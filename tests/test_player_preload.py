@@ -0,0 +1,67 @@
+# tests/test_player_preload.py
+
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QSettings
+from persistence_manager import PersistenceManager
+
+try:
+    from player_widget import PlayerWidget
+except (ImportError, OSError) as e:  # python-mpv raises OSError without libmpv
+    raise unittest.SkipTest(f"player_widget needs mpv: {e}")
+
+
+class FakePlayer:
+    """Records the playlist calls preload_next() makes."""
+
+    def __init__(self):
+        self.playlist = []
+
+    def playlist_clear(self):
+        self.playlist.clear()
+
+    def playlist_append(self, url, **options):
+        self.playlist.append(url)
+
+
+class PreloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.persistence_manager = PersistenceManager(
+            QSettings(os.path.join(self.profile_dir.name, "settings.ini"), QSettings.Format.IniFormat),
+            data_dir=self.profile_dir.name,
+        )
+        # preload_next() only needs these parts of the widget
+        self.widget = widget = SimpleNamespace(
+            player=FakePlayer(), preloaded_url=None, persistence_manager=self.persistence_manager,
+            source_cache_options=lambda url: {},
+        )
+        widget.clear_preload = lambda: PlayerWidget.clear_preload(widget)
+
+    def tearDown(self):
+        self.persistence_manager.close()
+        self.profile_dir.cleanup()
+
+    def test_preloads_item_without_saved_position(self):
+        PlayerWidget.preload_next(self.widget, "https://example.com/next.mkv")
+        self.assertEqual(self.widget.preloaded_url, "https://example.com/next.mkv")
+        self.assertEqual(self.widget.player.playlist, ["https://example.com/next.mkv"])
+
+    def test_skips_item_with_saved_position(self):
+        # A gapless switch would start it from 0 without asking to resume
+        self.persistence_manager.save_playback_position("https://example.com/next.mkv", 120.0)
+        PlayerWidget.preload_next(self.widget, "https://example.com/other.mkv")
+        PlayerWidget.preload_next(self.widget, "https://example.com/next.mkv")
+        self.assertIsNone(self.widget.preloaded_url)
+        self.assertEqual(self.widget.player.playlist, [])  # The earlier preload is dropped too
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+# thumbnail_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+APP_CACHE_NAME = "py-mpv-player"
+
+def default_cache_dir():
+    """Returns the per-user cache directory (XDG on Linux/macOS, LOCALAPPDATA on Windows)."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, APP_CACHE_NAME)
+
+
+class ThumbnailCache:
+    """
+    Persistent, content-addressed thumbnail store.
+
+    Entries are keyed by (path, size, mtime) for local files and by URL
+    for streams, so a key survives row changes and app restarts and
+    changes automatically when the file is replaced. An in-memory index
+    (kept in LRU order) answers lookups without touching the disk and
+    evicts the least recently used thumbnails once the byte budget is hit.
+
+    Each key can also carry a small metadata dict (duration, resolution,
+    codecs, ...) so a warm library never has to re-probe files. Local
+    entries are invalidated by the key itself; network entries carry a
+    fetch time that callers check against a TTL. Metadata is kept in LRU
+    order too and capped at MAX_METADATA entries, since keys of changed
+    files are never looked up again. Safe to use from worker threads.
+    """
+
+    INDEX_FILE = "index.json"
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    SAVE_EVERY = 50  # Index writes are batched; see flush()
+    MAX_METADATA = 20000  # Metadata entries kept (least recently used go first)
+    JPEG_QUALITY = 85
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "thumbnails")
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()  # One index write at a time
+        self.save_pending = False  # A save is queued on the writer thread
+        self.entries = OrderedDict()  # key -> size in bytes, oldest first
+        self.metadata = OrderedDict()  # key -> metadata dict (including 'fetched_at'), oldest first
+        self.resolved_paths = {}  # filepath -> resolved path, see cache_key()
+        self.total_bytes = 0
+        self.unsaved_changes = 0
+        self.order_changed = False  # LRU touches are only saved on flush()
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail-cache")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.load_index()
+
+    def cache_key(self, filepath, size=None, mtime_ns=None):
+        """
+        Builds a stable key for a file or URL. A local file is stat'ed
+        unless the caller passes the size and mtime it already has; its
+        resolved path is remembered, so a lookup costs at most one stat.
+        Raises OSError if a local file cannot be stat'ed.
+        """
+        if filepath.startswith('http'):
+            source = f"url:{filepath}"
+        else:
+            path = self.resolved_paths.get(filepath)
+            if path is None:
+                path = self.resolved_paths[filepath] = str(Path(filepath).resolve())
+            if size is None or mtime_ns is None:
+                st = os.stat(path)
+                size, mtime_ns = st.st_size, st.st_mtime_ns
+            source = f"file:{path}|{size}|{mtime_ns}"
+        return hashlib.sha1(source.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def path_for(self, key):
+        """Where the thumbnail for 'key' lives (whether or not it exists yet)."""
+        return os.path.join(self.cache_dir, f"{key}.jpg")
+
+    def contains(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def get(self, key):
+        """Returns the thumbnail path for 'key' and marks it recently used, or None."""
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            self.order_changed = True
+        return self.path_for(key)
+
+    def store_image_async(self, key, image):
+        """
+        Encodes 'image' (a small QImage) to path_for(key) on the cache's
+        writer thread and commits it once written.
+        """
+        self.writer.submit(self.write_image, key, image)
+
+    def write_image(self, key, image):
+        try:
+            if image.save(self.path_for(key), "JPG", self.JPEG_QUALITY):
+                self.commit(key)
+            else:
+                logger.warning(f"Failed to write cached thumbnail {key}")
+        except Exception as e:
+            logger.warning(f"Failed to write cached thumbnail {key}: {e}")
+
+    def commit(self, key):
+        """Records a thumbnail that was just written to path_for(key)."""
+        try:
+            size = os.path.getsize(self.path_for(key))
+        except OSError as e:
+            logger.warning(f"Cannot add {key} to thumbnail cache: {e}")
+            return
+        with self.lock:
+            self.total_bytes -= self.entries.pop(key, 0)
+            self.entries[key] = size
+            self.total_bytes += size
+            self.evict()
+            self.mark_dirty()
+
+    def discard(self, key):
+        """Removes an entry, e.g. when its file turns out to be unreadable."""
+        with self.lock:
+            self.remove_entry(key)
+            self.mark_dirty()
+
+    def get_metadata(self, key, max_age=None):
+        """
+        Returns a copy of the cached metadata for 'key', or None if there is
+        none or it is older than 'max_age' seconds.
+        """
+        with self.lock:
+            metadata = self.metadata.get(key)
+            if metadata is None:
+                return None
+            if max_age is not None and time.time() - metadata.get('fetched_at', 0) > max_age:
+                return None
+            self.metadata.move_to_end(key)
+            self.order_changed = True
+            return dict(metadata)
+
+    def put_metadata(self, key, metadata):
+        """Stores metadata for 'key', stamped with the current time."""
+        with self.lock:
+            self.metadata[key] = dict(metadata, fetched_at=time.time())
+            self.metadata.move_to_end(key)
+            while len(self.metadata) > self.MAX_METADATA:
+                self.metadata.popitem(last=False)
+            self.mark_dirty()
+
+    def set_max_bytes(self, max_bytes):
+        with self.lock:
+            self.max_bytes = max_bytes
+            self.evict()
+            self.mark_dirty()
+
+    def flush(self):
+        """Writes the index to disk if it has changed."""
+        with self.lock:
+            changed = self.unsaved_changes or self.order_changed
+        if changed:
+            self.save_index()
+
+    def close(self):
+        """Finishes pending image writes and saves the index."""
+        self.writer.shutdown(wait=True)
+        self.flush()
+
+    # --- Internal helpers (call with self.lock held, except save_index) ---
+
+    def evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key = next(iter(self.entries))
+            logger.debug(f"Evicting cached thumbnail {key}")
+            self.remove_entry(key)
+
+    def remove_entry(self, key):
+        self.metadata.pop(key, None)
+        size = self.entries.pop(key, None)
+        if size is None:
+            return
+        self.total_bytes -= size
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to delete cached thumbnail {key}: {e}")
+
+    def mark_dirty(self):
+        self.unsaved_changes += 1
+        if self.unsaved_changes >= self.SAVE_EVERY and not self.save_pending:
+            # Written on the writer thread, so callers never wait for it
+            self.save_pending = True
+            try:
+                self.writer.submit(self.save_index)
+            except RuntimeError:  # Closing; close() saves the index itself
+                self.save_pending = False
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for key, size in data.get('entries', []):
+                self.entries[key] = size
+                self.total_bytes += size
+            self.metadata = OrderedDict(data.get('metadata', {}))  # Saved in LRU order
+            while len(self.metadata) > self.MAX_METADATA:
+                self.metadata.popitem(last=False)
+            logger.info(f"Thumbnail cache: {len(self.entries)} entries, "
+                        f"{self.total_bytes / (1024 * 1024):.1f} MB in {self.cache_dir}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Thumbnail cache index unreadable, starting empty: {e}")
+            self.entries.clear()
+            self.metadata = OrderedDict()
+            self.total_bytes = 0
+
+    def save_index(self):
+        """
+        Writes the index (call without self.lock). Only the snapshot is
+        taken under the lock; serialising and writing happen outside it,
+        so lookups from other threads are not held up by the write.
+        """
+        with self.save_lock:  # Snapshots are written in the order they are taken
+            with self.lock:
+                snapshot = {
+                    'entries': list(self.entries.items()),
+                    'metadata': dict(self.metadata),  # Values are replaced, never mutated
+                }
+                changes = self.unsaved_changes
+                self.unsaved_changes = 0
+                self.order_changed = False
+                self.save_pending = False
+            tmp_path = self.index_path + ".tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.index_path)
+            except OSError as e:
+                logger.warning(f"Failed to save thumbnail cache index: {e}")
+                with self.lock:
+                    self.unsaved_changes += changes  # Retried by the next save or flush()
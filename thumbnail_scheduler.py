@@ -0,0 +1,186 @@
+# thumbnail_scheduler.py
+
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from PySide6.QtCore import QObject, QThreadPool, Signal, Slot
+from PySide6.QtGui import QImage
+from thumbnail_worker import ThumbnailWorker, THUMBNAIL_MODE_FAST, create_mpv_pool
+
+logger = logging.getLogger(__name__)
+
+class ThumbnailScheduler(QObject):
+    """
+    Runs thumbnail jobs on a fixed-size thread pool.
+    Jobs wait in a priority queue (lower value runs first) and are
+    only handed to the pool when a worker slot is free, so adding
+    thousands of files never starts thousands of mpv instances.
+
+    Queued jobs can be re-prioritized or cancelled at any time.
+    Running jobs are cancelled cooperatively: the worker stops at its
+    next checkpoint and any result it still produces is dropped.
+    """
+
+    thumbnail_ready = Signal(object, QImage, dict)
+    thumbnail_failed = Signal(object, str)
+    stats_changed = Signal(dict)
+    queue_low = Signal()  # Fewer jobs queued than there are workers
+
+    DEFAULT_PRIORITY = 100
+    THROUGHPUT_WINDOW = 30.0  # Seconds of history used for jobs/sec
+
+    def __init__(self, cache, max_workers=None, mode=THUMBNAIL_MODE_FAST, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.mode = mode
+        self.pool = QThreadPool(self)
+        self.queue = []     # Heap of [priority, seq, key, filepath, valid]
+        self.queued = {}    # key -> heap entry (for lazy removal)
+        self.running = {}   # key -> ThumbnailWorker (not cancelled)
+        self.active = set() # Every worker holding a pool slot, cancelled or not
+        self.sequence = itertools.count()
+        self.completed_times = deque()
+        self.total_completed = 0
+
+        self.max_workers = 0
+        self.mpv_pool = create_mpv_pool(max_idle=1)
+        self.set_max_workers(max_workers)
+
+    def set_max_workers(self, count=None):
+        """Changes pool concurrency. None means one worker per CPU core."""
+        if not count or count < 1:
+            count = os.cpu_count() or 4
+        self.max_workers = int(count)
+        self.pool.setMaxThreadCount(self.max_workers)
+        self.mpv_pool.set_max_idle(self.max_workers)
+        logger.info(f"Thumbnail pool size set to {self.max_workers}.")
+        self.dispatch()
+        self.emit_stats()
+
+    def set_mode(self, mode):
+        """Sets 'fast' (keyframe) or 'accurate' seeking for jobs started from now on."""
+        self.mode = mode
+        logger.info(f"Thumbnail mode set to {mode}.")
+
+    def submit(self, key, filepath, priority=None):
+        """
+        Queues a thumbnail job. Re-submitting a queued key just changes
+        its priority; a key that is already running is left alone.
+        """
+        self.enqueue(key, filepath, priority)
+        self.dispatch()
+
+    def submit_many(self, jobs):
+        """Queues [(key, filepath, priority), ...] and dispatches once."""
+        for key, filepath, priority in jobs:
+            self.enqueue(key, filepath, priority)
+        self.dispatch()
+
+    def enqueue(self, key, filepath, priority):
+        if key in self.running:
+            return
+        if priority is None:
+            priority = self.DEFAULT_PRIORITY
+        entry = self.queued.get(key)
+        if entry and entry[0] == priority:
+            return
+        self.cancel(key)
+        entry = [priority, next(self.sequence), key, filepath, True]
+        self.queued[key] = entry
+        heapq.heappush(self.queue, entry)
+
+    def is_pending(self, key):
+        return key in self.queued or key in self.running
+
+    def cancel(self, key):
+        """Drops a queued job, or flags a running one so its result is discarded."""
+        entry = self.queued.pop(key, None)
+        if entry:
+            entry[4] = False
+        worker = self.running.pop(key, None)
+        if worker:
+            worker.cancel()
+
+    def cancel_queued(self):
+        """Drops every queued job. Running jobs finish normally."""
+        for entry in self.queued.values():
+            entry[4] = False
+        self.queued.clear()
+        self.queue.clear()
+
+    def clear(self):
+        """Drops every queued job and cancels running ones, without blocking."""
+        self.cancel_queued()
+        for worker in self.running.values():
+            worker.cancel()
+        self.running.clear()
+        self.cache.flush()
+        self.emit_stats()
+
+    def shutdown(self):
+        """Stops all work and releases the pooled mpv instances."""
+        self.clear()
+        self.pool.waitForDone(3000)
+        self.mpv_pool.shutdown()
+        self.cache.close()
+
+    def dispatch(self):
+        """Starts queued jobs until all pool slots are busy."""
+        while self.queue and len(self.active) < self.max_workers:
+            priority, _, key, filepath, valid = heapq.heappop(self.queue)
+            if not valid:
+                continue
+            del self.queued[key]
+
+            worker = ThumbnailWorker(filepath, key, self.cache, self.mpv_pool, self.mode)
+            worker.signals.thumbnail_ready.connect(self.on_worker_ready)
+            worker.signals.thumbnail_failed.connect(self.on_worker_failed)
+            worker.signals.finished.connect(self.on_worker_finished)
+            self.running[key] = worker
+            self.active.add(worker)
+            self.pool.start(worker)
+
+    @Slot(object, QImage, dict)
+    def on_worker_ready(self, worker, image, metadata):
+        if not worker.cancelled:
+            self.thumbnail_ready.emit(worker.key, image, metadata)
+
+    @Slot(object, str)
+    def on_worker_failed(self, worker, error_message):
+        if not worker.cancelled:
+            self.thumbnail_failed.emit(worker.key, error_message)
+
+    @Slot(object)
+    def on_worker_finished(self, worker):
+        self.active.discard(worker)
+        if self.running.get(worker.key) is worker:
+            del self.running[worker.key]
+        if not worker.cancelled:
+            self.total_completed += 1
+            self.completed_times.append(time.monotonic())
+        self.dispatch()
+        if len(self.queued) < self.max_workers:
+            self.queue_low.emit()
+        self.emit_stats()
+
+    def get_stats(self):
+        """Returns queue depth, running count and recent throughput."""
+        now = time.monotonic()
+        while self.completed_times and now - self.completed_times[0] > self.THROUGHPUT_WINDOW:
+            self.completed_times.popleft()
+        throughput = len(self.completed_times) / self.THROUGHPUT_WINDOW
+        return {
+            'queued': len(self.queued),
+            'running': len(self.active),
+            'completed': self.total_completed,
+            'max_workers': self.max_workers,
+            'throughput': throughput,
+        }
+
+    def emit_stats(self):
+        stats = self.get_stats()
+        logger.debug(f"Thumbnail stats: {stats}")
+        self.stats_changed.emit(stats)
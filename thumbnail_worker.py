@@ -2,20 +2,35 @@
 # (UPDATED with hybrid logic for local vs network files)
 
 import logging
-import mpv
-import tempfile
 import os
 import urllib.request
 import urllib.error
 import socket
-from PySide6.QtCore import QThread, Signal
-from PySide6.QtGui import QIcon
-from utils import format_time
-from pathlib import Path
+from PySide6.QtCore import QObject, QRunnable, Signal, QSize, Qt
+from PySide6.QtGui import QImage
 from yt_dlp import YoutubeDL
+from mpv_pool import MpvPool
+from media_probe import probe
 
 logger = logging.getLogger(__name__)
 
+NETWORK_METADATA_TTL = 24 * 60 * 60  # Re-query yt-dlp after a day
+MPV_TIMEOUT = 15  # Seconds before a stuck file is given up on
+
+THUMBNAIL_MODE_FAST = 'fast'
+THUMBNAIL_MODE_ACCURATE = 'accurate'
+THUMBNAIL_MODES = (THUMBNAIL_MODE_FAST, THUMBNAIL_MODE_ACCURATE)
+
+THUMBNAIL_SIZE = QSize(160, 90)  # Matches the library's icon size
+
+# mpv 'screenshot-raw' pixel formats -> QImage formats
+RAW_IMAGE_FORMATS = {
+    'bgr0': QImage.Format.Format_RGB32,
+    'bgra': QImage.Format.Format_ARGB32,
+    'rgb0': QImage.Format.Format_RGBX8888,
+    'rgba': QImage.Format.Format_RGBA8888,
+}
+
 # --- UPDATED LOG HANDLER (Emojis removed) ---
 def worker_log_handler(level, prefix, text):
     """
@@ -37,46 +52,108 @@ def worker_log_handler(level, prefix, text):
         logger.debug(f"[Worker-MPV:{prefix} ({level})] {text}")
 # ------------------------------------------
 
-class ThumbnailWorker(QThread):
-    
-    thumbnail_ready = Signal(int, QIcon, str, str)
-    thumbnail_failed = Signal(int, str)
+class ThumbnailWorkerSignals(QObject):
+    """
+    Signals for ThumbnailWorker. QRunnable is not a QObject,
+    so the worker carries one of these instead.
+    Each signal carries the worker itself so the scheduler can tell
+    a live job from a cancelled one with the same key.
+    """
+    thumbnail_ready = Signal(object, QImage, dict)  # worker, image, {'duration', 'width', 'height', 'bitrate', 'size'}
+    thumbnail_failed = Signal(object, str)
+    finished = Signal(object)
 
-    def __init__(self, filepath, row_index, parent=None):
-        super().__init__(parent)
+
+class ThumbnailWorker(QRunnable):
+    """
+    A single thumbnail job. Runs on the ThumbnailScheduler's pool.
+    'key' is an opaque job id that is passed back with every signal.
+    Thumbnails are delivered as icon-sized QImages, so the GUI thread
+    never decodes or scales a full-size frame.
+    """
+
+    def __init__(self, filepath, key, cache, mpv_pool, mode=THUMBNAIL_MODE_FAST):
+        super().__init__()
+        self.setAutoDelete(False)  # The scheduler owns the reference
+        self.signals = ThumbnailWorkerSignals()
         self.filepath = filepath
-        self.row_index = row_index
-        
-        self.temp_dir = os.path.join(tempfile.gettempdir(), "py-mpv-player-cache")
-        os.makedirs(self.temp_dir, exist_ok=True)
-        
-        safe_filename = "".join(c for c in Path(filepath).name if c.isalnum())
-        if not safe_filename:
-             safe_filename = str(hash(filepath))
-             
-        # Use .jpg for consistency
-        self.thumbnail_path = os.path.join(self.temp_dir, f"{safe_filename}_{row_index}.jpg")
+        self.key = key
+        self.cache = cache
+        self.mpv_pool = mpv_pool
+        self.mode = mode
+        self.cancelled = False
+        self.cache_key = None
+
+    def cancel(self):
+        """Asks the worker to stop at its next checkpoint (thread-safe flag)."""
+        self.cancelled = True
 
     def run(self):
         """Runs the background task."""
         try:
-            # --- 1. Check for cached thumbnail ---
-            if os.path.exists(self.thumbnail_path):
-                logger.debug(f"Loading cached thumbnail for: {self.filepath}")
-                metadata = self.fetch_metadata_fast()
-                icon = QIcon(self.thumbnail_path)
-                self.thumbnail_ready.emit(self.row_index, icon, metadata['duration'], metadata['resolution'])
+            if self.cancelled:
                 return
+            is_network = self.filepath.startswith('http')
+
+            # --- 1. Check for cached thumbnail and metadata ---
+            self.cache_key = self.cache.cache_key(self.filepath)
+            metadata = self.cache.get_metadata(
+                self.cache_key, max_age=NETWORK_METADATA_TTL if is_network else None
+            )
+            cached_path = self.cache.get(self.cache_key)
+
+            if metadata and not metadata.get('has_thumbnail'):
+                logger.debug(f"Using cached metadata (no thumbnail) for: {self.filepath}")
+                self.emit_ready(QImage(), metadata)
+                return
+
+            if cached_path:
+                image = QImage(cached_path)
+                if not image.isNull():
+                    logger.debug(f"Loading cached thumbnail for: {self.filepath}")
+                    if metadata is None:
+                        metadata = self.fetch_metadata_fast()
+                        metadata['has_thumbnail'] = True
+                        self.cache.put_metadata(self.cache_key, metadata)
+                    self.emit_ready(image, metadata)
+                    return
+                self.cache.discard(self.cache_key)
 
             # --- 2. Run correct task based on file type ---
-            if self.filepath.startswith('http'):
+            if self.cancelled:
+                return
+            if is_network:
                 self.run_network_task()
             else:
                 self.run_local_task()
 
         except Exception as e:
             logger.error(f"Thumbnail worker failed for {self.filepath}: {e}", exc_info=True)
-            self.thumbnail_failed.emit(self.row_index, str(e))
+            self.signals.thumbnail_failed.emit(self, str(e))
+        finally:
+            self.signals.finished.emit(self)
+
+    def emit_ready(self, image, metadata):
+        """Emits the image with the cached/fresh metadata the library columns need."""
+        self.signals.thumbnail_ready.emit(self, image, {
+            'duration': metadata.get('duration') or 0.0,
+            'width': metadata.get('width') or 0,
+            'height': metadata.get('height') or 0,
+            'bitrate': metadata.get('bitrate') or 0,
+            'size': metadata.get('size') or 0,
+        })
+
+    def store_result(self, image, metadata):
+        """
+        Emits a freshly generated thumbnail and its metadata, and queues
+        the (icon-sized) image for writing to the cache in the background.
+        """
+        has_thumbnail = not image.isNull()
+        metadata['has_thumbnail'] = has_thumbnail
+        self.cache.put_metadata(self.cache_key, metadata)
+        if has_thumbnail:
+            self.cache.store_image_async(self.cache_key, image)
+        self.emit_ready(image, metadata)
 
     def run_network_task(self):
         """Uses yt-dlp to fetch metadata and thumbnail for a URL."""
@@ -95,11 +172,9 @@ class ThumbnailWorker(QThread):
             logger.error(f"Failed to extract info for {self.filepath}: {e}")
             raise
         
-        duration = info.get('duration', 0)
-        width = info.get('width', 0)
-        height = info.get('height', 0)
-        duration_str = format_time(duration)
-        resolution_str = f"{width}x{height}" if width > 0 else "N/A"
+        metadata = metadata_from_info(info)
+        if self.cancelled:
+            return
         
         thumbnail_url = None
         if info.get('thumbnails'):
@@ -108,100 +183,159 @@ class ThumbnailWorker(QThread):
         if thumbnail_url:
             logger.debug(f"Downloading thumbnail from: {thumbnail_url}")
             try:
-                # Set timeout for network request
-                old_timeout = socket.getdefaulttimeout()
-                socket.setdefaulttimeout(10)
-                try:
-                    urllib.request.urlretrieve(thumbnail_url, self.thumbnail_path)
-                finally:
-                    socket.setdefaulttimeout(old_timeout)
-                    
-                if os.path.exists(self.thumbnail_path):
-                    icon = QIcon(self.thumbnail_path)
-                    self.thumbnail_ready.emit(self.row_index, icon, duration_str, resolution_str)
-                else:
-                    raise Exception("Thumbnail download failed.")
+                with urllib.request.urlopen(thumbnail_url, timeout=10) as response:
+                    data = response.read()
+                image = QImage.fromData(data)
+                if image.isNull():
+                    raise Exception("Downloaded thumbnail could not be decoded.")
+                self.store_result(scale_thumbnail(image), metadata)
             except (urllib.error.URLError, socket.timeout, OSError) as e:
                 logger.warning(f"Failed to download thumbnail: {e}. Using metadata only.")
-                self.thumbnail_ready.emit(self.row_index, QIcon(), duration_str, resolution_str)
+                self.emit_ready(QImage(), metadata)
         else:
             logger.debug("No web thumbnail found, sending metadata only.")
-            self.thumbnail_ready.emit(self.row_index, QIcon(), duration_str, resolution_str)
+            self.store_result(QImage(), metadata)
 
     def run_local_task(self):
-        """Uses mpv (headless) to fetch metadata and thumbnail for a local file."""
+        """Uses a pooled headless mpv to fetch metadata and thumbnail for a local file."""
         logger.debug(f"Generating local thumbnail for: {self.filepath}")
         
-        player = None
-        try:
-            player = mpv.MPV(
-                vo='null',  # No video output window
-                log_handler=worker_log_handler,
-                ytdl=False  # Not needed for local files
-            )
+        with self.mpv_pool.checkout() as player:
+            image, metadata = grab_local_thumbnail(player, self.filepath, self.mode)
 
-            player.play(self.filepath)
-            player.wait_for_property('duration')
-            
-            duration = player.duration or 0
-            width = player.width or 0
-            height = player.height or 0
-            
-            duration_str = format_time(duration)
-            resolution_str = f"{width}x{height}" if width > 0 else "N/A"
-            
-            seek_time = min(duration * 0.1, 5.0)
-            
-            player.time_pos = seek_time
-            player.wait_for_property('playback-time')
-            
-            player.command('screenshot-to-file', self.thumbnail_path, 'video')
-
-            if os.path.exists(self.thumbnail_path):
-                icon = QIcon(self.thumbnail_path)
-                self.thumbnail_ready.emit(self.row_index, icon, duration_str, resolution_str)
-            else:
-                raise Exception("Screenshot file was not created.")
-        finally:
-            if player:
-                try:
-                    player.terminate()
-                except Exception as e:
-                    logger.warning(f"Failed to terminate player: {e}")
+        if image.isNull():
+            raise Exception("Screenshot could not be captured.")
+        self.store_result(image, metadata)
 
     def fetch_metadata_fast(self):
         """
-        Lightweight metadata fetch for cached files.
-        This must also be hybrid.
+        Lightweight metadata fetch for a cached thumbnail whose metadata
+        is missing or expired. This must also be hybrid: local files try a
+        header probe first and only fall back to mpv for unknown formats.
         """
-        player = None
-        try:
-            if self.filepath.startswith('http'):
-                ydl_opts = {
-                    'quiet': True, 'skip_download': True,
-                    'forcejson': True, 'extract_flat': True,
-                    'socket_timeout': 10
-                }
-                with YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(self.filepath, download=False)
-                duration = info.get('duration', 0)
-                width = info.get('width', 0)
-                height = info.get('height', 0)
-            else:
-                player = mpv.MPV(vo='null', log_handler=worker_log_handler, ytdl=False)
-                player.play(self.filepath)
-                player.wait_for_property('duration')
-                duration = player.duration or 0
-                width = player.width or 0
-                height = player.height or 0
-            
-            return {
-                'duration': format_time(duration),
-                'resolution': f"{width}x{height}" if width > 0 else "N/A"
+        if self.filepath.startswith('http'):
+            ydl_opts = {
+                'quiet': True, 'skip_download': True,
+                'forcejson': True, 'extract_flat': True,
+                'socket_timeout': 10
             }
-        finally:
-            if player:
-                try:
-                    player.terminate()
-                except Exception as e:
-                    logger.warning(f"Failed to terminate player in metadata fetch: {e}")
\ No newline at end of file
+            with YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(self.filepath, download=False)
+            return metadata_from_info(info)
+
+        probed = probe(self.filepath)
+        if probed and probed['duration'] > 0:
+            size = os.path.getsize(self.filepath)
+            return dict(probed, video_codec="", audio_codec="", bitrate=int(size * 8 / probed['duration']),
+                        size=size, chapters=0, tracks={})
+
+        with self.mpv_pool.checkout() as player:
+            player.play(self.filepath)
+            player.wait_for_property('duration', timeout=MPV_TIMEOUT)
+            return metadata_from_player(player)
+
+
+def create_mpv_pool(max_idle):
+    """Builds the headless mpv pool used by thumbnail workers."""
+    return MpvPool(
+        max_idle=max_idle,
+        log_handler=worker_log_handler,
+        vo='null',  # No video output window
+        ytdl=False,  # Not needed for local files
+        idle=True,  # Stay alive between files
+        pause=True,  # Decode only the frames we seek to
+        aid='no', sid='no',  # Thumbnails need neither audio nor subtitles
+        cache='no', demuxer_readahead_secs=0  # Don't read ahead past the frame
+    )
+
+def grab_local_thumbnail(player, filepath, mode=THUMBNAIL_MODE_FAST):
+    """
+    Loads 'filepath' into a headless mpv and returns
+    (icon-sized QImage, metadata dict).
+
+    'fast' seeks to the nearest keyframe and skips the loop filter, so only
+    one frame is decoded. 'accurate' decodes forward to the exact time.
+    """
+    is_fast = mode == THUMBNAIL_MODE_FAST
+    player['vd-lavc-skiploopfilter'] = 'all' if is_fast else 'default'
+
+    player.play(filepath)
+    player.wait_for_property('duration', timeout=MPV_TIMEOUT)
+    
+    metadata = metadata_from_player(player)
+    duration = metadata['duration']
+    
+    seek_time = min(duration * 0.1, 5.0)
+    seek_flags = 'absolute+keyframes' if is_fast else 'absolute+exact'
+    
+    with player.prepare_and_wait_for_event('playback_restart', timeout=MPV_TIMEOUT):
+        player.command('seek', seek_time, seek_flags)
+    
+    raw = player.node_command('screenshot-raw', 'video')
+    # copy() detaches from mpv's buffer even if no scaling was needed
+    return scale_thumbnail(image_from_raw(raw)).copy(), metadata
+
+def image_from_raw(raw):
+    """Wraps an mpv 'screenshot-raw' result in a QImage (without copying)."""
+    image_format = RAW_IMAGE_FORMATS.get(raw.get('format'))
+    if image_format is None:
+        raise ValueError(f"Unsupported screenshot format: {raw.get('format')}")
+    return QImage(raw['data'], raw['w'], raw['h'], raw['stride'], image_format)
+
+def scale_thumbnail(image):
+    """Scales an image down to the library icon size (returns a new, detached image)."""
+    return image.scaled(
+        THUMBNAIL_SIZE,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation
+    )
+
+def summarize_tracks(track_types):
+    """Turns a list of track types into e.g. {'video': 1, 'audio': 2}."""
+    summary = {}
+    for track_type in track_types:
+        if track_type:
+            summary[track_type] = summary.get(track_type, 0) + 1
+    return summary
+
+def metadata_from_player(player):
+    """Reads cacheable metadata from an mpv instance that has loaded a file."""
+    duration = player.duration or 0
+    file_size = player.file_size or 0
+    tracks = player.track_list or []
+    # Audio is disabled in the thumbnail pool, so read codecs from
+    # the track list rather than from the active decoders.
+    video_track = next((t for t in tracks if t.get('type') == 'video'), {})
+    audio_track = next((t for t in tracks if t.get('type') == 'audio'), {})
+    return {
+        'duration': duration,
+        'width': player.width or video_track.get('demux-w') or 0,
+        'height': player.height or video_track.get('demux-h') or 0,
+        'video_codec': video_track.get('codec') or "",
+        'audio_codec': audio_track.get('codec') or "",
+        'bitrate': int(file_size * 8 / duration) if duration > 0 else 0,
+        'size': file_size,
+        'chapters': player.chapters or 0,
+        'tracks': summarize_tracks(t.get('type') for t in tracks),
+    }
+
+def metadata_from_info(info):
+    """Reads cacheable metadata from a yt-dlp info dict."""
+    formats = info.get('formats') or []
+    track_types = []
+    for f in formats:
+        if f.get('vcodec') and f.get('vcodec') != 'none':
+            track_types.append('video')
+        elif f.get('acodec') and f.get('acodec') != 'none':
+            track_types.append('audio')
+    return {
+        'duration': info.get('duration') or 0,
+        'width': info.get('width') or 0,
+        'height': info.get('height') or 0,
+        'video_codec': info.get('vcodec') or "",
+        'audio_codec': info.get('acodec') or "",
+        'bitrate': int((info.get('tbr') or 0) * 1000),
+        'size': info.get('filesize') or info.get('filesize_approx') or 0,
+        'chapters': len(info.get('chapters') or []),
+        'tracks': summarize_tracks(track_types),
+    }
@@ -12,4 +12,23 @@ def format_time(seconds):
         else:
             return f"{m:02d}:{s:02d}"
     except Exception:
-        return "--:--"
\ No newline at end of file
+        return "--:--"
+def format_size(num_bytes):
+    """Formats a byte count as e.g. '734 MB' or '1.4 GB'."""
+    if not num_bytes or num_bytes < 0:
+        return "--"
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}"
+        num_bytes /= 1024
+    if num_bytes < 1024:
+        return f"{num_bytes:.1f} GB"
+    return f"{num_bytes / 1024:.1f} TB"
+
+def format_bitrate(bits_per_second):
+    """Formats a bitrate as e.g. '850 kbps' or '4.5 Mbps'."""
+    if not bits_per_second or bits_per_second <= 0:
+        return "--"
+    if bits_per_second >= 1_000_000:
+        return f"{bits_per_second / 1_000_000:.1f} Mbps"
+    return f"{bits_per_second / 1_000:.0f} kbps"